@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.21 on 2019-07-02 09:41
+from __future__ import unicode_literals
+
+import bgjobs.models
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projectroles', '0016_remotesite_sync_etag'),
+        ('bgjobs', '0005_auto_20190128_1210'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='backgroundjob',
+            name='project',
+            field=models.ForeignKey(
+                blank=True,
+                help_text='Project in which this objects belongs',
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                to='projectroles.Project',
+            ),
+        ),
+        migrations.CreateModel(
+            name='RemoteSyncBackgroundJob',
+            fields=[
+                (
+                    'id',
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                (
+                    'bg_job',
+                    models.OneToOneField(
+                        help_text='Background job for state etc.',
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='remote_sync_job',
+                        to='bgjobs.BackgroundJob',
+                    ),
+                ),
+                (
+                    'site',
+                    models.ForeignKey(
+                        help_text='Source site to synchronize from',
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='sync_jobs',
+                        to='projectroles.RemoteSite',
+                    ),
+                ),
+            ],
+            bases=(bgjobs.models.JobModelMessageMixin, models.Model),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.21 on 2019-07-04 10:12
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [('bgjobs', '0006_remotesyncbackgroundjob')]
+
+    operations = [
+        migrations.AddField(
+            model_name='remotesyncbackgroundjob',
+            name='dry_run',
+            field=models.BooleanField(
+                default=False, help_text='Only log changes without saving them'
+            ),
+        )
+    ]
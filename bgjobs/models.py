@@ -8,14 +8,18 @@ through a ``OneToOneField``.
 Further, the ``BackgroundJobLogEntry`` model allows to manage background log
 entries for your background jobs.  Use the ``JobModelMessageMixin`` for adding
 helper functions for applying state changes and adding log messages.
+
+The ``RemoteSyncBackgroundJob`` specialization is used for synchronizing remote
+projects from a source site in the background.
 """
 
 import uuid as uuid_object
 
 from django.conf import settings
 from django.db import models
+from django.urls import reverse
 
-from projectroles.models import Project
+from projectroles.models import Project, RemoteSite
 
 
 #: Access Django user model
@@ -78,9 +82,12 @@ class BackgroundJob(models.Model):
     sodar_uuid = models.UUIDField(
         default=uuid_object.uuid4, unique=True, help_text='BG Job SODAR UUID'
     )
-    #: The project that this job belongs to.
+    #: The project that this job belongs to, empty for site-wide jobs.
     project = models.ForeignKey(
-        Project, help_text='Project in which this objects belongs'
+        Project,
+        null=True,
+        blank=True,
+        help_text='Project in which this objects belongs',
     )
     #: The user initiating the job.
     user = models.ForeignKey(
@@ -175,3 +182,47 @@ class JobModelMessageMixin:
     def add_log_entry(self, *args, **kwargs):
         """Add a log entry through the related ``BackgroundJob``."""
         return self.bg_job.add_log_entry(*args, **kwargs)
+
+
+class RemoteSyncBackgroundJob(JobModelMessageMixin, models.Model):
+    """Background job for synchronizing remote projects from a source site"""
+
+    #: Value of ``BackgroundJob.job_type`` for this specialization.
+    spec_name = 'projectroles.remote_sync'
+
+    #: Description of the task used in log messages.
+    task_desc = 'Remote project sync'
+
+    #: The ``BackgroundJob`` specialized by this job.
+    bg_job = models.OneToOneField(
+        BackgroundJob,
+        related_name='remote_sync_job',
+        help_text='Background job for state etc.',
+    )
+
+    #: The source site to synchronize from.
+    site = models.ForeignKey(
+        RemoteSite,
+        related_name='sync_jobs',
+        help_text='Source site to synchronize from',
+    )
+
+    #: Only log changes without saving them.
+    dry_run = models.BooleanField(
+        default=False, help_text='Only log changes without saving them'
+    )
+
+    def mark_error(self, msg):
+        """Mark the sync job as failed."""
+        self.bg_job.status = JOB_STATE_FAILED
+        self.bg_job.add_log_entry('{} failed: {}'.format(self.task_desc, msg))
+        self.bg_job.save()
+
+    def get_human_readable_type(self):
+        return 'Remote project sync'
+
+    def get_absolute_url(self):
+        return reverse('bgjobs:detail', kwargs={'job': self.bg_job.sodar_uuid})
+
+    def __str__(self):
+        return str(self.bg_job)
@@ -0,0 +1,241 @@
+"""Running remote project sync as a background job.
+
+The sync is started with ``start_remote_sync_job()``, which creates a
+``RemoteSyncBackgroundJob`` and runs it in a separate thread so the calling
+request can return at once. Only one job saving changes can be run for a
+site at a time. Jobs in dry run mode only log the changes to be made.
+
+Jobs are updated on each reported progress. If a job is not updated within
+``BGJOBS_REMOTE_SYNC_TIMEOUT`` seconds, e.g. because the server process running
+it was stopped, it is marked as failed by ``fail_stale_remote_sync_jobs()``.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+import logging
+import threading
+
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.utils import timezone
+
+from projectroles.remote_projects import RemoteProjectAPI, get_sync_changes
+
+from .models import (
+    BackgroundJob,
+    BackgroundJobLogEntry,
+    RemoteSyncBackgroundJob,
+    JOB_STATE_DONE,
+    JOB_STATE_FAILED,
+    LOG_LEVEL_ERROR,
+    LOG_LEVEL_INFO,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+# Default time in seconds after which a job with no progress is stale
+REMOTE_SYNC_TIMEOUT = 15 * 60
+
+# Namespace of advisory locks taken when starting jobs for a site
+REMOTE_SYNC_LOCK_ID = 0x5D5C
+
+
+def _close_connections():
+    """Close database connections opened by the current thread"""
+    connections.close_all()
+
+
+def run_remote_sync_job(job):
+    """
+    Synchronize remote projects for a RemoteSyncBackgroundJob and record its
+    progress in the job log. In dry run mode, the changes to be made are also
+    logged.
+
+    :param job: RemoteSyncBackgroundJob object
+    """
+    # The sync runs in a single transaction, so progress is logged from a
+    # separate thread with its own connection to be visible while running
+    log_executor = ThreadPoolExecutor(max_workers=1)
+
+    def _log_progress(msg):
+        job.add_log_entry(msg)
+        BackgroundJob.objects.filter(pk=job.bg_job.pk).update(
+            date_modified=timezone.now()
+        )
+
+    def _progress(phase, count):
+        log_executor.submit(
+            _log_progress,
+            '{} {} {}'.format(
+                'Checked' if job.dry_run else 'Synchronized', count, phase
+            ),
+        )
+
+    remote_api = RemoteProjectAPI()
+    update_data = None
+    error = None
+    job.mark_start()
+
+    try:
+        chunks = remote_api.get_source_stream(job.site)
+        update_data = remote_api.sync_source_stream(
+            job.site,
+            chunks,
+            updates=job.dry_run,
+            progress=_progress,
+            dry_run=job.dry_run,
+        )
+
+    except Exception as ex:
+        error = ex
+
+    # Write pending progress entries before the final state
+    log_executor.submit(_close_connections)
+    log_executor.shutdown(wait=True)
+
+    if error:
+        logger.error('Remote sync job failed: {}'.format(error))
+        job.mark_error(str(error))
+        return
+
+    if remote_api.sync_errors:
+        job.add_log_entry(
+            'Some objects could not be synchronized, see the server log for '
+            'details',
+            level=LOG_LEVEL_ERROR,
+        )
+
+    if job.dry_run:
+        _log_changes(job, update_data)
+
+    job.mark_success()
+
+
+def _log_changes(job, update_data):
+    """Add log entries for changes found in a dry run"""
+    entries = []
+
+    for section, changes in get_sync_changes(update_data):
+        entries += [
+            BackgroundJobLogEntry(
+                job=job.bg_job,
+                level=LOG_LEVEL_INFO,
+                message='{}: {} {}'.format(section, status, desc),
+            )
+            for status, desc in changes
+        ]
+
+    BackgroundJobLogEntry.objects.bulk_create(entries)
+    job.add_log_entry(
+        'Dry run: {} changes found, no changes were saved'.format(len(entries))
+    )
+
+
+def _run_in_thread(job_pk):
+    """Run a remote sync job in the current thread and clean up after it"""
+    try:
+        job = RemoteSyncBackgroundJob.objects.select_related(
+            'bg_job', 'site'
+        ).get(pk=job_pk)
+        run_remote_sync_job(job)
+
+    finally:
+        _close_connections()
+
+
+def fail_stale_remote_sync_jobs(site=None):
+    """
+    Mark unfinished remote sync jobs as failed if they have not been updated
+    within BGJOBS_REMOTE_SYNC_TIMEOUT seconds.
+
+    :param site: RemoteSite object to limit the jobs to (optional)
+    :return: Number of jobs marked as failed (int)
+    """
+    timeout = getattr(
+        settings, 'BGJOBS_REMOTE_SYNC_TIMEOUT', REMOTE_SYNC_TIMEOUT
+    )
+    jobs = RemoteSyncBackgroundJob.objects.exclude(
+        bg_job__status__in=[JOB_STATE_DONE, JOB_STATE_FAILED]
+    ).filter(
+        bg_job__date_modified__lt=timezone.now() - timedelta(seconds=timeout)
+    )
+
+    if site:
+        jobs = jobs.filter(site=site)
+
+    count = 0
+
+    for job in jobs.select_related('bg_job'):
+        logger.warning(
+            'Remote sync job "{}" not updated in {} s, marking as '
+            'failed'.format(job.bg_job.sodar_uuid, timeout)
+        )
+        job.mark_error('No progress in {} s, job was stopped'.format(timeout))
+        count += 1
+
+    return count
+
+
+def start_remote_sync_job(site, user, dry_run=False):
+    """
+    Create a RemoteSyncBackgroundJob for a source site and start running it in
+    the background once the current transaction is committed.
+
+    :param site: RemoteSite object for the source site
+    :param user: User object for the user starting the sync
+    :param dry_run: Only log changes without saving them (boolean)
+    :return: RemoteSyncBackgroundJob object
+    :raise: ValueError if a sync job for the site is already running
+    """
+    with transaction.atomic():
+        # Prevent starting simultaneous jobs. An advisory lock is used, as
+        # a row lock on the site would wait for a running sync to finish.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT pg_advisory_xact_lock(%s, %s)',
+                [REMOTE_SYNC_LOCK_ID, site.pk],
+            )
+
+        fail_stale_remote_sync_jobs(site)
+
+        # Dry runs can be run along other jobs, as they do not save changes
+        if (
+            not dry_run
+            and RemoteSyncBackgroundJob.objects.filter(site=site, dry_run=False)
+            .exclude(bg_job__status__in=[JOB_STATE_DONE, JOB_STATE_FAILED])
+            .exists()
+        ):
+            raise ValueError(
+                'Remote sync from site "{}" is already running'.format(
+                    site.name
+                )
+            )
+
+        if dry_run:
+            name = 'Preview project sync from {}'.format(site.name)
+            desc = 'Check changes in remote projects from source site'
+
+        else:
+            name = 'Synchronize projects from {}'.format(site.name)
+            desc = 'Synchronize remote projects from source site'
+
+        bg_job = BackgroundJob.objects.create(
+            name=name,
+            description='{} "{}" ({})'.format(desc, site.name, site.url),
+            job_type=RemoteSyncBackgroundJob.spec_name,
+            user=user,
+        )
+        job = RemoteSyncBackgroundJob.objects.create(
+            bg_job=bg_job, site=site, dry_run=dry_run
+        )
+
+    thread = threading.Thread(
+        target=_run_in_thread,
+        args=(job.pk,),
+        name='remote-sync-{}'.format(bg_job.sodar_uuid),
+        daemon=True,
+    )
+    transaction.on_commit(thread.start)
+    return job
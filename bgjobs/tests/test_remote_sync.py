@@ -0,0 +1,298 @@
+"""Tests for running remote project sync as a background job"""
+
+import threading
+import uuid
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib import auth
+from django.test import TransactionTestCase, override_settings
+from django.utils import timezone
+
+from projectroles.models import Project, Role, RemoteSite, SODAR_CONSTANTS
+from projectroles.remote_projects import reset_remote_session
+from projectroles.tests.test_remote_projects_api import (
+    SourceSiteServer,
+    SOURCE_CATEGORY_TITLE,
+    SOURCE_CATEGORY_UUID,
+    SOURCE_CATEGORY_ROLE_UUID,
+    SOURCE_PROJECT_TITLE,
+    SOURCE_PROJECT_UUID,
+    SOURCE_PROJECT_ROLE_UUID,
+    SOURCE_SITE_NAME,
+    SOURCE_SITE_SECRET,
+    SOURCE_USER_UUID,
+    SOURCE_USER_USERNAME,
+)
+
+from bgjobs.models import (
+    BackgroundJob,
+    RemoteSyncBackgroundJob,
+    JOB_STATE_DONE,
+    JOB_STATE_FAILED,
+    JOB_STATE_RUNNING,
+    LOG_LEVEL_ERROR,
+)
+from bgjobs.remote_sync import (
+    fail_stale_remote_sync_jobs,
+    start_remote_sync_job,
+    REMOTE_SYNC_TIMEOUT,
+)
+
+
+User = auth.get_user_model()
+
+
+# SODAR constants
+PROJECT_ROLE_OWNER = SODAR_CONSTANTS['PROJECT_ROLE_OWNER']
+PROJECT_ROLE_CONTRIBUTOR = SODAR_CONSTANTS['PROJECT_ROLE_CONTRIBUTOR']
+PROJECT_TYPE_CATEGORY = SODAR_CONSTANTS['PROJECT_TYPE_CATEGORY']
+PROJECT_TYPE_PROJECT = SODAR_CONSTANTS['PROJECT_TYPE_PROJECT']
+SITE_MODE_SOURCE = SODAR_CONSTANTS['SITE_MODE_SOURCE']
+SITE_MODE_TARGET = SODAR_CONSTANTS['SITE_MODE_TARGET']
+REMOTE_LEVEL_READ_ROLES = SODAR_CONSTANTS['REMOTE_LEVEL_READ_ROLES']
+
+
+@override_settings(PROJECTROLES_SITE_MODE=SITE_MODE_TARGET)
+class TestRemoteSyncJob(TransactionTestCase):
+    """Tests for running remote sync background jobs. Progress is written from
+    a separate thread, which requires committed data."""
+
+    def setUp(self):
+        self.server = SourceSiteServer()
+        self.server_thread = threading.Thread(target=self.server.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+        reset_remote_session()
+
+        self.user = User.objects.create_superuser(
+            settings.PROJECTROLES_DEFAULT_ADMIN, 'admin@example.com', 'password'
+        )
+        role_owner = Role.objects.get_or_create(name=PROJECT_ROLE_OWNER)[0]
+        self.source_site = RemoteSite.objects.create(
+            name=SOURCE_SITE_NAME,
+            url=self.server.url,
+            mode=SITE_MODE_SOURCE,
+            secret=SOURCE_SITE_SECRET,
+        )
+        self.server.responses = [
+            (
+                200,
+                {
+                    'users': {
+                        SOURCE_USER_UUID: {
+                            'username': SOURCE_USER_USERNAME,
+                            'name': 'Source User',
+                            'first_name': 'Source',
+                            'last_name': 'User',
+                            'email': 'source.user@example.com',
+                            'groups': [],
+                        }
+                    },
+                    'projects': {
+                        SOURCE_CATEGORY_UUID: {
+                            'title': SOURCE_CATEGORY_TITLE,
+                            'type': PROJECT_TYPE_CATEGORY,
+                            'level': REMOTE_LEVEL_READ_ROLES,
+                            'parent_uuid': None,
+                            'description': '',
+                            'readme': '',
+                            'roles': {
+                                SOURCE_CATEGORY_ROLE_UUID: {
+                                    'user': SOURCE_USER_USERNAME,
+                                    'role': role_owner.name,
+                                }
+                            },
+                        },
+                        SOURCE_PROJECT_UUID: {
+                            'title': SOURCE_PROJECT_TITLE,
+                            'type': PROJECT_TYPE_PROJECT,
+                            'level': REMOTE_LEVEL_READ_ROLES,
+                            'parent_uuid': SOURCE_CATEGORY_UUID,
+                            'description': '',
+                            'readme': '',
+                            'roles': {
+                                SOURCE_PROJECT_ROLE_UUID: {
+                                    'user': SOURCE_USER_USERNAME,
+                                    'role': role_owner.name,
+                                }
+                            },
+                        },
+                    },
+                },
+            )
+        ]
+
+    def tearDown(self):
+        reset_remote_session()
+        self.server.shutdown()
+        self.server.server_close()
+
+    @staticmethod
+    def _wait_for_job(job):
+        """Wait for the thread running a job to finish"""
+        name = 'remote-sync-{}'.format(job.bg_job.sodar_uuid)
+
+        for thread in threading.enumerate():
+            if thread.name == name:
+                thread.join(timeout=30)
+
+    @staticmethod
+    def _get_messages(job):
+        return [e.message for e in job.bg_job.log_entries.all()]
+
+    def test_run(self):
+        """Test running a remote sync job"""
+        job = start_remote_sync_job(self.source_site, self.user)
+        self._wait_for_job(job)
+
+        job.bg_job.refresh_from_db()
+        self.assertEqual(job.bg_job.status, JOB_STATE_DONE)
+        self.assertEqual(
+            self._get_messages(job),
+            [
+                'Remote project sync started',
+                'Synchronized 1 users',
+                'Synchronized 1 categories',
+                'Synchronized 1 projects',
+                'Synchronized 1 roles',
+                'Remote project sync succeeded',
+            ],
+        )
+        self.assertEqual(Project.objects.all().count(), 2)
+
+    def test_run_dry_run(self):
+        """Test running a remote sync job in dry run mode"""
+        job = start_remote_sync_job(self.source_site, self.user, dry_run=True)
+        self._wait_for_job(job)
+
+        job.bg_job.refresh_from_db()
+        self.assertEqual(job.bg_job.status, JOB_STATE_DONE)
+        self.assertEqual(
+            self._get_messages(job),
+            [
+                'Remote project sync started',
+                'Checked 1 users',
+                'Checked 1 categories',
+                'Checked 1 projects',
+                'Checked 1 roles',
+                'Users: created {}'.format(SOURCE_USER_USERNAME),
+                'Projects: created CATEGORY: {} ({})'.format(
+                    SOURCE_CATEGORY_TITLE, SOURCE_CATEGORY_UUID
+                ),
+                'Projects: created PROJECT: {} ({})'.format(
+                    SOURCE_PROJECT_TITLE, SOURCE_PROJECT_UUID
+                ),
+                'Roles: created {} ({}): {} as {}'.format(
+                    SOURCE_CATEGORY_TITLE,
+                    SOURCE_CATEGORY_UUID,
+                    SOURCE_USER_USERNAME,
+                    PROJECT_ROLE_OWNER,
+                ),
+                'Roles: created {} ({}): {} as {}'.format(
+                    SOURCE_PROJECT_TITLE,
+                    SOURCE_PROJECT_UUID,
+                    SOURCE_USER_USERNAME,
+                    PROJECT_ROLE_OWNER,
+                ),
+                'Dry run: 5 changes found, no changes were saved',
+                'Remote project sync succeeded',
+            ],
+        )
+        self.assertEqual(Project.objects.all().count(), 0)
+        self.assertEqual(User.objects.all().count(), 1)
+
+    def test_run_error(self):
+        """Test running a remote sync job with a source site error"""
+        self.server.responses = [(401, 'Remote site not found, unauthorized')]
+        job = start_remote_sync_job(self.source_site, self.user)
+        self._wait_for_job(job)
+
+        job.bg_job.refresh_from_db()
+        self.assertEqual(job.bg_job.status, JOB_STATE_FAILED)
+        self.assertTrue(
+            self._get_messages(job)[-1].startswith('Remote project sync failed')
+        )
+        self.assertEqual(Project.objects.all().count(), 0)
+
+    def test_run_sync_errors(self):
+        """Test running a remote sync job with errors in synchronized data"""
+        role_contributor = Role.objects.get_or_create(
+            name=PROJECT_ROLE_CONTRIBUTOR
+        )[0]
+        self.server.responses[0][1]['projects'][SOURCE_PROJECT_UUID]['roles'][
+            str(uuid.uuid4())
+        ] = {'user': 'localusername', 'role': role_contributor.name}
+        job = start_remote_sync_job(self.source_site, self.user)
+        self._wait_for_job(job)
+
+        job.bg_job.refresh_from_db()
+        self.assertEqual(job.bg_job.status, JOB_STATE_DONE)
+        self.assertEqual(
+            job.bg_job.log_entries.filter(level=LOG_LEVEL_ERROR).count(), 1
+        )
+
+    def _make_running_job(self):
+        """Make a remote sync job left in the running state"""
+        bg_job = BackgroundJob.objects.create(
+            name='Running job',
+            description='Job description',
+            job_type=RemoteSyncBackgroundJob.spec_name,
+            user=self.user,
+            status=JOB_STATE_RUNNING,
+        )
+        return RemoteSyncBackgroundJob.objects.create(
+            bg_job=bg_job, site=self.source_site
+        )
+
+    def test_start_running(self):
+        """Test starting a job with a job already running (should fail)"""
+        self._make_running_job()
+
+        with self.assertRaises(ValueError):
+            start_remote_sync_job(self.source_site, self.user)
+
+        self.assertEqual(RemoteSyncBackgroundJob.objects.count(), 1)
+
+    def test_start_dry_run_running(self):
+        """Test starting a dry run job with a job already running"""
+        self._make_running_job()
+        job = start_remote_sync_job(self.source_site, self.user, dry_run=True)
+        self._wait_for_job(job)
+
+        job.bg_job.refresh_from_db()
+        self.assertEqual(job.bg_job.status, JOB_STATE_DONE)
+
+    def test_start_stale(self):
+        """Test starting a job with a stale job left running"""
+        stale_job = self._make_running_job()
+        BackgroundJob.objects.filter(pk=stale_job.bg_job.pk).update(
+            date_modified=timezone.now()
+            - timedelta(seconds=REMOTE_SYNC_TIMEOUT + 1)
+        )
+
+        job = start_remote_sync_job(self.source_site, self.user)
+        self._wait_for_job(job)
+
+        stale_job.bg_job.refresh_from_db()
+        self.assertEqual(stale_job.bg_job.status, JOB_STATE_FAILED)
+        job.bg_job.refresh_from_db()
+        self.assertEqual(job.bg_job.status, JOB_STATE_DONE)
+
+    def test_fail_stale(self):
+        """Test marking stale jobs as failed"""
+        job = self._make_running_job()
+        self.assertEqual(fail_stale_remote_sync_jobs(), 0)
+
+        BackgroundJob.objects.filter(pk=job.bg_job.pk).update(
+            date_modified=timezone.now()
+            - timedelta(seconds=REMOTE_SYNC_TIMEOUT + 1)
+        )
+        self.assertEqual(fail_stale_remote_sync_jobs(), 1)
+
+        job.bg_job.refresh_from_db()
+        self.assertEqual(job.bg_job.status, JOB_STATE_FAILED)
+        self.assertTrue(
+            self._get_messages(job)[-1].startswith('Remote project sync failed')
+        )
@@ -0,0 +1,128 @@
+"""Tests for views in the bgjobs app"""
+
+from datetime import timedelta
+import json
+
+from django.urls import reverse
+from django.utils import timezone
+
+from test_plus.test import TestCase
+
+from projectroles.models import RemoteSite, SODAR_CONSTANTS
+
+from bgjobs.models import (
+    BackgroundJob,
+    RemoteSyncBackgroundJob,
+    JOB_STATE_FAILED,
+    JOB_STATE_RUNNING,
+)
+from bgjobs.remote_sync import REMOTE_SYNC_TIMEOUT
+
+
+class TestBackgroundJobViewsBase(TestCase):
+    """Base class for background job view tests"""
+
+    def setUp(self):
+        self.superuser = self.make_user('superuser')
+        self.superuser.is_superuser = True
+        self.superuser.save()
+        self.user = self.make_user('user')
+        self.job = BackgroundJob.objects.create(
+            name='Test job',
+            description='Job description',
+            job_type='test',
+            user=self.user,
+            status=JOB_STATE_RUNNING,
+        )
+        self.job.add_log_entry('Test job started')
+
+
+class TestBackgroundJobDetailView(TestBackgroundJobViewsBase):
+    """Tests for the background job detail view"""
+
+    def test_render(self):
+        """Test rendering the detail view for the user's own job"""
+        with self.login(self.user):
+            response = self.client.get(
+                reverse('bgjobs:detail', kwargs={'job': self.job.sodar_uuid})
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['job'], self.job)
+        self.assertContains(response, 'Test job started')
+
+    def test_render_superuser(self):
+        """Test rendering the detail view as superuser"""
+        with self.login(self.superuser):
+            response = self.client.get(
+                reverse('bgjobs:detail', kwargs={'job': self.job.sodar_uuid})
+            )
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_render_other_user(self):
+        """Test rendering the detail view for another user's job (should
+        fail)"""
+        other_user = self.make_user('other_user')
+
+        with self.login(other_user):
+            response = self.client.get(
+                reverse('bgjobs:detail', kwargs={'job': self.job.sodar_uuid})
+            )
+
+        self.assertEqual(response.status_code, 404)
+
+
+class TestBackgroundJobStatusView(TestBackgroundJobViewsBase):
+    """Tests for the background job status view"""
+
+    def test_get(self):
+        """Test retrieving the job status and log"""
+        with self.login(self.user):
+            response = self.client.get(
+                reverse('bgjobs:status', kwargs={'job': self.job.sodar_uuid})
+            )
+
+        self.assertEqual(response.status_code, 200)
+        response_data = json.loads(response.content.decode('utf-8'))
+        self.assertEqual(response_data['status'], JOB_STATE_RUNNING)
+        self.assertEqual(
+            [(e['level'], e['message']) for e in response_data['log_entries']],
+            [('info', 'Test job started')],
+        )
+
+    def test_get_other_user(self):
+        """Test retrieving another user's job status (should fail)"""
+        other_user = self.make_user('other_user')
+
+        with self.login(other_user):
+            response = self.client.get(
+                reverse('bgjobs:status', kwargs={'job': self.job.sodar_uuid})
+            )
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_get_stale_remote_sync(self):
+        """Test retrieving the status of a stale remote sync job"""
+        site = RemoteSite.objects.create(
+            name='Source site',
+            url='https://source.example.com',
+            mode=SODAR_CONSTANTS['SITE_MODE_SOURCE'],
+            secret='secret',
+        )
+        self.job.job_type = RemoteSyncBackgroundJob.spec_name
+        self.job.save()
+        RemoteSyncBackgroundJob.objects.create(bg_job=self.job, site=site)
+        BackgroundJob.objects.filter(pk=self.job.pk).update(
+            date_modified=timezone.now()
+            - timedelta(seconds=REMOTE_SYNC_TIMEOUT + 1)
+        )
+
+        with self.login(self.user):
+            response = self.client.get(
+                reverse('bgjobs:status', kwargs={'job': self.job.sodar_uuid})
+            )
+
+        self.assertEqual(response.status_code, 200)
+        response_data = json.loads(response.content.decode('utf-8'))
+        self.assertEqual(response_data['status'], JOB_STATE_FAILED)
@@ -27,4 +27,16 @@ urlpatterns = [
         view=views.BackgroundJobClearAllView.as_view(),
         name='clear_all',
     ),
+    # Display job status and log
+    url(
+        regex=r'^job/(?P<job>[0-9a-f-]+)$',
+        view=views.BackgroundJobDetailView.as_view(),
+        name='detail',
+    ),
+    # Retrieve job status and log for updating the detail view
+    url(
+        regex=r'^job/(?P<job>[0-9a-f-]+)/status$',
+        view=views.BackgroundJobStatusView.as_view(),
+        name='status',
+    ),
 ]
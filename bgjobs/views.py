@@ -1,8 +1,8 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
-from django.http import HttpResponseRedirect
+from django.http import HttpResponseRedirect, JsonResponse
 from django.urls import reverse
-from django.views.generic import TemplateView, ListView
+from django.views.generic import DetailView, TemplateView, ListView
 
 from projectroles.views import (
     LoggedInPermissionMixin,
@@ -11,7 +11,13 @@ from projectroles.views import (
 )
 from projectroles.plugins import get_backend_api
 
-from .models import BackgroundJob
+from .models import (
+    BackgroundJob,
+    RemoteSyncBackgroundJob,
+    JOB_STATE_DONE,
+    JOB_STATE_FAILED,
+)
+from .remote_sync import fail_stale_remote_sync_jobs
 
 
 class ProjectBackgroundJobView(
@@ -107,3 +113,71 @@ class BackgroundJobClearAllView(BackgroundJobClearViewBase):
 
     which_jobs = 'all'
     permission_required = 'bgjobs.update_bgjob_all'
+
+
+class BackgroundJobAccessMixin:
+    """Mixin for retrieving a ``BackgroundJob`` started by the current user.
+    Superusers can access all jobs."""
+
+    model = BackgroundJob
+    slug_field = 'sodar_uuid'
+    slug_url_kwarg = 'job'
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        if not self.request.user.is_superuser:
+            queryset = queryset.filter(user=self.request.user)
+
+        return queryset
+
+    def get_object(self, queryset=None):
+        job = super().get_object(queryset)
+
+        # Fail remote sync jobs left running by a stopped server process
+        if (
+            job.job_type == RemoteSyncBackgroundJob.spec_name
+            and job.status not in [JOB_STATE_DONE, JOB_STATE_FAILED]
+            and fail_stale_remote_sync_jobs(job.remote_sync_job.site)
+        ):
+            job.refresh_from_db()
+
+        return job
+
+
+class BackgroundJobDetailView(
+    LoginRequiredMixin, BackgroundJobAccessMixin, DetailView
+):
+    """Display the status and log of a ``BackgroundJob``, updated while the
+    job is running."""
+
+    template_name = 'bgjobs/backgroundjob_detail.html'
+    context_object_name = 'job'
+
+    def get_context_data(self, *args, **kwargs):
+        result = super().get_context_data(*args, **kwargs)
+        result['done_states'] = [JOB_STATE_DONE, JOB_STATE_FAILED]
+        return result
+
+
+class BackgroundJobStatusView(
+    LoginRequiredMixin, BackgroundJobAccessMixin, DetailView
+):
+    """Return the status and log entries of a ``BackgroundJob`` as JSON."""
+
+    def render_to_response(self, context, **response_kwargs):
+        job = self.object
+        return JsonResponse(
+            {
+                'status': job.status,
+                'date_modified': job.date_modified.isoformat(),
+                'log_entries': [
+                    {
+                        'date_created': e.date_created.isoformat(),
+                        'level': e.level,
+                        'message': e.message,
+                    }
+                    for e in job.log_entries.all()
+                ],
+            }
+        )
@@ -481,7 +481,20 @@ PROJECTROLES_ENABLE_SEARCH = True
 # Optional projectroles settings
 # PROJECTROLES_SECRET_LENGTH = 32
 # PROJECTROLES_HELP_HIGHLIGHT_DAYS = 7
-# PROJECTROLES_SEARCH_PAGINATION = 5
+PROJECTROLES_SEARCH_PAGINATION = 5
+PROJECTROLES_SEARCH_LIMIT = env.int('PROJECTROLES_SEARCH_LIMIT', 100)
+# PROJECTROLES_SEARCH_MAX_WORKERS = 4
+# PROJECTROLES_SEARCH_TIMEOUT = 30
+# PROJECTROLES_SEARCH_SUGGEST_LIMIT = 10
+# PROJECTROLES_SEARCH_SUGGEST_CACHE_TIMEOUT = 30
+# PROJECTROLES_AUTOCOMPLETE_LIMIT = 50
+# PROJECTROLES_AUTOCOMPLETE_CACHE_TIMEOUT = 60
+# PROJECTROLES_REMOTE_CONNECT_TIMEOUT = 10
+# PROJECTROLES_REMOTE_READ_TIMEOUT = 300
+# PROJECTROLES_REMOTE_RETRIES = 3
+# PROJECTROLES_REMOTE_RETRY_BACKOFF = 0.5
+# PROJECTROLES_REMOTE_SYNC_CHUNK_SIZE = 1000
+# PROJECTROLES_REMOTE_TARGET_CACHE_TIMEOUT = 300
 PROJECTROLES_HIDE_APP_LINKS = env.list('PROJECTROLES_HIDE_APP_LINKS', None, [])
 
 # Set limit for delegate roles per project (if 0, no limit is applied)
@@ -493,6 +506,9 @@ PROJECTROLES_BROWSER_WARNING = True
 # Timeline app settings
 TIMELINE_PAGINATION = 15
 
+# Bgjobs app settings
+# BGJOBS_REMOTE_SYNC_TIMEOUT = 900
+
 
 # Filesfolders app settings
 FILESFOLDERS_MAX_UPLOAD_SIZE = env.int('FILESFOLDERS_MAX_UPLOAD_SIZE', 10485760)
@@ -80,3 +80,5 @@ ENABLED_BACKEND_PLUGINS = [
 PROJECTROLES_SITE_MODE = 'SOURCE'
 PROJECTROLES_SEND_EMAIL = True
 PROJECTROLES_SEARCH_PAGINATION = 10
+# Search in the test thread, as worker threads can't see test transactions
+PROJECTROLES_SEARCH_MAX_WORKERS = 1
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.21 on 2019-06-28 10:14
+from __future__ import unicode_literals
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+from projectroles.search import SEARCH_CONFIG
+from projectroles.utils import get_trigram_index_sql
+
+
+# Local constants
+MODEL_NAMES = ['file', 'folder', 'hyperlink']
+PARTIAL_FIELDS = ['name', 'description']
+
+
+def populate_search_vector(apps, schema_editor):
+    """Populate search vectors for existing objects"""
+    for model_name in MODEL_NAMES:
+        model = apps.get_model('filesfolders', model_name)
+        model.objects.update(
+            search_vector=SearchVector(
+                'name', weight='A', config=SEARCH_CONFIG
+            )
+            + SearchVector('description', weight='B', config=SEARCH_CONFIG)
+        )
+
+
+def get_index_name(model_name, field):
+    """Return name for the trigram index of a field"""
+    return 'filesfolders_{}_{}_trgm'.format(model_name, field)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('filesfolders', '0004_update_uuid'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='file',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, help_text='Full text search vector of name and description', null=True),
+        ),
+        migrations.AddField(
+            model_name='folder',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, help_text='Full text search vector of name and description', null=True),
+        ),
+        migrations.AddField(
+            model_name='hyperlink',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, help_text='Full text search vector of name and description', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='file',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='filesfolder_search__4e8762_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='folder',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='filesfolder_search__fb96b0_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='hyperlink',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='filesfolder_search__072952_gin'),
+        ),
+        migrations.RunPython(
+            populate_search_vector, migrations.RunPython.noop
+        ),
+    ] + [
+        migrations.RunSQL(
+            get_trigram_index_sql(
+                'filesfolders_{}'.format(model_name),
+                'UPPER({})'.format(field),
+                get_index_name(model_name, field),
+            ),
+            'DROP INDEX IF EXISTS {}'.format(
+                get_index_name(model_name, field)
+            ),
+        )
+        for model_name in MODEL_NAMES
+        for field in PARTIAL_FIELDS
+    ]
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.21 on 2019-06-28 14:05
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('filesfolders', '0005_search_vector'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='file',
+            name='date_modified',
+            field=models.DateTimeField(auto_now=True, db_index=True, help_text='DateTime of last modification'),
+        ),
+        migrations.AlterField(
+            model_name='file',
+            name='flag',
+            field=models.CharField(blank=True, choices=[('FLAG', 'Flagged'), ('FLAG_HEART', 'Flagged (Heart)'), ('IMPORTANT', 'Important'), ('REVOKED', 'Revoked'), ('SUPERSEDED', 'Superseded')], db_index=True, help_text='Flag for highlighting the item (optional)', max_length=64, null=True),
+        ),
+        migrations.AlterField(
+            model_name='folder',
+            name='date_modified',
+            field=models.DateTimeField(auto_now=True, db_index=True, help_text='DateTime of last modification'),
+        ),
+        migrations.AlterField(
+            model_name='folder',
+            name='flag',
+            field=models.CharField(blank=True, choices=[('FLAG', 'Flagged'), ('FLAG_HEART', 'Flagged (Heart)'), ('IMPORTANT', 'Important'), ('REVOKED', 'Revoked'), ('SUPERSEDED', 'Superseded')], db_index=True, help_text='Flag for highlighting the item (optional)', max_length=64, null=True),
+        ),
+        migrations.AlterField(
+            model_name='hyperlink',
+            name='date_modified',
+            field=models.DateTimeField(auto_now=True, db_index=True, help_text='DateTime of last modification'),
+        ),
+        migrations.AlterField(
+            model_name='hyperlink',
+            name='flag',
+            field=models.CharField(blank=True, choices=[('FLAG', 'Flagged'), ('FLAG_HEART', 'Flagged (Heart)'), ('IMPORTANT', 'Important'), ('REVOKED', 'Revoked'), ('SUPERSEDED', 'Superseded')], db_index=True, help_text='Flag for highlighting the item (optional)', max_length=64, null=True),
+        ),
+    ]
@@ -1,6 +1,8 @@
 import uuid
 
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.db.models import Q
 
@@ -8,6 +10,11 @@ from db_file_storage.model_utils import delete_file, delete_file_if_needed
 
 # Projectroles dependency
 from projectroles.models import Project
+from projectroles.search import (
+    parse_search_date,
+    register_search_index,
+    search_queryset,
+)
 
 
 # Access Django user model
@@ -15,6 +22,8 @@ AUTH_USER_MODEL = getattr(settings, 'AUTH_USER_MODEL', 'auth.User')
 
 
 # Local constants
+SEARCH_INDEX_FIELDS = {'name': 'A', 'description': 'B'}
+SEARCH_KEYWORDS = ['owner', 'parent', 'modified', 'flag']
 FILESFOLDERS_FLAGS = {
     'IMPORTANT': {
         'icon': 'exclamation-circle',
@@ -61,19 +70,41 @@ class FilesfoldersManager(models.Manager):
 
     def find(self, search_term, keywords=None):
         """
-        Return objects or links matching the query.
+        Return objects or links matching the query in the full text search
+        index or with a partial match in name or description, ordered by
+        search rank. Supported keywords are listed in SEARCH_KEYWORDS.
         :param search_term: Search term (string)
         :param keywords: Optional search keywords as key/value pairs (dict)
-        :return: Python list of BaseFilesfolderClass objects
+        :return: QuerySet of BaseFilesfolderClass objects
+        :raise: ValueError if the "modified" keyword is not a valid date
         """
-        objects = super().get_queryset().order_by('name')
+        objects = super().get_queryset()
+        keywords = keywords or {}
 
-        objects = objects.filter(
-            Q(name__icontains=search_term)
-            | Q(description__icontains=search_term)
-        )
+        if 'owner' in keywords:
+            objects = objects.filter(owner__username=keywords['owner'])
+
+        if 'parent' in keywords:
+            objects = objects.filter(
+                project__parent_path__overlap=Project.objects.get_category_ids(
+                    keywords['parent']
+                )
+            )
+
+        if 'modified' in keywords:
+            objects = objects.filter(
+                date_modified__gte=parse_search_date(keywords['modified'])
+            )
 
-        return objects
+        if 'flag' in keywords:
+            objects = objects.filter(flag=keywords['flag'].upper())
+
+        return search_queryset(
+            objects,
+            search_term,
+            partial=Q(name__icontains=search_term)
+            | Q(description__icontains=search_term),
+        ).order_by('-search_rank', 'name')
 
 
 class BaseFilesfoldersClass(models.Model):
@@ -107,7 +138,7 @@ class BaseFilesfoldersClass(models.Model):
 
     #: DateTime of last modification
     date_modified = models.DateTimeField(
-        auto_now=True, help_text='DateTime of last modification'
+        auto_now=True, db_index=True, help_text='DateTime of last modification'
     )
 
     #: Flag for highlighting the item (optional)
@@ -117,6 +148,7 @@ class BaseFilesfoldersClass(models.Model):
         blank=True,
         null=True,
         choices=FLAG_CHOICES,
+        db_index=True,
         help_text='Flag for highlighting the item (optional)',
     )
 
@@ -133,6 +165,14 @@ class BaseFilesfoldersClass(models.Model):
         default=uuid.uuid4, unique=True, help_text='Filesfolders SODAR UUID'
     )
 
+    #: Full text search vector of name and description
+    #: (maintained automatically on save)
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        help_text='Full text search vector of name and description',
+    )
+
     # Set manager for custom queries
     objects = FilesfoldersManager()
 
@@ -149,6 +189,7 @@ class Folder(BaseFilesfoldersClass):
     class Meta:
         ordering = ['project', 'name']
         unique_together = ('project', 'folder', 'name')
+        indexes = [GinIndex(fields=['search_vector'])]
 
     def __str__(self):
         return '{}: {}{}'.format(
@@ -270,6 +311,7 @@ class File(BaseFilesfoldersClass):
     class Meta:
         ordering = ['folder', 'name']
         unique_together = ('project', 'folder', 'name')
+        indexes = [GinIndex(fields=['search_vector'])]
 
     def __str__(self):
         return '{}: {}{}'.format(
@@ -308,6 +350,7 @@ class HyperLink(BaseFilesfoldersClass):
     class Meta:
         ordering = ['folder', 'name']
         unique_together = ('project', 'folder', 'name')
+        indexes = [GinIndex(fields=['search_vector'])]
 
     def __str__(self):
         return '{}: {}{}'.format(
@@ -323,3 +366,11 @@ class HyperLink(BaseFilesfoldersClass):
             self.folder if self.folder else '',
         )
         return 'HyperLink({})'.format(', '.join(repr(v) for v in values))
+
+
+# Search indexes ---------------------------------------------------------------
+
+
+register_search_index(Folder, SEARCH_INDEX_FIELDS)
+register_search_index(File, SEARCH_INDEX_FIELDS)
+register_search_index(HyperLink, SEARCH_INDEX_FIELDS)
@@ -1,11 +1,13 @@
 from django.conf import settings
+from django.db.models import Count
 from django.urls import reverse
 
 # Projectroles dependency
+from projectroles.access import filter_by_project_access
 from projectroles.models import SODAR_CONSTANTS
 from projectroles.plugins import ProjectAppPluginPoint
 
-from .models import File, Folder, HyperLink
+from .models import File, Folder, HyperLink, SEARCH_KEYWORDS
 from .urls import urlpatterns
 
 
@@ -18,6 +20,7 @@ SHOW_LIST_COLUMNS = (
     if hasattr(settings, 'FILESFOLDERS_SHOW_LIST_COLUMNS')
     else False
 )
+SEARCH_TYPE_MODELS = {'file': File, 'folder': Folder, 'link': HyperLink}
 
 
 class ProjectAppPlugin(ProjectAppPluginPoint):
@@ -68,6 +71,9 @@ class ProjectAppPlugin(ProjectAppPluginPoint):
     #: List of search object types for the app
     search_types = ['file', 'folder', 'link']
 
+    #: List of search keywords supported by the search() function of the app
+    search_keywords = SEARCH_KEYWORDS
+
     #: Search results template
     search_template = 'filesfolders/_search_results.html'
 
@@ -117,7 +123,17 @@ class ProjectAppPlugin(ProjectAppPluginPoint):
         if not obj:
             return None
 
-        elif obj.__class__ == File:
+        return self._get_item_link(obj)
+
+    @classmethod
+    def _get_item_link(cls, obj):
+        """
+        Return URL and label for a file, folder or link object.
+
+        :param obj: File, Folder or HyperLink object
+        :return: Dict or None if the object type is not supported
+        """
+        if obj.__class__ == File:
             return {
                 'url': reverse(
                     'filesfolders:file_serve',
@@ -140,7 +156,15 @@ class ProjectAppPlugin(ProjectAppPluginPoint):
 
         return None
 
-    def search(self, search_term, user, search_type=None, keywords=None):
+    def search(
+        self,
+        search_term,
+        user,
+        search_type=None,
+        keywords=None,
+        limit=None,
+        offset=0,
+    ):
         """
         Return app items based on a search term, user, optional type and
         optional keywords
@@ -148,43 +172,89 @@ class ProjectAppPlugin(ProjectAppPluginPoint):
         :param user: User object for user initiating the search
         :param search_type: String
         :param keywords: List (optional)
+        :param limit: Maximum number of returned items (int or None)
+        :param offset: Offset of the first returned item (int)
         :return: Dict
         """
+        if not search_type:
+            models = [File, Folder, HyperLink]
+
+        elif search_type in SEARCH_TYPE_MODELS:
+            models = [SEARCH_TYPE_MODELS[search_type]]
+
+        else:
+            models = []
+
         items = []
 
-        if not search_type:
-            files = File.objects.find(search_term, keywords)
-            folders = Folder.objects.find(search_term, keywords)
-            links = HyperLink.objects.find(search_term, keywords)
-            items = list(files) + list(folders) + list(links)
-            items.sort(key=lambda x: x.name.lower())
-
-        elif search_type == 'file':
-            items = File.objects.find(search_term, keywords).order_by('name')
-
-        elif search_type == 'folder':
-            items = Folder.objects.find(search_term, keywords).order_by('name')
-
-        elif search_type == 'link':
-            items = HyperLink.objects.find(search_term, keywords).order_by(
-                'name'
-            )
-
-        if items:
-            items = [
-                x
-                for x in items
-                if user.has_perm('filesfolders.view_data', x.project)
-            ]
+        for model in models:
+            objects = filter_by_project_access(
+                model.objects.find(search_term, keywords),
+                user,
+                include_categories=False,
+            ).select_related('project')
+
+            # Results of multiple models are paged after sorting
+            if limit and len(models) == 1:
+                objects = objects[offset : offset + limit + 1]
+
+            elif limit:
+                objects = objects[: offset + limit + 1]
+
+            items += list(objects)
+
+        if len(models) > 1:
+            items.sort(key=lambda x: (-x.search_rank, x.name.lower()))
+
+            if limit:
+                items = items[offset:]
+
+        has_more = bool(limit) and len(items) > limit
+
+        if limit:
+            items = items[:limit]
 
         return {
             'all': {
                 'title': 'Small Files, Folders and Links',
                 'search_types': ['file', 'folder', 'link'],
                 'items': items,
+                'has_more': has_more,
             }
         }
 
+    def get_search_suggestions(self, search_term, user, limit=10):
+        """
+        Return files, folders and links with names starting with the search
+        term as suggestions for the site search box.
+
+        :param search_term: String
+        :param user: User object for user initiating the search
+        :param limit: Maximum number of suggestions to return (int)
+        :return: List of dicts
+        """
+        items = []
+
+        for search_type, model in SEARCH_TYPE_MODELS.items():
+            objects = filter_by_project_access(
+                model.objects.filter(name__istartswith=search_term),
+                user,
+                include_categories=False,
+            ).select_related('project')
+
+            for obj in objects.order_by('name')[:limit]:
+                link = self._get_item_link(obj)
+                items.append(
+                    {
+                        'label': link['label'],
+                        'url': link['url'],
+                        'search_type': search_type,
+                        'project': obj.project,
+                    }
+                )
+
+        return sorted(items, key=lambda x: x['label'].lower())[:limit]
+
     def get_statistics(self):
         return {
             'file_count': {
@@ -210,18 +280,49 @@ class ProjectAppPlugin(ProjectAppPluginPoint):
         :param project: Project object
         :return: String (may contain HTML) or None
         """
-        if column_id == 'files':
-            count = File.objects.filter(project=project).count()
+        return self.get_project_list_values(column_id, [project])[project]
 
-        elif column_id == 'links':
-            count = HyperLink.objects.filter(project=project).count()
+    def get_project_list_values(self, column_id, projects):
+        """
+        Return values for the optional additional project list column for
+        multiple projects at once.
 
-        if count > 0:
-            return '<a href="{}">{}'.format(
-                reverse(
-                    'filesfolders:list', kwargs={'project': project.sodar_uuid}
-                ),
-                count,
-            )
+        :param column_id: ID of the column (string)
+        :param projects: List of Project objects
+        :return: Dict of values (string, may contain HTML, or None) keyed by
+                 Project object
+        """
+        if column_id == 'files':
+            model = File
 
-        return count
+        elif column_id == 'links':
+            model = HyperLink
+
+        else:
+            return {p: None for p in projects}
+
+        counts = dict(
+            model.objects.filter(project__in=projects)
+            .order_by()
+            .values('project')
+            .annotate(count=Count('pk'))
+            .values_list('project', 'count')
+        )
+        ret = {}
+
+        for project in projects:
+            count = counts.get(project.pk, 0)
+
+            if count > 0:
+                ret[project] = '<a href="{}">{}'.format(
+                    reverse(
+                        'filesfolders:list',
+                        kwargs={'project': project.sodar_uuid},
+                    ),
+                    count,
+                )
+
+            else:
+                ret[project] = count
+
+        return ret
@@ -4,6 +4,7 @@ import base64
 
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.forms.models import model_to_dict
+from django.utils import timezone
 
 from test_plus.test import TestCase
 
@@ -152,6 +153,82 @@ class TestFolder(FolderMixin, ProjectMixin, HyperLinkMixin, TestCase):
         objects = Folder.objects.find('Jaix1azu')
         self.assertEqual(len(objects), 0)
 
+    def test_find_rank(self):
+        """Test FilesfoldersManager find() ordering by search rank"""
+        folder_desc = self._make_folder(
+            name='a_folder',
+            project=self.project,
+            folder=None,
+            owner=self.user_owner,
+            description='Sequencing data',
+        )
+        folder_name = self._make_folder(
+            name='Sequencing',
+            project=self.project,
+            folder=None,
+            owner=self.user_owner,
+            description='',
+        )
+        objects = Folder.objects.find('sequencing')
+        self.assertEqual(list(objects), [folder_name, folder_desc])
+
+    def test_find_update(self):
+        """Test FilesfoldersManager find() after updating Folder"""
+        self.folder.description = 'Sequencing data'
+        self.folder.save()
+        objects = Folder.objects.find('sequencing')
+        self.assertEqual(len(objects), 1)
+        self.assertGreater(objects[0].search_rank, 0)
+
+    def test_find_keyword_owner(self):
+        """Test FilesfoldersManager find() with the owner keyword"""
+        objects = Folder.objects.find('folder', {'owner': 'owner'})
+        self.assertEqual(list(objects), [self.folder])
+        objects = Folder.objects.find('folder', {'owner': 'other'})
+        self.assertEqual(list(objects), [])
+
+    def test_find_keyword_parent(self):
+        """Test FilesfoldersManager find() with the parent keyword"""
+        category = self._make_project(
+            'TestCategory', PROJECT_TYPE_CATEGORY, None
+        )
+        self.assertEqual(
+            list(Folder.objects.find('folder', {'parent': 'testcategory'})), []
+        )
+        self.project.parent = category
+        self.project.save()
+        self.assertEqual(
+            list(Folder.objects.find('folder', {'parent': 'testcategory'})),
+            [self.folder],
+        )
+
+    def test_find_keyword_modified(self):
+        """Test FilesfoldersManager find() with the modified keyword"""
+        date = timezone.localtime(self.folder.date_modified).strftime(
+            '%Y-%m-%d'
+        )
+        objects = Folder.objects.find('folder', {'modified': date})
+        self.assertEqual(list(objects), [self.folder])
+        objects = Folder.objects.find('folder', {'modified': '2999-01-01'})
+        self.assertEqual(list(objects), [])
+
+    def test_find_keyword_modified_invalid(self):
+        """Test FilesfoldersManager find() with an invalid modified keyword"""
+        with self.assertRaises(ValueError):
+            Folder.objects.find('folder', {'modified': 'yesterday'})
+
+    def test_find_keyword_flag(self):
+        """Test FilesfoldersManager find() with the flag keyword"""
+        self.assertEqual(
+            list(Folder.objects.find('folder', {'flag': 'important'})), []
+        )
+        self.folder.flag = 'IMPORTANT'
+        self.folder.save()
+        self.assertEqual(
+            list(Folder.objects.find('folder', {'flag': 'important'})),
+            [self.folder],
+        )
+
     def test__str__(self):
         expected = '{}: root/folder'.format(PROJECT_NAME)
         self.assertEqual(str(self.folder), expected)
@@ -155,3 +155,93 @@ class TestPlugins(
         """Test get_object_link() with a non-existent object"""
         plugin = ProjectAppPluginPoint.get_plugin(PLUGIN_NAME)
         self.assertEqual(plugin.get_object_link('File', uuid.uuid4()), None)
+
+    def test_get_project_list_values(self):
+        """Test get_project_list_values()"""
+        plugin = ProjectAppPluginPoint.get_plugin(PLUGIN_NAME)
+        project_empty = self._make_project(
+            'TestProjectEmpty', PROJECT_TYPE_PROJECT, None
+        )
+        url = reverse(
+            'filesfolders:list', kwargs={'project': self.project.sodar_uuid}
+        )
+
+        with self.assertNumQueries(1):
+            ret = plugin.get_project_list_values(
+                'files', [self.project, project_empty]
+            )
+        self.assertEqual(
+            ret, {self.project: '<a href="{}">1'.format(url), project_empty: 0}
+        )
+
+    def test_get_project_list_value(self):
+        """Test get_project_list_value()"""
+        plugin = ProjectAppPluginPoint.get_plugin(PLUGIN_NAME)
+        url = reverse(
+            'filesfolders:list', kwargs={'project': self.project.sodar_uuid}
+        )
+        self.assertEqual(
+            plugin.get_project_list_value('links', self.project),
+            '<a href="{}">1'.format(url),
+        )
+
+    def test_search(self):
+        """Test search()"""
+        plugin = ProjectAppPluginPoint.get_plugin(PLUGIN_NAME)
+        ret = plugin.search('l', self.user)
+        self.assertEqual(len(ret['all']['items']), 3)
+        self.assertEqual(ret['all']['has_more'], False)
+
+    def test_search_limit(self):
+        """Test search() with limit and offset"""
+        plugin = ProjectAppPluginPoint.get_plugin(PLUGIN_NAME)
+        items = plugin.search('l', self.user)['all']['items']
+
+        ret = plugin.search('l', self.user, limit=2)
+        self.assertEqual(ret['all']['items'], items[:2])
+        self.assertEqual(ret['all']['has_more'], True)
+
+        ret = plugin.search('l', self.user, limit=2, offset=2)
+        self.assertEqual(ret['all']['items'], items[2:])
+        self.assertEqual(ret['all']['has_more'], False)
+
+    def test_search_type(self):
+        """Test search() with search type and limit"""
+        plugin = ProjectAppPluginPoint.get_plugin(PLUGIN_NAME)
+        ret = plugin.search('l', self.user, 'folder', limit=1)
+        self.assertEqual(ret['all']['items'], [self.folder])
+        self.assertEqual(ret['all']['has_more'], False)
+
+    def test_search_no_role(self):
+        """Test search() as user without project roles"""
+        plugin = ProjectAppPluginPoint.get_plugin(PLUGIN_NAME)
+        ret = plugin.search('l', self.make_user('user_no_roles'))
+        self.assertEqual(ret['all']['items'], [])
+
+    def test_get_search_suggestions(self):
+        """Test get_search_suggestions()"""
+        plugin = ProjectAppPluginPoint.get_plugin(PLUGIN_NAME)
+        ret = plugin.get_search_suggestions('FOL', self.user)
+        self.assertEqual(len(ret), 1)
+        self.assertEqual(ret[0]['label'], self.folder.name)
+        self.assertEqual(ret[0]['search_type'], 'folder')
+        self.assertEqual(ret[0]['project'], self.project)
+        self.assertEqual(
+            ret[0]['url'],
+            reverse(
+                'filesfolders:list', kwargs={'folder': self.folder.sodar_uuid}
+            ),
+        )
+
+    def test_get_search_suggestions_prefix(self):
+        """Test get_search_suggestions() only matching the name prefix"""
+        plugin = ProjectAppPluginPoint.get_plugin(PLUGIN_NAME)
+        self.assertEqual(plugin.get_search_suggestions('ile', self.user), [])
+
+    def test_get_search_suggestions_no_role(self):
+        """Test get_search_suggestions() as user without project roles"""
+        plugin = ProjectAppPluginPoint.get_plugin(PLUGIN_NAME)
+        ret = plugin.get_search_suggestions(
+            'fol', self.make_user('user_no_roles')
+        )
+        self.assertEqual(ret, [])
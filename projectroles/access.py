@@ -0,0 +1,158 @@
+"""Role resolution helpers for projectroles permission checks"""
+
+from django.db.models import F, Func, IntegerField, Q
+from django.db.models.signals import post_delete, post_save
+
+from projectroles.models import Project, RoleAssignment, SODAR_CONSTANTS
+
+
+# SODAR constants
+PROJECT_TYPE_CATEGORY = SODAR_CONSTANTS['PROJECT_TYPE_CATEGORY']
+
+# Local constants
+RESOLVER_ATTR = '_sodar_role_resolver'
+
+
+# Version of role data, incremented whenever roles or the project tree change
+_role_version = 0
+
+
+class RoleResolver:
+    """
+    Resolver for the project roles of a single user. All role assignments of
+    the user are loaded in one query on initialization, after which role
+    lookups do not query the database.
+    """
+
+    def __init__(self, user):
+        """
+        Load roles for a user.
+
+        :param user: User object
+        """
+        self.version = _role_version
+        self.roles = {}  # Role names by project pk
+        self.child_role_pks = set()  # Pks of categories with roles under them
+
+        # Anonymous users can't have roles
+        if not user.is_authenticated:
+            return
+
+        for a in RoleAssignment.objects.filter(user=user).select_related(
+            'role', 'project'
+        ):
+            self.roles[a.project.pk] = a.role.name
+            self.child_role_pks.update(a.project.parent_path)
+
+    def get_role(self, project):
+        """
+        Return name of the user's role in a project.
+
+        :param project: Project object or None
+        :return: String or None if the user has no role in the project
+        """
+        if not project:
+            return None
+
+        return self.roles.get(project.pk)
+
+    def has_role(self, project):
+        """
+        Return True if the user has a role in a project.
+
+        :param project: Project object or None
+        :return: Boolean
+        """
+        return self.get_role(project) is not None
+
+    def has_child_role(self, project):
+        """
+        Return True if the user has a role in a category or any project nested
+        under it.
+
+        :param project: Project object
+        :return: Boolean
+        """
+        return project.type == PROJECT_TYPE_CATEGORY and (
+            project.pk in self.roles or project.pk in self.child_role_pks
+        )
+
+    def has_roles(self):
+        """
+        Return True if the user has any roles on the site.
+
+        :return: Boolean
+        """
+        return len(self.roles) > 0
+
+
+def get_role_resolver(user):
+    """
+    Return role resolver for a user. The resolver is stored in the user object,
+    which makes it last for the duration of a request when called with
+    request.user. The resolver is reloaded if roles are modified.
+
+    :param user: User object
+    :return: RoleResolver object
+    """
+    resolver = getattr(user, RESOLVER_ATTR, None)
+
+    if not resolver or resolver.version != _role_version:
+        resolver = RoleResolver(user)
+        setattr(user, RESOLVER_ATTR, resolver)
+
+    return resolver
+
+
+def filter_by_project_access(
+    queryset, user, project_lookup='project', include_categories=True
+):
+    """
+    Filter a queryset to objects in projects the user is allowed to view:
+    projects in which the user has a role and, if include_categories is True,
+    the categories containing them. Superusers can view all objects. The
+    filtering is done with role assignment subqueries in the same database
+    query.
+
+    :param queryset: QuerySet of objects related to Project
+    :param user: User object
+    :param project_lookup: Lookup from queryset model to Project (string, use
+                           "pk" for Project querysets)
+    :param include_categories: Include parent categories of projects (boolean)
+    :return: QuerySet
+    """
+    if not user.is_authenticated:
+        return queryset.none()
+
+    if user.is_superuser:
+        return queryset
+
+    assignments = RoleAssignment.objects.filter(user=user)
+    access = Q(**{project_lookup + '__in': assignments.values('project')})
+
+    if include_categories:
+        categories = assignments.annotate(
+            category=Func(
+                F('project__parent_path'),
+                function='unnest',
+                output_field=IntegerField(),
+            )
+        ).values('category')
+        access |= Q(**{project_lookup + '__in': categories})
+
+    return queryset.filter(access)
+
+
+# Signals ----------------------------------------------------------------------
+
+
+def invalidate_role_resolvers(sender, **kwargs):
+    """Signal for invalidating role resolvers on role or project changes"""
+    global _role_version
+    _role_version += 1
+
+
+post_save.connect(invalidate_role_resolvers, sender=RoleAssignment)
+post_delete.connect(invalidate_role_resolvers, sender=RoleAssignment)
+post_save.connect(invalidate_role_resolvers, sender=Project)
+post_delete.connect(invalidate_role_resolvers, sender=Project)
@@ -1,5 +1,9 @@
 """Project and user settings API"""
 
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+
 from projectroles.models import AppSetting, APP_SETTING_TYPES, SODAR_CONSTANTS
 from projectroles.plugins import get_app_plugin, get_active_plugins
 
@@ -8,8 +12,31 @@ from projectroles.plugins import get_app_plugin, get_active_plugins
 APP_SETTING_SCOPE_PROJECT = SODAR_CONSTANTS['APP_SETTING_SCOPE_PROJECT']
 APP_SETTING_SCOPE_USER = SODAR_CONSTANTS['APP_SETTING_SCOPE_USER']
 
+# Settings
+CACHE_TIMEOUT = (
+    settings.PROJECTROLES_APP_SETTING_CACHE_TIMEOUT
+    if hasattr(settings, 'PROJECTROLES_APP_SETTING_CACHE_TIMEOUT')
+    else 300
+)
+
 # Local constants
 VALID_SCOPES = [APP_SETTING_SCOPE_PROJECT, APP_SETTING_SCOPE_USER]
+CACHE_KEY_PREFIX = 'projectroles.app_settings'
+
+
+def get_cache_key(project=None, user=None):
+    """
+    Return cache key for the setting values of a project or user.
+
+    :param project: Project object or pk (can be None)
+    :param user: User object or pk (can be None)
+    :return: String
+    """
+    return '{}.{}.{}'.format(
+        CACHE_KEY_PREFIX,
+        getattr(project, 'pk', project) or '',
+        getattr(user, 'pk', user) or '',
+    )
 
 
 class AppSettingAPI:
@@ -41,6 +68,32 @@ class AppSettingAPI:
         if scope not in VALID_SCOPES:
             raise ValueError('Invalid scope "{}"'.format(scope))
 
+    @classmethod
+    def _get_setting_values(cls, project=None, user=None):
+        """
+        Return all stored setting values for a project or user. Values are
+        retrieved in a single query and cached until modified.
+
+        :param project: Project object or pk (can be None)
+        :param user: User object or pk (can be None)
+        :return: Dict of setting values by app name and setting name
+        """
+        cache_key = get_cache_key(project, user)
+        ret = cache.get(cache_key)
+
+        if ret is None:
+            ret = {}
+
+            for setting in AppSetting.objects.filter(
+                project=project, user=user
+            ).select_related('app_plugin'):
+                app_values = ret.setdefault(setting.app_plugin.name, {})
+                app_values[setting.name] = setting.get_value()
+
+            cache.set(cache_key, ret, CACHE_TIMEOUT)
+
+        return ret
+
     @classmethod
     def get_default_setting(cls, app_name, setting_name):
         """
@@ -76,14 +129,13 @@ class AppSettingAPI:
         :param user: User object (can be None)
         :return: String or None
         :raise: KeyError if nothing is found with setting_name
+        :raise: ValueError if neither project nor user are set
         """
-        try:
-            return AppSetting.objects.get_setting_value(
-                app_name, setting_name, project=project, user=user
-            )
+        cls._check_project_and_user(project, user)
+        values = cls._get_setting_values(project, user).get(app_name, {})
 
-        except AppSetting.DoesNotExist:
-            pass
+        if setting_name in values:
+            return values[setting_name]
 
         return cls.get_default_setting(app_name, setting_name)
 
@@ -101,15 +153,17 @@ class AppSettingAPI:
         cls._check_project_and_user(project, user)
 
         ret = {}
+        values = cls._get_setting_values(project, user)
         app_plugins = get_active_plugins()
 
         for plugin in app_plugins:
             p_settings = cls.get_setting_defs(plugin, APP_SETTING_SCOPE_PROJECT)
+            p_values = values.get(plugin.name, {})
 
-            for s_key in p_settings:
-                ret[
-                    'settings.{}.{}'.format(plugin.name, s_key)
-                ] = cls.get_app_setting(plugin.name, s_key, project, user)
+            for s_key, s_def in p_settings.items():
+                ret['settings.{}.{}'.format(plugin.name, s_key)] = (
+                    p_values[s_key] if s_key in p_values else s_def['default']
+                )
 
         return ret
 
@@ -272,3 +326,15 @@ class AppSettingAPI:
                 )
             )
         }
+
+
+# Signals ----------------------------------------------------------------------
+
+
+def invalidate_setting_cache(sender, instance, **kwargs):
+    """Signal for invalidating cached setting values on setting changes"""
+    cache.delete(get_cache_key(instance.project_id, instance.user_id))
+
+
+post_save.connect(invalidate_setting_cache, sender=AppSetting)
+post_delete.connect(invalidate_setting_cache, sender=AppSetting)
@@ -1,14 +1,11 @@
-import json
 import logging
-import urllib.request
 
 from django.contrib import auth
 from django.conf import settings
 from django.core.management.base import BaseCommand
-from django.urls import reverse
 
 from projectroles.models import RemoteSite, SODAR_CONSTANTS
-from projectroles.remote_projects import RemoteProjectAPI
+from projectroles.remote_projects import RemoteProjectAPI, get_sync_changes
 
 User = auth.get_user_model()
 logger = logging.getLogger(__name__)
@@ -23,7 +20,26 @@ class Command(BaseCommand):
     help = 'Synchronizes user and project data from a remote site.'
 
     def add_arguments(self, parser):
-        pass
+        parser.add_argument(
+            '-f',
+            '--full',
+            action='store_true',
+            help='Retrieve all data instead of changes since the last sync',
+        )
+        parser.add_argument(
+            '-d',
+            '--dry-run',
+            action='store_true',
+            help='Print changes without saving them',
+        )
+
+    def _print_changes(self, update_data):
+        """Print users, projects and roles changed in a dry run"""
+        for section, changes in get_sync_changes(update_data):
+            self.stdout.write('{} ({}):'.format(section, len(changes)))
+
+            for status, desc in changes:
+                self.stdout.write('  {:<8} {}'.format(status, desc))
 
     def handle(self, *args, **options):
         if (
@@ -62,20 +78,39 @@ class Command(BaseCommand):
             )
         )
 
-        api_url = site.url + reverse(
-            'projectroles:api_remote_get', kwargs={'secret': site.secret}
-        )
+        remote_api = RemoteProjectAPI()
+        since = None
+        etag = None
+
+        if site.sync_token and not options.get('full'):
+            logger.info(
+                'Retrieving changes since last sync ({})'.format(
+                    site.sync_token
+                )
+            )
+            since = site.sync_token
+            etag = site.sync_etag
+
+        dry_run = options.get('dry_run')
 
         try:
-            response = urllib.request.urlopen(api_url)
-            remote_data = json.loads(response.read())
+            chunks = remote_api.get_source_stream(site, since=since, etag=etag)
+
+            if chunks is None:
+                logger.info('No changes since last sync')
+
+            elif dry_run:
+                self._print_changes(
+                    remote_api.sync_source_stream(site, chunks, dry_run=True)
+                )
+
+            else:
+                remote_api.sync_source_stream(site, chunks, updates=False)
 
         except Exception as ex:
             logger.error(
-                'Unable to retrieve data from remote site: {}'.format(ex)
+                'Unable to synchronize data from remote site: {}'.format(ex)
             )
             return
 
-        remote_api = RemoteProjectAPI()
-        remote_api.sync_source_data(site, remote_data)
         logger.info('Syncremote command OK')
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.21 on 2019-06-25 10:12
+from __future__ import unicode_literals
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+def populate_parent_path(apps, schema_editor):
+    """Populate parent paths for existing projects"""
+    Project = apps.get_model('projectroles', 'Project')
+    parents = dict(Project.objects.values_list('pk', 'parent_id'))
+
+    for pk in parents:
+        path = []
+        parent_id = parents[pk]
+
+        while parent_id:
+            path.insert(0, parent_id)
+            parent_id = parents[parent_id]
+
+        Project.objects.filter(pk=pk).update(parent_path=path)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projectroles', '0010_update_appsetting'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='parent_path',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.IntegerField(), blank=True, default=list, editable=False, help_text='Primary keys of parent categories in inheritance order', size=None),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['parent_path'], name='projectrole_parent__74f7c3_gin'),
+        ),
+        migrations.RunPython(
+            populate_parent_path, migrations.RunPython.noop
+        ),
+    ]
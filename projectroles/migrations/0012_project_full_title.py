@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.21 on 2019-06-26 09:31
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+from projectroles.utils import get_trigram_index_sql
+
+
+def populate_full_title(apps, schema_editor):
+    """Populate full titles and search text for existing projects"""
+    Project = apps.get_model('projectroles', 'Project')
+    projects = {p.pk: p for p in Project.objects.all()}
+
+    for project in projects.values():
+        full_title = ' / '.join(
+            [projects[pk].title for pk in project.parent_path]
+            + [project.title]
+        )
+        Project.objects.filter(pk=project.pk).update(
+            full_title=full_title,
+            search_text='{}\n{}'.format(
+                full_title, project.description or ''
+            ).lower(),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projectroles', '0011_project_parent_path'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='full_title',
+            field=models.TextField(db_index=True, default='', editable=False, help_text='Full title of project including parent categories'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='search_text',
+            field=models.TextField(default='', editable=False, help_text='Lowercase full title and description for searching'),
+        ),
+        migrations.RunPython(
+            populate_full_title, migrations.RunPython.noop
+        ),
+        migrations.RunSQL(
+            get_trigram_index_sql(
+                'projectroles_project',
+                'search_text',
+                'projectroles_project_search_text_trgm',
+            ),
+            'DROP INDEX IF EXISTS projectroles_project_search_text_trgm',
+        ),
+    ]
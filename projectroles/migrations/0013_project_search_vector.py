@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.21 on 2019-06-28 10:12
+from __future__ import unicode_literals
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+from projectroles.search import SEARCH_CONFIG
+
+
+def populate_search_vector(apps, schema_editor):
+    """Populate search vectors for existing projects"""
+    Project = apps.get_model('projectroles', 'Project')
+    Project.objects.update(
+        search_vector=SearchVector('full_title', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('description', weight='B', config=SEARCH_CONFIG)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projectroles', '0012_project_full_title'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, help_text='Full text search vector of full title and description', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='projectrole_search__e792bf_gin'),
+        ),
+        migrations.RunPython(
+            populate_search_vector, migrations.RunPython.noop
+        ),
+    ]
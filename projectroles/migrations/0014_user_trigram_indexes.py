@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.21 on 2019-06-28 16:20
+from __future__ import unicode_literals
+
+from django.conf import settings
+from django.db import migrations
+
+from projectroles.utils import get_trigram_index_sql
+
+
+USER_SEARCH_FIELDS = ['username', 'first_name', 'last_name', 'name', 'email']
+
+
+def get_index_name(table, field):
+    return '{}_{}_trgm'.format(table, field)
+
+
+def create_user_indexes(apps, schema_editor):
+    """Create trigram indexes for user autocomplete on the user table"""
+    table = apps.get_model(settings.AUTH_USER_MODEL)._meta.db_table
+
+    for field in USER_SEARCH_FIELDS:
+        schema_editor.execute(
+            get_trigram_index_sql(
+                table,
+                'UPPER({})'.format(field),
+                get_index_name(table, field),
+            )
+        )
+
+
+def drop_user_indexes(apps, schema_editor):
+    """Drop trigram indexes for user autocomplete"""
+    table = apps.get_model(settings.AUTH_USER_MODEL)._meta.db_table
+
+    for field in USER_SEARCH_FIELDS:
+        schema_editor.execute(
+            'DROP INDEX IF EXISTS {}'.format(get_index_name(table, field))
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('projectroles', '0013_project_search_vector'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_user_indexes, drop_user_indexes),
+    ]
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.21 on 2019-06-28 16:45
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [('projectroles', '0014_user_trigram_indexes')]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='date_modified',
+            field=models.DateTimeField(
+                auto_now=True,
+                db_index=True,
+                default=django.utils.timezone.now,
+                help_text='DateTime of last modification',
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='remotesite',
+            name='sync_token',
+            field=models.CharField(
+                blank=True,
+                help_text='Token of the last successful sync from the source '
+                'site',
+                max_length=255,
+                null=True,
+            ),
+        ),
+    ]
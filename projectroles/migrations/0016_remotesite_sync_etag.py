@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.21 on 2019-07-01 10:12
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [('projectroles', '0015_remote_sync_delta')]
+
+    operations = [
+        migrations.AddField(
+            model_name='remotesite',
+            name='sync_etag',
+            field=models.CharField(
+                blank=True,
+                help_text='ETag of the source site data on the last '
+                'successful sync',
+                max_length=255,
+                null=True,
+            ),
+        )
+    ]
@@ -4,17 +4,28 @@ from django.apps import apps
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.contrib.auth.signals import user_logged_in
-from django.contrib.postgres.fields import JSONField
+from django.contrib.postgres.fields import ArrayField, JSONField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from django.db import models
-from django.db.models import Q
+from django.db import connection, models
+from django.db.models import F, Func, IntegerField, Q
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_save,
+)
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 
 from djangoplugins.models import Plugin
 from markupfield.fields import MarkupField
 
 from .constants import get_sodar_constants
+from .search import register_search_index, search_queryset, update_search_index
 from .utils import set_user_group
 
 
@@ -34,7 +45,23 @@ APP_SETTING_TYPE_CHOICES = [
 ]
 APP_SETTING_VAL_MAXLENGTH = 255
 PROJECT_SEARCH_TYPES = ['project']
+PROJECT_SEARCH_KEYWORDS = ['owner', 'parent']
 PROJECT_TAG_STARRED = 'STARRED'
+REMOTE_SOURCE_CACHE_KEY = 'projectroles.remote_source_sites'
+REMOTE_TARGET_VERSION_KEY = 'projectroles.remote_target_version'
+REMOTE_TARGET_ACCESS_KEY = 'projectroles.remote_target_access.{site}.{version}'
+REMOTE_TARGET_DATA_KEY = 'projectroles.remote_target_data.{access}.{version}'
+USER_AUTOCOMPLETE_VERSION_KEY = 'projectroles.user_autocomplete.{project}'
+USER_AUTOCOMPLETE_USERS_KEY = 'projectroles.user_autocomplete_users'
+USER_SEARCH_FIELDS = ['username', 'first_name', 'last_name', 'name', 'email']
+REMOTE_SYNC_USER_FIELDS = [
+    'sodar_uuid',
+    'username',
+    'name',
+    'first_name',
+    'last_name',
+    'email',
+]
 
 
 # Project ----------------------------------------------------------------------
@@ -45,31 +72,161 @@ class ProjectManager(models.Manager):
 
     def find(self, search_term, keywords=None, project_type=None):
         """
-        Return projects with a partial match in full title or, including titles
-        of parent Project objects, or the description of the current object.
-        Restrict to project type if project_type is set.
+        Return projects matching the search term in the full text search index
+        or with a partial match in full title, including titles of parent
+        Project objects, or the description of the current object. Results are
+        ordered by search rank. Restrict to project type if project_type is
+        set. Supported keywords are "owner" (user name of project owner) and
+        "parent" (title of a parent category on any level).
         :param search_term: Search term (string)
         :param keywords: Optional search keywords as key/value pairs (dict)
         :param project_type: Project type or None
-        :return: List of Project objects
+        :return: QuerySet of Project objects
         """
-        search_term = search_term.lower()
-        projects = super().get_queryset().order_by('title')
+        projects = super().get_queryset()
+        keywords = keywords or {}
 
         if project_type:
             projects = projects.filter(type=project_type)
 
-        # NOTE: Can't use a custom function in filter()
-        result = [
-            p
-            for p in projects
-            if (
-                search_term in p.get_full_title().lower()
-                or (p.description and search_term in p.description.lower())
+        if 'owner' in keywords:
+            projects = projects.filter(
+                roles__user__username=keywords['owner'],
+                roles__role__name=SODAR_CONSTANTS['PROJECT_ROLE_OWNER'],
+            )
+
+        if 'parent' in keywords:
+            projects = projects.filter(
+                parent_path__overlap=self.get_category_ids(keywords['parent'])
             )
-        ]
 
-        return sorted(result, key=lambda x: x.get_full_title())
+        return search_queryset(
+            projects,
+            search_term,
+            partial=Q(search_text__contains=search_term.lower()),
+        ).order_by('-search_rank', 'full_title')
+
+    def get_modified(self, since):
+        """
+        Return projects and categories modified since a date, including those
+        under modified categories. Besides changes in the objects themselves,
+        the modification date is updated on changes to roles, role users and
+        remote project access.
+        :param since: DateTime object
+        :return: QuerySet of Project objects
+        """
+        modified = super().get_queryset().filter(date_modified__gte=since)
+        category_pks = list(
+            modified.filter(
+                type=SODAR_CONSTANTS['PROJECT_TYPE_CATEGORY']
+            ).values_list('pk', flat=True)
+        )
+        return (
+            super()
+            .get_queryset()
+            .filter(
+                Q(date_modified__gte=since)
+                | Q(parent_path__overlap=category_pks)
+            )
+        )
+
+    def get_category_ids(self, title):
+        """
+        Return primary keys of categories with a title, for filtering objects
+        by parent category with the "parent" search keyword.
+        :param title: Category title (string, case insensitive)
+        :return: List of integers
+        """
+        return list(
+            super()
+            .get_queryset()
+            .filter(
+                type=SODAR_CONSTANTS['PROJECT_TYPE_CATEGORY'],
+                title__iexact=title,
+            )
+            .values_list('pk', flat=True)
+        )
+
+    def get_visible_projects(self, user, project_type=None, parent=None):
+        """
+        Return projects and categories the user is allowed to view: projects
+        in which the user has a role and their parent categories. Superusers
+        can view all projects.
+        :param user: User object
+        :param project_type: Project type or None
+        :param parent: Only return projects under this category if set
+        :return: QuerySet of Project objects
+        """
+        # Imported here as the access module depends on models
+        from projectroles.access import filter_by_project_access
+
+        projects = filter_by_project_access(
+            super().get_queryset(), user, project_lookup='pk'
+        )
+
+        if project_type:
+            projects = projects.filter(type=project_type)
+
+        if parent:
+            projects = projects.filter(parent_path__contains=[parent.pk])
+
+        return projects
+
+    def get_visible_categories(self, user, parent=None):
+        """
+        Return categories the user is allowed to view.
+        :param user: User object
+        :param parent: Only return categories under this category if set
+        :return: QuerySet of Project objects
+        """
+        return self.get_visible_projects(
+            user,
+            project_type=SODAR_CONSTANTS['PROJECT_TYPE_CATEGORY'],
+            parent=parent,
+        )
+
+    def ancestors(self, project):
+        """
+        Return parent categories of a project in inheritance order, starting
+        from the root category. Resolved in a single query.
+        :param project: Project object
+        :return: QuerySet of Project objects
+        """
+        return (
+            super()
+            .get_queryset()
+            .filter(pk__in=project.parent_path)
+            .annotate(
+                path_depth=Func(
+                    F('parent_path'),
+                    function='CARDINALITY',
+                    output_field=IntegerField(),
+                )
+            )
+            .order_by('path_depth')
+        )
+
+    def descendants(self, project):
+        """
+        Return all projects and categories nested under a project on any
+        level. Resolved in a single query.
+        :param project: Project object
+        :return: QuerySet of Project objects
+        """
+        return super().get_queryset().filter(parent_path__contains=[project.pk])
+
+    def subtree(self, project):
+        """
+        Return a project along with all projects and categories nested under
+        it. Resolved in a single query.
+        :param project: Project object
+        :return: QuerySet of Project objects
+        """
+        return (
+            super()
+            .get_queryset()
+            .filter(Q(pk=project.pk) | Q(parent_path__contains=[project.pk]))
+        )
 
 
 class Project(models.Model):
@@ -131,22 +288,60 @@ class Project(models.Model):
         default=uuid.uuid4, unique=True, help_text='Project SODAR UUID'
     )
 
+    #: Primary keys of parent categories in inheritance order (maintained
+    #: automatically on save)
+    parent_path = ArrayField(
+        models.IntegerField(),
+        default=list,
+        blank=True,
+        editable=False,
+        help_text='Primary keys of parent categories in inheritance order',
+    )
+
+    #: Full title of project including parent categories (maintained
+    #: automatically on save)
+    full_title = models.TextField(
+        default='',
+        db_index=True,
+        editable=False,
+        help_text='Full title of project including parent categories',
+    )
+
+    #: Lowercase full title and description for partial match searches
+    #: (maintained automatically on save)
+    search_text = models.TextField(
+        default='',
+        editable=False,
+        help_text='Lowercase full title and description for searching',
+    )
+
+    #: Full text search vector of full title and description
+    #: (maintained automatically on save)
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        help_text='Full text search vector of full title and description',
+    )
+
+    #: DateTime of last modification of the project, its roles or their
+    #: users (maintained automatically, used for remote sync)
+    date_modified = models.DateTimeField(
+        auto_now=True, db_index=True, help_text='DateTime of last modification'
+    )
+
     # Set manager for custom queries
     objects = ProjectManager()
 
     class Meta:
         unique_together = ('title', 'parent')
         ordering = ['parent__title', 'title']
+        indexes = [
+            GinIndex(fields=['parent_path']),
+            GinIndex(fields=['search_vector']),
+        ]
 
     def __str__(self):
-        parents = self.get_parents()
-        ret = ' / '.join([p.title for p in parents]) if parents else ''
-
-        if ret:
-            ret += ' / '
-
-        ret += self.title
-        return ret
+        return self.full_title or self._build_full_title()
 
     def __repr__(self):
         values = (
@@ -161,14 +356,71 @@ class Project(models.Model):
         self._validate_parent()
         self._validate_title()
         self._validate_parent_type()
+        old_path = self.parent_path if self.pk else None
+        old_title = self.full_title if self.pk else None
+        self.parent_path = (
+            self.parent.parent_path + [self.parent.pk] if self.parent else []
+        )
+        self.full_title = self._build_full_title()
+        self.search_text = '{}\n{}'.format(
+            self.full_title, self.description or ''
+        ).lower()
         super().save(*args, **kwargs)
 
+        if (
+            old_path is not None
+            and (old_path != self.parent_path or old_title != self.full_title)
+            and self.type == SODAR_CONSTANTS['PROJECT_TYPE_CATEGORY']
+        ):
+            self._update_children()
+
+    def _build_full_title(self):
+        """Return full title built from the parent's full title"""
+        if not self.parent:
+            return self.title
+
+        return '{} / {}'.format(self.parent.full_title, self.title)
+
+    def _update_children(self):
+        """Update parent paths and full titles of all projects nested under
+        this category to match the current path and title of the category"""
+        table = self._meta.db_table
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'UPDATE {table} SET parent_path = %s::integer[] || '
+                'parent_path[array_position(parent_path, %s):] '
+                'WHERE parent_path @> ARRAY[%s]'.format(table=table),
+                [self.parent_path, self.pk, self.pk],
+            )
+            cursor.execute(
+                'UPDATE {table} SET full_title = t.full_title, '
+                'search_text = LOWER(t.full_title || %s || '
+                'COALESCE({table}.description, %s)) '
+                'FROM (SELECT d.id, (SELECT string_agg(a.title, %s '
+                'ORDER BY array_position(d.parent_path, a.id)) FROM {table} a '
+                'WHERE a.id = ANY(d.parent_path)) || %s || d.title '
+                'AS full_title FROM {table} d '
+                'WHERE d.parent_path @> ARRAY[%s]) t '
+                'WHERE {table}.id = t.id'.format(table=table),
+                ['\n', '', ' / ', ' / ', self.pk],
+            )
+
+        update_search_index(
+            Project.objects.filter(parent_path__contains=[self.pk])
+        )
+
     def _validate_parent(self):
         """Validate parent value to ensure project can't be set as its own
-        parent"""
+        parent or be moved under one of its own children"""
         if self.parent == self:
             raise ValidationError('Project can not be set as its own parent')
 
+        if self.pk and self.parent and self.pk in self.parent.parent_path:
+            raise ValidationError(
+                'Project can not be moved under its own child category'
+            )
+
     def _validate_parent_type(self):
         """Validate parent value to ensure parent can not be a project"""
         if (
@@ -199,14 +451,7 @@ class Project(models.Model):
 
     def get_depth(self):
         """Return depth of project in the project tree structure (root=0)"""
-        ret = 0
-        p = self
-
-        while p.parent:
-            ret += 1
-            p = p.parent
-
-        return ret
+        return len(self.parent_path)
 
     def get_owner(self):
         """Return RoleAssignment for owner or None if not set"""
@@ -235,29 +480,19 @@ class Project(models.Model):
     def has_role(self, user, include_children=False):
         """Return whether user has roles in Project. If include_children is
         True, return True if user has roles in ANY child project"""
-        if self.roles.filter(user=user).count() > 0:
-            return True
+        q = Q(project=self)
 
         if include_children:
-            for child in self.children.all():
-                if child.has_role(user, include_children=True):
-                    return True
+            q |= Q(project__parent_path__contains=[self.pk])
 
-        return False
+        return RoleAssignment.objects.filter(q, user=user).exists()
 
     def get_parents(self):
         """Return an array of parent projects in inheritance order"""
-        if not self.parent:
+        if not self.parent_path:
             return None
 
-        ret = []
-        parent = self.parent
-
-        while parent:
-            ret.append(parent)
-            parent = parent.parent
-
-        return reversed(ret)
+        return list(Project.objects.ancestors(self))
 
     def get_full_title(self):
         """Return full title of project (just an alias for __str__())"""
@@ -272,17 +507,9 @@ class Project(models.Model):
             return None
 
         RemoteProject = apps.get_model('projectroles', 'RemoteProject')
-
-        try:
-            return RemoteProject.objects.get(
-                project_uuid=self.sodar_uuid,
-                site__mode=SODAR_CONSTANTS['SITE_MODE_SOURCE'],
-            ).site
-
-        except RemoteProject.DoesNotExist:
-            pass
-
-        return None
+        return RemoteProject.objects.get_source_sites().get(
+            str(self.sodar_uuid)
+        )
 
     def is_remote(self):
         """Return True if current project has been retrieved from a remote
@@ -805,6 +1032,24 @@ class RemoteSite(models.Model):
         help_text='RemoteSite relation UUID (local)',
     )
 
+    #: Token returned by the source site on the last successful sync, used
+    #: for only retrieving changes on the next sync (target mode only)
+    sync_token = models.CharField(
+        max_length=255,
+        blank=True,
+        null=True,
+        help_text='Token of the last successful sync from the source site',
+    )
+
+    #: ETag of the source site data on the last successful sync, used for
+    #: skipping unchanged data on the next sync (target mode only)
+    sync_etag = models.CharField(
+        max_length=255,
+        blank=True,
+        null=True,
+        help_text='ETag of the source site data on the last successful sync',
+    )
+
     class Meta:
         ordering = ['name']
         unique_together = ['url', 'mode', 'secret']
@@ -849,6 +1094,31 @@ class RemoteSite(models.Model):
 # RemoteProject ----------------------------------------------------------------
 
 
+class RemoteProjectManager(models.Manager):
+    """Manager for custom table-level RemoteProject queries"""
+
+    def get_source_sites(self):
+        """
+        Return source sites of remote projects mapped by project UUID. The
+        mapping is retrieved in a single query and cached until remote projects
+        or sites are modified.
+
+        :return: Dict of RemoteSite objects with UUID strings as keys
+        """
+        ret = cache.get(REMOTE_SOURCE_CACHE_KEY)
+
+        if ret is None:
+            ret = {
+                str(rp.project_uuid): rp.site
+                for rp in self.filter(
+                    site__mode=SODAR_CONSTANTS['SITE_MODE_SOURCE']
+                ).select_related('site')
+            }
+            cache.set(REMOTE_SOURCE_CACHE_KEY, ret)
+
+        return ret
+
+
 class RemoteProject(models.Model):
     """Remote project relation"""
 
@@ -898,6 +1168,9 @@ class RemoteProject(models.Model):
         help_text='RemoteProject relation UUID (local)',
     )
 
+    # Set manager for custom queries
+    objects = RemoteProjectManager()
+
     class Meta:
         ordering = ['site__name', 'project_uuid']
 
@@ -956,6 +1229,179 @@ class SODARUser(AbstractUser):
         return self.username
 
 
+# Search indexes ---------------------------------------------------------------
+
+
+register_search_index(Project, {'full_title': 'A', 'description': 'B'})
+
+
+# Remote project signals -------------------------------------------------------
+
+
+def invalidate_remote_source_cache(sender, **kwargs):
+    """Signal for invalidating cached source sites on remote data changes"""
+    cache.delete(REMOTE_SOURCE_CACHE_KEY)
+
+
+post_save.connect(invalidate_remote_source_cache, sender=RemoteProject)
+post_delete.connect(invalidate_remote_source_cache, sender=RemoteProject)
+post_save.connect(invalidate_remote_source_cache, sender=RemoteSite)
+post_delete.connect(invalidate_remote_source_cache, sender=RemoteSite)
+
+
+# User autocomplete signals ----------------------------------------------------
+
+
+def invalidate_user_autocomplete_cache(sender, instance, **kwargs):
+    """Signal for invalidating cached user autocomplete results of a project
+    on role assignment changes"""
+    cache.set(
+        USER_AUTOCOMPLETE_VERSION_KEY.format(project=instance.project_id),
+        uuid.uuid4().hex,
+        None,
+    )
+
+
+post_save.connect(invalidate_user_autocomplete_cache, sender=RoleAssignment)
+post_delete.connect(invalidate_user_autocomplete_cache, sender=RoleAssignment)
+
+
+def invalidate_user_autocomplete_users_cache(sender, **kwargs):
+    """Signal for invalidating all cached user autocomplete results on user
+    changes"""
+    # Users are also saved on logins, which do not change searched fields
+    if not getattr(kwargs.get('instance'), '_sync_changed', True):
+        return
+
+    cache.set(USER_AUTOCOMPLETE_USERS_KEY, uuid.uuid4().hex, None)
+
+
+def invalidate_user_autocomplete_groups_cache(sender, action, **kwargs):
+    """Signal for invalidating all cached user autocomplete results on user
+    group changes"""
+    if sender != apps.get_model(
+        AUTH_USER_MODEL
+    ).groups.through or action not in ['post_add', 'post_remove', 'post_clear']:
+        return
+
+    invalidate_user_autocomplete_users_cache(sender)
+
+
+post_save.connect(
+    invalidate_user_autocomplete_users_cache, sender=AUTH_USER_MODEL
+)
+post_delete.connect(
+    invalidate_user_autocomplete_users_cache, sender=AUTH_USER_MODEL
+)
+m2m_changed.connect(invalidate_user_autocomplete_groups_cache)
+
+
+# Remote sync signals ----------------------------------------------------------
+
+
+def update_role_project_modified(sender, instance, **kwargs):
+    """Signal for updating project modification date on role changes"""
+    Project.objects.filter(pk=instance.project_id).update(
+        date_modified=timezone.now()
+    )
+
+
+def update_remote_project_modified(sender, instance, **kwargs):
+    """Signal for updating project modification date on remote access
+    changes"""
+    Project.objects.filter(sodar_uuid=instance.project_uuid).update(
+        date_modified=timezone.now()
+    )
+
+
+def check_user_sync_changes(sender, instance, **kwargs):
+    """Signal for checking if synchronized fields of a user are changed in
+    save(), e.g. to ignore saves done on each login"""
+    update_fields = kwargs.get('update_fields')
+    fields = [
+        f
+        for f in REMOTE_SYNC_USER_FIELDS
+        if not update_fields or f in update_fields
+    ]
+    instance._sync_changed = bool(fields)
+
+    if not fields or not instance.pk:
+        return
+
+    stored = sender.objects.filter(pk=instance.pk).values_list(*fields).first()
+    instance._sync_changed = not stored or [str(v) for v in stored] != [
+        str(getattr(instance, f)) for f in fields
+    ]
+
+
+def update_user_projects_modified(sender, instance, **kwargs):
+    """Signal for updating modification dates of projects in which the user
+    has roles on user changes"""
+    if not getattr(instance, '_sync_changed', True):
+        return
+
+    Project.objects.filter(roles__user=instance).update(
+        date_modified=timezone.now()
+    )
+
+
+def update_user_groups_modified(sender, instance, action, pk_set, **kwargs):
+    """Signal for updating modification dates of projects on user group
+    changes"""
+    if sender != apps.get_model(
+        AUTH_USER_MODEL
+    ).groups.through or action not in ['post_add', 'post_remove']:
+        return
+
+    # Groups may be modified from either side of the relation
+    user_pks = pk_set if kwargs.get('reverse') else [instance.pk]
+    Project.objects.filter(roles__user__pk__in=user_pks).update(
+        date_modified=timezone.now()
+    )
+
+
+post_save.connect(update_role_project_modified, sender=RoleAssignment)
+post_delete.connect(update_role_project_modified, sender=RoleAssignment)
+post_save.connect(update_remote_project_modified, sender=RemoteProject)
+post_delete.connect(update_remote_project_modified, sender=RemoteProject)
+pre_save.connect(check_user_sync_changes, sender=AUTH_USER_MODEL)
+post_save.connect(update_user_projects_modified, sender=AUTH_USER_MODEL)
+m2m_changed.connect(update_user_groups_modified)
+
+
+def invalidate_remote_target_cache(sender, **kwargs):
+    """Signal for invalidating cached target site sync data on project, role,
+    remote project and user changes"""
+    # Users are also saved on logins, which do not change synchronized fields
+    if not getattr(kwargs.get('instance'), '_sync_changed', True):
+        return
+
+    cache.set(REMOTE_TARGET_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def invalidate_remote_target_groups_cache(sender, action, **kwargs):
+    """Signal for invalidating cached target site sync data on user group
+    changes"""
+    if sender != apps.get_model(
+        AUTH_USER_MODEL
+    ).groups.through or action not in ['post_add', 'post_remove']:
+        return
+
+    invalidate_remote_target_cache(sender)
+
+
+post_save.connect(invalidate_remote_target_cache, sender=Project)
+post_delete.connect(invalidate_remote_target_cache, sender=Project)
+post_save.connect(invalidate_remote_target_cache, sender=RoleAssignment)
+post_delete.connect(invalidate_remote_target_cache, sender=RoleAssignment)
+post_save.connect(invalidate_remote_target_cache, sender=RemoteProject)
+post_delete.connect(invalidate_remote_target_cache, sender=RemoteProject)
+post_save.connect(invalidate_remote_target_cache, sender=RemoteSite)
+post_delete.connect(invalidate_remote_target_cache, sender=RemoteSite)
+post_save.connect(invalidate_remote_target_cache, sender=AUTH_USER_MODEL)
+m2m_changed.connect(invalidate_remote_target_groups_cache)
+
+
 # User signals -----------------------------------------------------------------
 
 
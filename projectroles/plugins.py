@@ -1,7 +1,17 @@
 """Plugin point definitions and plugin API for apps based on projectroles"""
 
+import logging
+import uuid
+
 from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from djangoplugins.models import Plugin
 from djangoplugins.point import PluginPoint
+from djangoplugins.utils import db_table_exists
+
+
+logger = logging.getLogger(__name__)
 
 
 # Local costants
@@ -16,6 +26,13 @@ ENABLED = 0
 DISABLED = 1
 REMOVED = 2
 
+# Shared cache key for the version of plugin status, updated on changes
+PLUGIN_VERSION_KEY = 'projectroles.plugin_version'
+
+# Process-level registry of active plugins by plugin type
+_active_plugins = {}
+_active_plugins_version = None
+
 
 # Plugin points ----------------------------------------------------------------
 
@@ -71,6 +88,10 @@ class ProjectAppPluginPoint(PluginPoint):
     # TODO: Implement this in your app plugin
     search_types = []
 
+    #: List of search keywords supported by the search() function of the app
+    # TODO: Implement this in your app plugin (optional)
+    search_keywords = []
+
     #: Search results template
     # TODO: Implement this in your app plugin
     search_template = None
@@ -162,15 +183,29 @@ class ProjectAppPluginPoint(PluginPoint):
         # TODO: Implement this in your app plugin
         return '(unknown)'
 
-    def search(self, search_term, user, search_type=None, keywords=None):
+    def search(
+        self,
+        search_term,
+        user,
+        search_type=None,
+        keywords=None,
+        limit=None,
+        offset=0,
+    ):
         """
         Return app items based on a search term, user, optional type and
-        optional keywords.
+        optional keywords. If limit is set, return at most limit items per
+        result list starting from offset, and set has_more to True for lists
+        with more matching items. Plugins without the limit and offset
+        arguments are also supported, in which case their results are limited
+        after retrieval.
 
         :param search_term: String
         :param user: User object for user initiating the search
         :param search_type: String
         :param keywords: List (optional)
+        :param limit: Maximum number of items per result list (int or None)
+        :param offset: Offset of the first returned item (int)
         :return: Dict
         """
         # TODO: Implement this in your app plugin
@@ -180,9 +215,26 @@ class ProjectAppPluginPoint(PluginPoint):
                 'title': 'Title to be displayed',
                 'search_types': [],
                 'items': [],
+                'has_more': False,  # Optional, True if items were omitted
             }
         }
 
+    def get_search_suggestions(self, search_term, user, limit=10):
+        """
+        Return objects matching the beginning of a search term as suggestions
+        for the site search box. The lookup should use an index, as this is
+        called while the user is typing. Only objects the user has access to
+        should be returned.
+
+        :param search_term: String
+        :param user: User object for user initiating the search
+        :param limit: Maximum number of suggestions to return (int)
+        :return: List of dicts with "label", "url", "search_type" (string) and
+                 "project" (Project object or None)
+        """
+        # TODO: Implement this in your app plugin (optional)
+        return []
+
     def update_cache(self, name=None, project=None, user=None):
         """
         Update cached data for this app, limitable to item ID and/or project.
@@ -216,6 +268,21 @@ class ProjectAppPluginPoint(PluginPoint):
         # TODO: Implement this in your app plugin (optional)
         return None
 
+    def get_project_list_values(self, column_id, projects):
+        """
+        Return values for the optional additional project list column for
+        multiple projects at once. By default, calls get_project_list_value()
+        for each project. Override this to retrieve values for all projects
+        with a constant number of queries.
+
+        :param column_id: ID of the column (string)
+        :param projects: List of Project objects
+        :return: Dict of values (string, may contain HTML, or None) keyed by
+                 Project object
+        """
+        # TODO: Implement this in your app plugin (optional, recommended)
+        return {p: self.get_project_list_value(column_id, p) for p in projects}
+
 
 class BackendPluginPoint(PluginPoint):
     """Projectroles plugin point for registering backend apps"""
@@ -286,15 +353,54 @@ class SiteAppPluginPoint(PluginPoint):
         return []
 
 
+PLUGIN_POINTS = {
+    'project_app': ProjectAppPluginPoint,
+    'backend': BackendPluginPoint,
+    'site_app': SiteAppPluginPoint,
+}
+
+
 # Plugin API -------------------------------------------------------------------
 
 
+def _get_registered_plugins(plugin_type):
+    """
+    Return active plugins of a specific type from the process-level registry,
+    loading them from the database if not yet registered.
+
+    :param plugin_type: "project_app", "site_app" or "backend" (string)
+    :return: List
+    """
+    global _active_plugins_version
+    version = cache.get(PLUGIN_VERSION_KEY)
+
+    # Plugin status may have been changed in another process
+    if version != _active_plugins_version:
+        _active_plugins.clear()
+        _active_plugins_version = version
+
+    if plugin_type not in _active_plugins:
+        point = PLUGIN_POINTS[plugin_type]
+
+        # Database tables may not yet exist e.g. during migrations
+        if not db_table_exists(Plugin._meta.db_table):
+            return []
+
+        _active_plugins[plugin_type] = sorted(
+            [m.get_plugin() for m in point.get_plugins_qs()],
+            key=lambda x: x.name,
+        )
+
+    return _active_plugins[plugin_type]
+
+
 def get_active_plugins(plugin_type='project_app'):
     """
-    Return active plugins of a specific type.
+    Return active plugins of a specific type. Plugins are loaded once per
+    process and reloaded if plugin status is changed in any process.
 
     :param plugin_type: "project_app", "site_app" or "backend" (string)
-    :return: List or None
+    :return: List
     :raise: ValueError if plugin_type is not recognized
     """
     if plugin_type not in PLUGIN_TYPES.keys():
@@ -304,25 +410,21 @@ def get_active_plugins(plugin_type='project_app'):
             )
         )
 
-    plugins = eval(PLUGIN_TYPES[plugin_type]).get_plugins()
-
-    if plugins:
-        return sorted(
-            [
-                p
-                for p in plugins
-                if (
-                    p.is_active()
-                    and (
-                        plugin_type in ['project_app', 'site_app']
-                        or p.name in settings.ENABLED_BACKEND_PLUGINS
-                    )
-                )
-            ],
-            key=lambda x: x.name,
+    return [
+        p
+        for p in _get_registered_plugins(plugin_type)
+        if (
+            plugin_type in ['project_app', 'site_app']
+            or p.name in settings.ENABLED_BACKEND_PLUGINS
         )
+    ]
 
-    return None
+
+def reset_active_plugins(sender=None, **kwargs):
+    """Clear the registry of active plugins in all processes sharing the
+    Django cache. Connected to plugin model signals."""
+    cache.set(PLUGIN_VERSION_KEY, uuid.uuid4().hex, None)
+    _active_plugins.clear()
 
 
 def change_plugin_status(name, status, plugin_type='app'):
@@ -361,16 +463,20 @@ def change_plugin_status(name, status, plugin_type='app'):
 
 def get_app_plugin(plugin_name):
     """
-    Return active app plugin.
+    Return active app plugin. As in ProjectAppPluginPoint.get_plugin(), only
+    enabled plugins are returned.
 
     :param plugin_name: Plugin name (string)
-    :return: ProjectAppPlugin object or None if not found
+    :return: ProjectAppPlugin object or None if not found or not enabled
     """
-    try:
-        return ProjectAppPluginPoint.get_plugin(plugin_name)
-
-    except ProjectAppPluginPoint.DoesNotExist:
-        return None
+    return next(
+        (
+            p
+            for p in _get_registered_plugins('project_app')
+            if p.name == plugin_name
+        ),
+        None,
+    )
 
 
 def get_backend_api(plugin_name, force=False):
@@ -382,16 +488,33 @@ def get_backend_api(plugin_name, force=False):
     :return: Plugin object or None if not found
     """
     if plugin_name in settings.ENABLED_BACKEND_PLUGINS or force:
+        # Plugin modules may fail to import if called while loading modules
         try:
-            plugin = BackendPluginPoint.get_plugin(plugin_name)
-            return plugin.get_api() if plugin.is_active() else None
+            plugins = _get_registered_plugins('backend')
+
+        except Exception as ex:
+            logger.error(
+                'Unable to load backend plugins for "{}": {}'.format(
+                    plugin_name, ex
+                )
+            )
+            return None
 
-        except Exception:
-            pass
+        for plugin in plugins:
+            if plugin.name == plugin_name:
+                try:
+                    return plugin.get_api()
+
+                except Exception:
+                    pass
 
     return None
 
 
+post_save.connect(reset_active_plugins, sender=Plugin)
+post_delete.connect(reset_active_plugins, sender=Plugin)
+
+
 # Plugins within projectroles --------------------------------------------------
 
 
@@ -1,11 +1,27 @@
 """Remote project management utilities for the projectroles app"""
 
+import codecs
+import gc
+import hashlib
+import json
 import logging
+import threading
+from collections import defaultdict
+from datetime import timedelta
+from uuid import uuid4
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from django.conf import settings
 from django.contrib import auth
 from django.contrib.auth.models import Group
-from django.utils import timezone
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.urls import reverse
+from django.utils import dateparse, timezone
 
 from projectroles.models import (
     Project,
@@ -13,6 +29,12 @@ from projectroles.models import (
     RoleAssignment,
     RemoteProject,
     SODAR_CONSTANTS,
+    REMOTE_TARGET_ACCESS_KEY,
+    REMOTE_TARGET_DATA_KEY,
+    REMOTE_TARGET_VERSION_KEY,
+    invalidate_remote_source_cache,
+    invalidate_user_autocomplete_cache,
+    invalidate_user_autocomplete_users_cache,
 )
 from projectroles.plugins import get_backend_api
 
@@ -40,6 +62,238 @@ REMOTE_LEVEL_VIEW_AVAIL = SODAR_CONSTANTS['REMOTE_LEVEL_VIEW_AVAIL']
 REMOTE_LEVEL_READ_INFO = SODAR_CONSTANTS['REMOTE_LEVEL_READ_INFO']
 REMOTE_LEVEL_READ_ROLES = SODAR_CONSTANTS['REMOTE_LEVEL_READ_ROLES']
 
+# Margin for changes committed while the previous sync data was being built
+SYNC_TOKEN_OVERLAP = timedelta(minutes=1)
+
+# Default HTTP client settings for remote site requests
+REMOTE_CONNECT_TIMEOUT = 10
+REMOTE_READ_TIMEOUT = 300
+REMOTE_RETRIES = 3
+REMOTE_RETRY_BACKOFF = 0.5
+REMOTE_RETRY_STATUSES = (500, 502, 503, 504)
+
+# Default maximum amount of users and roles synchronized at once
+REMOTE_SYNC_CHUNK_SIZE = 1000
+
+# Phases of remote sync reported in progress
+SYNC_PHASES = ['users', 'categories', 'projects', 'roles']
+
+# Amount of bytes read at once from remote site responses
+REMOTE_READ_SIZE = 64 * 1024
+
+# Default timeout for cached target site sync data in seconds
+REMOTE_TARGET_CACHE_TIMEOUT = 5 * 60
+
+# Shared HTTP session for remote site requests
+_remote_session = None
+_remote_session_lock = threading.Lock()
+
+
+def get_remote_session():
+    """
+    Return the process-level HTTP session for remote site requests. The session
+    keeps connections to remote sites alive between requests and retries
+    failed requests with a backoff as set in PROJECTROLES_REMOTE_RETRIES and
+    PROJECTROLES_REMOTE_RETRY_BACKOFF.
+
+    :return: requests.Session object
+    """
+    global _remote_session
+
+    with _remote_session_lock:
+        if not _remote_session:
+            retry = Retry(
+                total=getattr(
+                    settings, 'PROJECTROLES_REMOTE_RETRIES', REMOTE_RETRIES
+                ),
+                backoff_factor=getattr(
+                    settings,
+                    'PROJECTROLES_REMOTE_RETRY_BACKOFF',
+                    REMOTE_RETRY_BACKOFF,
+                ),
+                status_forcelist=REMOTE_RETRY_STATUSES,
+            )
+            adapter = HTTPAdapter(max_retries=retry)
+            session = requests.Session()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers['Accept-Encoding'] = 'gzip, deflate'
+            _remote_session = session
+
+        return _remote_session
+
+
+def reset_remote_session():
+    """Close and clear the shared HTTP session for remote site requests"""
+    global _remote_session
+
+    with _remote_session_lock:
+        if _remote_session:
+            _remote_session.close()
+
+        _remote_session = None
+
+
+def get_sync_changes(update_data):
+    """
+    Return users, projects and roles changed in a remote sync as descriptions.
+
+    :param update_data: Dict returned by sync_source_data() or
+                        sync_source_stream()
+    :return: List of (section, changes) tuples, with changes as sorted lists
+             of (status, description) tuples
+    """
+    users = [
+        (u['status'], u['username']) for u in update_data['users'].values()
+    ]
+    projects = []
+    roles = []
+
+    for p_uuid, p in update_data['projects'].items():
+        title = '{} ({})'.format(p['title'], p_uuid)
+
+        if 'status' in p:
+            projects.append((p['status'], '{}: {}'.format(p['type'], title)))
+
+        for r in p.get('roles', {}).values():
+            roles.append(
+                (
+                    r['status'],
+                    '{}: {} as {}'.format(title, r['user'], r['role']),
+                )
+            )
+
+    return [
+        ('Users', sorted(users)),
+        ('Projects', sorted(projects)),
+        ('Roles', sorted(roles)),
+    ]
+
+
+class RemoteDataReader:
+    """
+    Incremental reader for remote sync data in JSON. Iterating the reader
+    yields tuples of (section, key, value) for each user and project in the
+    data, and (section, None, value) for other top level values. Only the entry
+    currently being read is kept in memory.
+    """
+
+    def __init__(self, chunks):
+        """
+        :param chunks: Iterable of JSON data (bytes or strings)
+        """
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def _read(self):
+        """Read the next chunk into the buffer, return False if at end"""
+        if self._eof:
+            return False
+
+        try:
+            chunk = next(self._chunks)
+
+        except StopIteration:
+            self._eof = True
+            chunk = self._decoder.decode(b'', final=True)
+
+        if isinstance(chunk, bytes):
+            chunk = self._decoder.decode(chunk)
+
+        self._buf = self._buf[self._pos :] + chunk
+        self._pos = 0
+        return not self._eof
+
+    def _peek(self):
+        """Return the next non-whitespace character"""
+        while True:
+            while (
+                self._pos < len(self._buf) and self._buf[self._pos] in ' \t\n\r'
+            ):
+                self._pos += 1
+
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+
+            if not self._read() and self._pos >= len(self._buf):
+                raise ValueError('Unexpected end of remote data')
+
+    def _expect(self, chars):
+        """Consume and return the next character if it is one of chars"""
+        c = self._peek()
+
+        if c not in chars:
+            raise ValueError(
+                'Invalid remote data: expected "{}", found "{}"'.format(
+                    chars, c
+                )
+            )
+
+        self._pos += 1
+        return c
+
+    def _value(self):
+        """Read the next JSON value"""
+        self._peek()
+
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buf, self._pos)
+
+                # Values at the end of the buffer may continue in next chunk
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return value
+
+            except ValueError:
+                if self._eof:
+                    raise
+
+            self._read()
+
+    def _key(self):
+        """Read the next object key and the following colon"""
+        key = self._value()
+
+        if not isinstance(key, str):
+            raise ValueError('Invalid remote data: key "{}"'.format(key))
+
+        self._expect(':')
+        return key
+
+    def __iter__(self):
+        self._expect('{')
+
+        if self._peek() == '}':
+            return
+
+        while True:
+            section = self._key()
+
+            if section in ['users', 'projects']:
+                self._expect('{')
+
+                if self._peek() == '}':
+                    self._pos += 1
+
+                else:
+                    while True:
+                        key = self._key()
+                        yield section, key, self._value()
+
+                        if self._expect(',}') == '}':
+                            break
+
+            else:
+                yield section, None, self._value()
+
+            if self._expect(',}') == '}':
+                return
+
 
 class RemoteProjectAPI:
     """Remote project data handling API"""
@@ -50,8 +304,11 @@ class RemoteProjectAPI:
     #: Remote source site currently being worked with
     source_site = None
 
+    #: ETag of the data last retrieved from the source site
+    source_etag = None
+
     #: Timeline API
-    timeline = get_backend_api('timeline_backend')
+    timeline = None
 
     #: User for storing timeline events
     tl_user = None
@@ -62,21 +319,138 @@ class RemoteProjectAPI:
     #: Updated parent projects in current sync operation
     updated_parents = []
 
+    #: Lookup dicts of objects referenced in the current sync operation
+    users = {}
+    user_groups = {}
+    roles = {}
+    projects = {}
+    remote_projects = {}
+    role_assignments = {}
+
+    #: Category data and updated data in the current sync operation
+    categories = {}
+    update_data = {}
+
+    #: Data and lookup dicts in the current target data operation
+    target_data = {}
+    target_categories = {}
+    target_owners = {}
+    target_roles = {}
+    target_user_groups = {}
+
+    #: Errors encountered in the current sync operation
+    sync_errors = False
+
+    #: Only collect changes without saving them in the current sync operation
+    dry_run = False
+
+    #: Users and projects only created in memory in the current dry run
+    dry_run_users = {}
+    dry_run_projects = {}
+
+    #: Pending database changes in the current sync operation
+    role_creates = []
+    role_updates = {}
+    role_deletes = {}
+    remote_creates = []
+    remote_updates = []
+
+    def __init__(self):
+        # Retrieved here, as the timeline plugin imports this module via views
+        self.timeline = get_backend_api('timeline_backend')
+
     # Internal functions -------------------------------------------------------
 
-    @staticmethod
-    def _update_obj(obj, data, fields):
-        """Update object"""
+    def _update_obj(self, obj, data, fields):
+        """Update object, only saving it if not in a dry run"""
         for f in [f for f in fields if hasattr(obj, f)]:
             setattr(obj, f, data[f])
-        obj.save()
+
+        if not self.dry_run:
+            obj.save()
+
         return obj
 
-    def _sync_user(self, uuid, u_data):
-        """Synchronize LDAP user based on source site data"""
-        # Update existing user
-        try:
-            user = User.objects.get(username=u_data['username'])
+    def _prefetch_data(self):
+        """Retrieve objects referenced in remote data into lookup dicts"""
+        usernames = set(
+            u['username'] for u in self.remote_data['users'].values()
+        )
+
+        for p_data in self.remote_data['projects'].values():
+            usernames.update(
+                r['user'] for r in p_data.get('roles', {}).values()
+            )
+
+        self.users = {
+            u.username: u for u in User.objects.filter(username__in=usernames)
+        }
+        self.user_groups = defaultdict(dict)
+
+        for user_pk, group_pk, group_name in User.groups.through.objects.filter(
+            user__username__in=usernames
+        ).values_list('user_id', 'group_id', 'group__name'):
+            self.user_groups[user_pk][group_name] = group_pk
+        self.roles = {r.name: r for r in Role.objects.all()}
+        self.projects = {
+            str(p.sodar_uuid): p
+            for p in Project.objects.filter(
+                sodar_uuid__in=self.remote_data['projects'].keys()
+            )
+        }
+        self.remote_projects = {
+            str(rp.project_uuid): rp
+            for rp in RemoteProject.objects.filter(
+                site=self.source_site,
+                project_uuid__in=self.remote_data['projects'].keys(),
+            )
+        }
+        self.role_assignments = defaultdict(list)
+        project_uuids = {p.pk: p_uuid for p_uuid, p in self.projects.items()}
+
+        for role_as in RoleAssignment.objects.filter(
+            project__in=self.projects.values()
+        ).select_related('user', 'role'):
+            p_uuid = project_uuids[role_as.project_id]
+            role_as.project = self.projects[p_uuid]
+            self.role_assignments[p_uuid].append(role_as)
+
+        # Objects created in a dry run are not found in the database
+        self.users.update(self.dry_run_users)
+        self.projects.update(self.dry_run_projects)
+
+        # Pending database changes
+        self.role_creates = []
+        self.role_updates = {}
+        self.role_deletes = {}
+        self.remote_creates = []
+        self.remote_updates = []
+
+    def _sync_users(self, users_data):
+        """Synchronize LDAP users based on source site data"""
+        new_users = []
+        group_adds = []
+        group_removes = defaultdict(list)
+
+        for uuid, u_data in users_data.items():
+            user = self.users.get(u_data['username'])
+
+            # Create new user
+            if not user:
+                create_values = {
+                    k: v for k, v in u_data.items() if k != 'groups'
+                }
+                user = User(**create_values)
+                new_users.append(user)
+                u_data['status'] = 'created'
+                logger.info('Created user: {}'.format(user.username))
+
+                for g in u_data['groups']:
+                    group_adds.append((user, g))
+
+                continue
+
+            # Update existing user
             updated_fields = []
 
             for k, v in u_data.items():
@@ -98,46 +472,71 @@ class RemoteProjectAPI:
                 )
 
             # Check and update groups
-            if sorted([g.name for g in user.groups.all()]) != sorted(
-                u_data['groups']
-            ):
-                for g in user.groups.all():
-                    if g.name not in u_data['groups']:
-                        g.user_set.remove(user)
-                        logger.debug(
-                            'Removed user {} ({}) from group "{}"'.format(
-                                user.username, user.sodar_uuid, g.name
-                            )
+            existing_groups = self.user_groups[user.pk]
+
+            for g, group_pk in existing_groups.items():
+                if g not in u_data['groups']:
+                    group_removes[user.pk].append(group_pk)
+                    logger.debug(
+                        'Removed user {} ({}) from group "{}"'.format(
+                            user.username, user.sodar_uuid, g
                         )
+                    )
 
-                existing_groups = [g.name for g in user.groups.all()]
+            for g in u_data['groups']:
+                if g not in existing_groups:
+                    group_adds.append((user, g))
 
-                for g in u_data['groups']:
-                    if g not in existing_groups:
-                        group, created = Group.objects.get_or_create(name=g)
-                        group.user_set.add(user)
-                        logger.debug(
-                            'Added user {} ({}) to group "{}"'.format(
-                                user.username, user.sodar_uuid, g
-                            )
-                        )
+        if self.dry_run:
+            self.dry_run_users.update({u.username: u for u in new_users})
+            self.users.update(self.dry_run_users)
+            return
 
-        # Create new user
-        except User.DoesNotExist:
-            create_values = {k: v for k, v in u_data.items() if k != 'groups'}
-            user = User.objects.create(**create_values)
-            u_data['status'] = 'created'
-            logger.info('Created user: {}'.format(user.username))
+        self._save_users(new_users, group_adds, group_removes)
 
-            for g in u_data['groups']:
-                group, created = Group.objects.get_or_create(name=g)
-                group.user_set.add(user)
+    def _save_users(self, new_users, group_adds, group_removes):
+        """Save new users and user group changes in bulk"""
+        if new_users:
+            User.objects.bulk_create(new_users)
+            self.users.update({u.username: u for u in new_users})
+
+        if group_removes:
+            remove_query = Q()
+
+            for user_pk, group_pks in group_removes.items():
+                remove_query |= Q(user_id=user_pk, group_id__in=group_pks)
+
+            User.groups.through.objects.filter(remove_query).delete()
+
+        if group_adds:
+            group_names = set(g for _, g in group_adds)
+            groups = {
+                g.name: g for g in Group.objects.filter(name__in=group_names)
+            }
+            new_groups = [Group(name=n) for n in group_names if n not in groups]
+
+            if new_groups:
+                Group.objects.bulk_create(new_groups)
+                groups.update({g.name: g for g in new_groups})
+
+            User.groups.through.objects.bulk_create(
+                [
+                    User.groups.through(user_id=user.pk, group_id=groups[g].pk)
+                    for user, g in group_adds
+                ]
+            )
+
+            for user, g in group_adds:
                 logger.debug(
                     'Added user {} ({}) to group "{}"'.format(
                         user.username, user.sodar_uuid, g
                     )
                 )
 
+        # Bulk queries do not send signals
+        if new_users or group_removes or group_adds:
+            invalidate_user_autocomplete_users_cache(User)
+
     def _handle_user_error(self, error_msg, project, role_uuid):
         logger.error(error_msg)
         self.remote_data['projects'][str(project.sodar_uuid)]['roles'][
@@ -161,6 +560,28 @@ class RemoteProjectAPI:
         self.remote_data['projects'][uuid]['status'] = 'error'
         self.remote_data['projects'][uuid]['status_msg'] = error_msg
 
+    @staticmethod
+    def _has_errors(projects):
+        """Return True if errors were encountered in syncing projects"""
+        for p_data in projects.values():
+            if p_data.get('status') == 'error':
+                return True
+
+            for r_data in p_data.get('roles', {}).values():
+                if r_data.get('status') == 'error':
+                    return True
+
+        return False
+
+    def _set_sync_token(self, sync_token):
+        """Store the sync token of the source site if sync was successful"""
+        if not sync_token or self.sync_errors:
+            return
+
+        self.source_site.sync_token = sync_token
+        self.source_site.sync_etag = self.source_etag
+        self.source_site.save()
+
     def _update_project(self, project, p_data, parent):
         """Update an existing project during sync"""
         updated_fields = []
@@ -178,15 +599,29 @@ class RemoteProjectAPI:
         if project.readme.raw != p_data['readme']:
             updated_fields.append('readme')
 
-        if updated_fields or project.parent != parent:
+        # Parents created in a dry run have no pk
+        parent_changed = (
+            project.parent_id != parent.pk or not parent.pk
+            if parent
+            else project.parent_id is not None
+        )
+
+        if updated_fields or parent_changed:
+            # Always set the parent from the synced projects, as the parent
+            # may have been updated earlier in this sync
+            project.parent = parent
             project = self._update_obj(project, p_data, updated_fields)
 
-            # Manually update parent
-            if parent != project.parent:
-                project.parent = parent
-                project.save()
+            if parent_changed:
                 updated_fields.append('parent')
 
+            if (
+                project.type == PROJECT_TYPE_CATEGORY
+                and ('title' in updated_fields or parent_changed)
+                and not self.dry_run
+            ):
+                self._refresh_children(project)
+
             self.remote_data['projects'][uuid]['status'] = 'updated'
 
             if self.tl_user:  # Taskflow
@@ -216,16 +651,38 @@ class RemoteProjectAPI:
         else:
             logger.debug('Nothing to update in project details')
 
+    def _refresh_children(self, category):
+        """Refresh parent paths and full titles of synced projects under an
+        updated category from the database"""
+        children = {
+            p.pk: p
+            for p in self.projects.values()
+            if p.pk and category.pk in p.parent_path
+        }
+
+        if not children:
+            return
+
+        for pk, parent_path, full_title, search_text in Project.objects.filter(
+            pk__in=children.keys()
+        ).values_list('pk', 'parent_path', 'full_title', 'search_text'):
+            children[pk].parent_path = parent_path
+            children[pk].full_title = full_title
+            children[pk].search_text = search_text
+
     def _create_project(self, uuid, p_data, parent):
-        """Create a new project from source site data"""
+        """Create a new project from source site data, return None on error"""
 
-        # Check existing title under the same parent
-        try:
-            old_project = Project.objects.get(
+        # Check existing title under the same parent, unless the parent was
+        # created in a dry run
+        old_project = None
+
+        if not parent or parent.pk:
+            old_project = Project.objects.filter(
                 parent=parent, title=p_data['title']
-            )
+            ).first()
 
-            # Handle error
+        if old_project:
             error_msg = (
                 '{} with the title "{}" exists under the same '
                 'parent, unable to create'.format(
@@ -235,15 +692,18 @@ class RemoteProjectAPI:
             self._handle_project_error(error_msg, uuid, p_data, 'create')
             return
 
-        except Project.DoesNotExist:
-            pass
-
         create_fields = ['title', 'description', 'readme']
         create_values = {k: v for k, v in p_data.items() if k in create_fields}
         create_values['type'] = p_data['type']
         create_values['parent'] = parent
         create_values['sodar_uuid'] = uuid
-        project = Project.objects.create(**create_values)
+        project = Project(**create_values)
+
+        if self.dry_run:
+            self.dry_run_projects[uuid] = project
+
+        else:
+            project.save()
 
         self.remote_data['projects'][uuid]['status'] = 'created'
 
@@ -260,11 +720,12 @@ class RemoteProjectAPI:
             tl_event.add_object(self.source_site, 'site', self.source_site.name)
 
         logger.info('Created {}'.format(p_data['type'].lower()))
+        return project
 
     def _update_roles(self, project, p_data):
         """Create or update project roles"""
-        # TODO: Refactor this
         uuid = str(project.sodar_uuid)
+        assignments = self.role_assignments[uuid]
 
         allow_local = (
             settings.PROJECTROLES_ALLOW_LOCAL_USERS
@@ -274,10 +735,9 @@ class RemoteProjectAPI:
 
         for r_uuid, r in {k: v for k, v in p_data['roles'].items()}.items():
             # Ensure the Role exists
-            try:
-                role = Role.objects.get(name=r['role'])
+            role = self.roles.get(r['role'])
 
-            except Role.DoesNotExist:
+            if not role:
                 error_msg = 'Role object "{}" not found (assignment {})'.format(
                     r['role'], r_uuid
                 )
@@ -302,7 +762,7 @@ class RemoteProjectAPI:
                 '@' not in r['user']
                 and allow_local
                 and r['role'] != PROJECT_ROLE_OWNER
-                and not User.objects.filter(username=r['user']).first()
+                and r['user'] not in self.users
             ):
                 error_msg = (
                     'Local user "{}" not found, role of "{}" will '
@@ -315,10 +775,7 @@ class RemoteProjectAPI:
             # users are not allowed
             if (
                 r['role'] == PROJECT_ROLE_OWNER
-                and (
-                    not allow_local
-                    or not User.objects.filter(username=r['user']).first()
-                )
+                and (not allow_local or r['user'] not in self.users)
                 and '@' not in r['user']
             ):
                 role_user = self.default_owner
@@ -339,41 +796,58 @@ class RemoteProjectAPI:
                 logger.info(status_msg)
 
             else:
-                role_user = User.objects.get(username=r['user'])
+                role_user = self.users[r['user']]
 
             # Update RoleAssignment if it exists and is changed
             as_updated = False
-            role_query = {'project__sodar_uuid': project.sodar_uuid}
 
             if r['role'] == PROJECT_ROLE_OWNER:
-                role_query['role__name'] = PROJECT_ROLE_OWNER
+                old_as = next(
+                    (
+                        a
+                        for a in assignments
+                        if a.role.name == PROJECT_ROLE_OWNER
+                    ),
+                    None,
+                )
 
             else:
-                role_query['user'] = role_user
-
-            old_as = RoleAssignment.objects.filter(**role_query).first()
+                old_as = next(
+                    (
+                        a
+                        for a in assignments
+                        if a.user.username == role_user.username
+                    ),
+                    None,
+                )
 
             # Owner updating
             if old_as and r['role'] == PROJECT_ROLE_OWNER:
                 # Update user or local admin user
                 if ('@' in r['user'] and old_as.user != role_user) or (
                     role_user == self.default_owner
-                    and project.get_owner().user != self.default_owner
+                    and old_as.user != self.default_owner
                 ):
                     as_updated = True
 
                     # Delete existing role of the new owner if it exists
-                    try:
-                        RoleAssignment.objects.get(
-                            project__sodar_uuid=project.sodar_uuid,
-                            user=role_user,
-                        ).delete()
+                    user_as = next(
+                        (
+                            a
+                            for a in assignments
+                            if a.user.username == role_user.username
+                        ),
+                        None,
+                    )
+
+                    if user_as:
+                        self._delete_assignment(user_as)
                         logger.debug(
                             'Deleted existing role from '
                             'user "{}"'.format(role_user.username)
                         )
 
-                    except RoleAssignment.DoesNotExist:
+                    else:
                         logger.debug(
                             'No existing role found for user "{}"'.format(
                                 role_user.username
@@ -391,7 +865,10 @@ class RemoteProjectAPI:
             if as_updated:
                 old_as.role = role
                 old_as.user = role_user
-                old_as.save()
+
+                if old_as.pk:
+                    self.role_updates[old_as.pk] = old_as
+
                 self.remote_data['projects'][str(project.sodar_uuid)]['roles'][
                     r_uuid
                 ]['status'] = 'updated'
@@ -422,13 +899,14 @@ class RemoteProjectAPI:
 
             # Create a new RoleAssignment
             elif not old_as:
-                role_values = {
-                    'sodar_uuid': r_uuid,
-                    'project': project,
-                    'role': role,
-                    'user': role_user,
-                }
-                RoleAssignment.objects.create(**role_values)
+                new_as = RoleAssignment(
+                    sodar_uuid=r_uuid,
+                    project=project,
+                    role=role,
+                    user=role_user,
+                )
+                assignments.append(new_as)
+                self.role_creates.append(new_as)
 
                 self.remote_data['projects'][str(project.sodar_uuid)]['roles'][
                     r_uuid
@@ -457,18 +935,29 @@ class RemoteProjectAPI:
                     )
                 )
 
+    def _delete_assignment(self, role_as):
+        """Remove a role assignment from the pending sync state"""
+        self.role_assignments[str(role_as.project.sodar_uuid)].remove(role_as)
+
+        if role_as.pk:
+            self.role_updates.pop(role_as.pk, None)
+            self.role_deletes[role_as.pk] = role_as
+
+        else:
+            self.role_creates.remove(role_as)
+
     def _remove_deleted_roles(self, project, p_data):
         """Remove roles for project deleted in source site"""
-        timeline = get_backend_api('timeline_backend')
         uuid = str(project.sodar_uuid)
         current_users = [v['user'] for k, v in p_data['roles'].items()]
 
-        deleted_roles = (
-            RoleAssignment.objects.filter(project=project)
-            .exclude(role__name=PROJECT_ROLE_OWNER)
-            .exclude(user__username__in=current_users)
-        )
-        deleted_count = deleted_roles.count()
+        deleted_roles = [
+            a
+            for a in self.role_assignments[uuid]
+            if a.role.name != PROJECT_ROLE_OWNER
+            and a.user.username not in current_users
+        ]
+        deleted_count = len(deleted_roles)
 
         if deleted_count > 0:
             deleted_users = sorted([r.user.username for r in deleted_roles])
@@ -477,7 +966,7 @@ class RemoteProjectAPI:
                 del_user = del_as.user
                 del_role = del_as.role
                 del_uuid = str(del_as.sodar_uuid)
-                del_as.delete()
+                self._delete_assignment(del_as)
 
                 self.remote_data['projects'][uuid]['roles'][del_uuid] = {
                     'user': del_user.username,
@@ -490,7 +979,7 @@ class RemoteProjectAPI:
                         'remove role "{}" from {{{}}} by site '
                         '{{{}}}'.format(del_role.name, 'user', 'site')
                     )
-                    tl_event = timeline.add_event(
+                    tl_event = self.timeline.add_event(
                         project=project,
                         app_name=APP_NAME,
                         user=self.tl_user,
@@ -523,9 +1012,11 @@ class RemoteProjectAPI:
             self._sync_project(p_data['parent_uuid'], c_data)
             self.updated_parents.append(p_data['parent_uuid'])
 
-        project = Project.objects.filter(
-            type=p_data['type'], sodar_uuid=uuid
-        ).first()
+        project = self.projects.get(uuid)
+
+        if project and project.type != p_data['type']:
+            project = None
+
         parent = None
         action = 'create' if not project else 'update'
 
@@ -537,10 +1028,9 @@ class RemoteProjectAPI:
 
         # Get parent and ensure it exists
         if p_data['parent_uuid']:
-            try:
-                parent = Project.objects.get(sodar_uuid=p_data['parent_uuid'])
+            parent = self.projects.get(p_data['parent_uuid'])
 
-            except Project.DoesNotExist:
+            if not parent:
                 # Handle error
                 error_msg = 'Parent {} not found'.format(p_data['parent_uuid'])
                 self._handle_project_error(error_msg, uuid, p_data, action)
@@ -552,29 +1042,31 @@ class RemoteProjectAPI:
 
         # Create new project
         else:
-            self._create_project(uuid, p_data, parent)
-            project = Project.objects.filter(
-                type=p_data['type'], sodar_uuid=uuid
-            ).first()
+            project = self._create_project(uuid, p_data, parent)
+
+            if not project:
+                return
+
+            self.projects[uuid] = project
 
         # Create/update a RemoteProject object
-        try:
-            remote_project = RemoteProject.objects.get(
-                site=self.source_site, project=project
-            )
+        remote_project = self.remote_projects.get(uuid)
+
+        if remote_project:
             remote_project.level = p_data['level']
             remote_project.project = project
-            remote_project.date_access = timezone.now()
+            self.remote_updates.append(remote_project)
             remote_action = 'updated'
 
-        except RemoteProject.DoesNotExist:
-            remote_project = RemoteProject.objects.create(
+        else:
+            remote_project = RemoteProject(
                 site=self.source_site,
                 project_uuid=project.sodar_uuid,
                 project=project,
                 level=p_data['level'],
-                date_access=timezone.now(),
             )
+            self.remote_projects[uuid] = remote_project
+            self.remote_creates.append(remote_project)
             remote_action = 'created'
 
         logger.debug(
@@ -594,114 +1086,183 @@ class RemoteProjectAPI:
         # Remove deleted user roles
         self._remove_deleted_roles(project, p_data)
 
-    # API functions ------------------------------------------------------------
+    def _apply_changes(self):
+        """Write pending remote project and role changes into the database"""
+        access_date = timezone.now()
 
-    def get_target_data(self, target_site):
-        """
-        Get user and project data to be synchronized into a target site.
+        # Remote projects
+        if self.remote_creates:
+            for remote_project in self.remote_creates:
+                remote_project.date_access = access_date
 
-        :param target_site: RemoteSite object for the target site
-        :return: Dict
-        """
-        sync_data = {'users': {}, 'projects': {}}
-
-        def _add_user(user):
-            if user.username not in [
-                u['username'] for u in sync_data['users'].values()
-            ]:
-                sync_data['users'][str(user.sodar_uuid)] = {
-                    'username': user.username,
-                    'name': user.name,
-                    'first_name': user.first_name,
-                    'last_name': user.last_name,
-                    'email': user.email,
-                    'groups': [g.name for g in user.groups.all()],
-                }
+            RemoteProject.objects.bulk_create(self.remote_creates)
+            invalidate_remote_source_cache(RemoteProject)
 
-        def _add_parent_categories(category, project_level):
-            if category.parent:
-                _add_parent_categories(category.parent, project_level)
-
-            if str(category.sodar_uuid) not in sync_data['projects'].keys():
-                cat_data = {
-                    'title': category.title,
-                    'type': PROJECT_TYPE_CATEGORY,
-                    'parent_uuid': str(category.parent.sodar_uuid)
-                    if category.parent
-                    else None,
-                    'description': category.description,
-                    'readme': category.readme.raw,
-                }
+        remote_updates = defaultdict(list)
 
-                if project_level == REMOTE_LEVEL_READ_ROLES:
-                    cat_data['level'] = REMOTE_LEVEL_READ_ROLES
-                    role_as = category.get_owner()
-                    cat_data['roles'] = {}
-                    cat_data['roles'][str(role_as.sodar_uuid)] = {
-                        'user': role_as.user.username,
-                        'role': role_as.role.name,
-                    }
-                    _add_user(role_as.user)
+        for remote_project in self.remote_updates:
+            remote_updates[
+                (remote_project.level, remote_project.project_id)
+            ].append(remote_project.pk)
 
-                else:
-                    cat_data['level'] = REMOTE_LEVEL_READ_INFO
+        for (level, project_id), pks in remote_updates.items():
+            RemoteProject.objects.filter(pk__in=pks).update(
+                level=level, project_id=project_id, date_access=access_date
+            )
 
-                sync_data['projects'][str(category.sodar_uuid)] = cat_data
+        # Role assignments
+        changed_roles = {}
 
-        for rp in target_site.projects.all():
-            project = rp.get_project()
-            project_data = {
-                'level': rp.level,
-                'title': project.title,
-                'type': PROJECT_TYPE_PROJECT,
-            }
+        if self.role_deletes:
+            # NOTE: Deleting sends delete signals for each object
+            RoleAssignment.objects.filter(
+                pk__in=self.role_deletes.keys()
+            ).delete()
 
-            # View available projects
-            if rp.level == REMOTE_LEVEL_VIEW_AVAIL:
-                project_data['available'] = True if project else False
+        role_updates = defaultdict(list)
 
-            # Add info
-            elif project and rp.level in [
-                REMOTE_LEVEL_READ_INFO,
-                REMOTE_LEVEL_READ_ROLES,
-            ]:
-                project_data['description'] = project.description
-                project_data['readme'] = project.readme.raw
+        for role_as in self.role_updates.values():
+            role_updates[(role_as.role.pk, role_as.user.pk)].append(role_as.pk)
+            changed_roles[role_as.project_id] = role_as
 
-                # Add categories
-                if project.parent:
-                    _add_parent_categories(project.parent, rp.level)
-                    project_data['parent_uuid'] = str(project.parent.sodar_uuid)
+        for (role_pk, user_pk), pks in role_updates.items():
+            RoleAssignment.objects.filter(pk__in=pks).update(
+                role_id=role_pk, user_id=user_pk
+            )
 
-            # If level is READ_ROLES, add categories and roles
-            if rp.level in REMOTE_LEVEL_READ_ROLES:
-                project_data['roles'] = {}
+        if self.role_creates:
+            RoleAssignment.objects.bulk_create(self.role_creates)
+            changed_roles.update(
+                {role_as.project_id: role_as for role_as in self.role_creates}
+            )
 
-                for role_as in project.roles.all():
-                    project_data['roles'][str(role_as.sodar_uuid)] = {
-                        'user': role_as.user.username,
-                        'role': role_as.role.name,
-                    }
-                    _add_user(role_as.user)
+        # Handle signals skipped by bulk operations
+        if changed_roles:
+            Project.objects.filter(pk__in=changed_roles.keys()).update(
+                date_modified=access_date
+            )
 
-            sync_data['projects'][str(rp.project_uuid)] = project_data
+            for role_as in changed_roles.values():
+                invalidate_user_autocomplete_cache(RoleAssignment, role_as)
 
-        return sync_data
+        logger.debug(
+            'Applied role changes: {} created, {} updated, {} deleted'.format(
+                len(self.role_creates),
+                len(self.role_updates),
+                len(self.role_deletes),
+            )
+        )
+
+    def _add_update_data(self, users, projects):
+        """Add users and projects updated in the sync to update data"""
+        if self._has_errors(projects):
+            self.sync_errors = True
+
+        if self.update_data is None:
+            return
 
-    def sync_source_data(self, site, remote_data, request=None):
+        for k, v in users.items():
+            if 'status' in v:
+                self.update_data['users'][k] = v
+
+        for k, v in projects.items():
+            roles = {
+                r_uuid: r
+                for r_uuid, r in v.get('roles', {}).items()
+                if 'status' in r
+            }
+
+            if 'status' in v or roles:
+                self.update_data['projects'][k] = dict(v, roles=roles)
+
+    def _sync_chunk(self, users, projects):
+        """Synchronize a chunk of users and READ_ROLES projects"""
+        self.remote_data = {
+            'users': users,
+            'projects': {**self.categories, **projects},
+        }
+        self._prefetch_data()
+
+        ########
+        # Users
+        ########
+        if users:
+            logger.info('Synchronizing LDAP/AD users..')
+
+            # NOTE: only sync LDAP/AD users
+            self._sync_users(
+                {k: v for k, v in users.items() if '@' in v['username']}
+            )
+
+            logger.info('User sync OK')
+
+        ##########################
+        # Categories and Projects
+        ##########################
+        if projects:
+            logger.info('Synchronizing projects..')
+
+            for sodar_uuid, p_data in projects.items():
+                self._sync_project(sodar_uuid, p_data)
+
+        # Write role and remote project changes
+        if not self.dry_run:
+            self._apply_changes()
+
+        self._add_update_data(users, projects)
+
+        # Free model objects of the chunk held in reference cycles
+        gc.collect()
+
+    def _report_progress(self, progress, totals, users, projects):
+        """Report the total number of synchronized items for phases which
+        advanced in the latest chunk"""
+        counts = {
+            'users': totals['users'] + len(users),
+            'categories': len(self.categories),
+            'projects': totals['projects'] + len(projects),
+            'roles': totals['roles']
+            + sum(len(p.get('roles', {})) for p in projects.values()),
+        }
+
+        for phase in SYNC_PHASES:
+            if counts[phase] != totals[phase]:
+                totals[phase] = counts[phase]
+                progress(phase, counts[phase])
+
+    def _sync_entries(
+        self,
+        site,
+        entries,
+        request=None,
+        updates=True,
+        progress=None,
+        dry_run=False,
+    ):
         """
-        Synchronize remote user and project data into the local Django database
-        and return information of additions.
+        Synchronize remote data entries in chunks of users and projects.
 
         :param site: RemoteSite object for the source site
-        :param remote_data: Data returned by get_target_data() in the source
+        :param entries: Iterable of (section, key, value) tuples, with
+                        categories preceding their children
         :param request: Request object (optional)
-        :return: Dict with updated remote_data
+        :param updates: Collect updated users and projects (boolean)
+        :param progress: Callable receiving the phase and total number of
+                         synchronized items after each chunk (optional)
+        :param dry_run: Collect changes without saving them (boolean)
+        :return: Dict with users and projects updated in the sync or None
         :raise: ValueError if user from PROJECTROLES_DEFAULT_ADMIN is not found
         """
         self.source_site = site
-        self.remote_data = remote_data
         self.updated_parents = []
+        self.categories = {}
+        self.update_data = (
+            {'users': {}, 'projects': {}} if updates or dry_run else None
+        )
+        self.sync_errors = False
+        self.dry_run = dry_run
+        self.dry_run_users = {}
+        self.dry_run_projects = {}
 
         # Get default owner if remote projects have a local owner
         try:
@@ -717,51 +1278,457 @@ class RemoteProjectAPI:
             logger.error(error_msg)
             raise ValueError(error_msg)
 
-        # Set up timeline user
-        if self.timeline:
+        # Set up timeline user, no events are added in a dry run
+        self.tl_user = None
+
+        if self.timeline and not dry_run:
             self.tl_user = request.user if request else self.default_owner
 
-        logger.info('Synchronizing data from "{}"..'.format(site.name))
+        logger.info(
+            '{} data from "{}"..'.format(
+                'Checking changes in' if dry_run else 'Synchronizing', site.name
+            )
+        )
 
-        # Return unchanged data if no projects with READ_ROLES are included
-        if not {
-            k: v
-            for k, v in self.remote_data['projects'].items()
-            if v['type'] == PROJECT_TYPE_PROJECT
-            and v['level'] == REMOTE_LEVEL_READ_ROLES
-        }.values():
-            logger.info('No READ_ROLES access set, nothing to synchronize')
-            return self.remote_data
+        chunk_size = getattr(
+            settings,
+            'PROJECTROLES_REMOTE_SYNC_CHUNK_SIZE',
+            REMOTE_SYNC_CHUNK_SIZE,
+        )
+        sync_token = None
+        read_roles = False
+        users = {}
+        projects = {}
+        item_count = 0
+        totals = {phase: 0 for phase in SYNC_PHASES}
+
+        # Retrieve existing objects and apply changes in a single transaction
+        with transaction.atomic():
+            for section, key, value in entries:
+                if section == 'sync_token':
+                    sync_token = value
+                    continue
+
+                elif section == 'users':
+                    users[key] = value
+                    item_count += 1
+
+                # Categories are synchronized along with their children
+                elif (
+                    section == 'projects'
+                    and value['type'] == PROJECT_TYPE_CATEGORY
+                ):
+                    self.categories[key] = value
+                    continue
 
-        ########
-        # Users
-        ########
-        logger.info('Synchronizing LDAP/AD users..')
+                elif (
+                    section == 'projects'
+                    and value['level'] == REMOTE_LEVEL_READ_ROLES
+                ):
+                    read_roles = True
+                    projects[key] = value
+                    item_count += 1 + len(value.get('roles', {}))
 
-        # NOTE: only sync LDAP/AD users
-        for sodar_uuid, u_data in {
-            k: v
-            for k, v in self.remote_data['users'].items()
-            if '@' in v['username']
-        }.items():
-            self._sync_user(sodar_uuid, u_data)
+                else:
+                    continue
 
-        logger.info('User sync OK')
+                # NOTE: Users are only included in data along with READ_ROLES
+                #       projects, so they can be synced before projects
+                if item_count >= chunk_size:
+                    self._sync_chunk(users, projects)
 
-        ##########################
-        # Categories and Projects
-        ##########################
+                    if progress:
+                        self._report_progress(progress, totals, users, projects)
+
+                    users = {}
+                    projects = {}
+                    item_count = 0
+
+            # Skip the rest if no projects with READ_ROLES are included
+            if not read_roles:
+                logger.info('No READ_ROLES access set, nothing to synchronize')
+
+            else:
+                self._sync_chunk(users, projects)
+                self._add_update_data({}, self.categories)
 
-        # Update projects
-        logger.info('Synchronizing projects..')
+                if progress:
+                    self._report_progress(progress, totals, users, projects)
 
-        for sodar_uuid, p_data in {
-            k: v
-            for k, v in self.remote_data['projects'].items()
-            if v['type'] == PROJECT_TYPE_PROJECT
-            and v['level'] == REMOTE_LEVEL_READ_ROLES
-        }.items():
-            self._sync_project(sodar_uuid, p_data)
+        if dry_run:
+            logger.info('Dry run OK, no changes were saved')
 
-        logger.info('Synchronization OK')
-        return self.remote_data
+        else:
+            self._set_sync_token(sync_token)
+            logger.info('Synchronization OK')
+
+        return self.update_data
+
+    def _add_target_user(self, user):
+        """Add user to target site data if not yet added"""
+        user_uuid = str(user.sodar_uuid)
+
+        if user_uuid not in self.target_data['users']:
+            self.target_data['users'][user_uuid] = {
+                'username': user.username,
+                'name': user.name,
+                'first_name': user.first_name,
+                'last_name': user.last_name,
+                'email': user.email,
+                'groups': self.target_user_groups[user.pk],
+            }
+
+    def _get_target_parent_uuid(self, project):
+        """Return UUID of project parent in target site data"""
+        if project.parent_id:
+            return str(self.target_categories[project.parent_id].sodar_uuid)
+
+    def _add_target_categories(self, project, project_level):
+        """Add parent categories of a project to target site data"""
+        for category in [
+            self.target_categories[pk] for pk in project.parent_path
+        ]:
+            if str(category.sodar_uuid) in self.target_data['projects']:
+                continue
+
+            cat_data = {
+                'title': category.title,
+                'type': PROJECT_TYPE_CATEGORY,
+                'parent_uuid': self._get_target_parent_uuid(category),
+                'description': category.description,
+                'readme': category.readme.raw,
+            }
+
+            if project_level == REMOTE_LEVEL_READ_ROLES:
+                cat_data['level'] = REMOTE_LEVEL_READ_ROLES
+                role_as = self.target_owners[category.pk]
+                cat_data['roles'] = {}
+                cat_data['roles'][str(role_as.sodar_uuid)] = {
+                    'user': role_as.user.username,
+                    'role': role_as.role.name,
+                }
+                self._add_target_user(role_as.user)
+
+            else:
+                cat_data['level'] = REMOTE_LEVEL_READ_INFO
+
+            self.target_data['projects'][str(category.sodar_uuid)] = cat_data
+
+    def _add_target_project(self, rp, project):
+        """Add project to target site data according to its access level"""
+        project_data = {
+            'level': rp.level,
+            'title': project.title,
+            'type': PROJECT_TYPE_PROJECT,
+        }
+
+        # View available projects
+        if rp.level == REMOTE_LEVEL_VIEW_AVAIL:
+            project_data['available'] = True
+
+        # Add info
+        elif rp.level in [REMOTE_LEVEL_READ_INFO, REMOTE_LEVEL_READ_ROLES]:
+            project_data['description'] = project.description
+            project_data['readme'] = project.readme.raw
+
+            # Add categories
+            if project.parent_id:
+                self._add_target_categories(project, rp.level)
+                project_data['parent_uuid'] = self._get_target_parent_uuid(
+                    project
+                )
+
+        # If level is READ_ROLES, add categories and roles
+        if rp.level == REMOTE_LEVEL_READ_ROLES:
+            project_data['roles'] = {}
+
+            for role_as in self.target_roles[project.pk]:
+                project_data['roles'][str(role_as.sodar_uuid)] = {
+                    'user': role_as.user.username,
+                    'role': role_as.role.name,
+                }
+                self._add_target_user(role_as.user)
+
+        self.target_data['projects'][str(rp.project_uuid)] = project_data
+
+    # API functions ------------------------------------------------------------
+
+    @staticmethod
+    def _get_source_response(site, since=None, etag=None, stream=False):
+        """Send a request for user and project data to a source site"""
+        api_url = site.url + reverse(
+            'projectroles:api_remote_get', kwargs={'secret': site.secret}
+        )
+        timeout = (
+            getattr(
+                settings,
+                'PROJECTROLES_REMOTE_CONNECT_TIMEOUT',
+                REMOTE_CONNECT_TIMEOUT,
+            ),
+            getattr(
+                settings,
+                'PROJECTROLES_REMOTE_READ_TIMEOUT',
+                REMOTE_READ_TIMEOUT,
+            ),
+        )
+        response = get_remote_session().get(
+            api_url,
+            params={'since': since} if since else None,
+            headers={'If-None-Match': etag} if etag else None,
+            timeout=timeout,
+            stream=stream,
+        )
+        response.raise_for_status()
+        return response
+
+    def get_source_data(self, site, since=None, etag=None):
+        """
+        Retrieve user and project data from a source site.
+
+        :param site: RemoteSite object for the source site
+        :param since: Sync token for only retrieving changes (string, optional)
+        :param etag: ETag of the previously synchronized data (string, optional)
+        :return: Dict or None if data has not changed since etag
+        :raise: requests.exceptions.RequestException if the request fails
+        """
+        response = self._get_source_response(site, since, etag)
+        self.source_etag = response.headers.get('ETag')
+
+        if response.status_code == 304:
+            return None
+
+        return response.json()
+
+    def get_source_stream(self, site, since=None, etag=None):
+        """
+        Retrieve user and project data from a source site as an iterable of
+        decompressed chunks, to be read with sync_source_stream().
+
+        :param site: RemoteSite object for the source site
+        :param since: Sync token for only retrieving changes (string, optional)
+        :param etag: ETag of the previously synchronized data (string, optional)
+        :return: Iterable of bytes or None if data has not changed since etag
+        :raise: requests.exceptions.RequestException if the request fails
+        """
+        response = self._get_source_response(site, since, etag, stream=True)
+        self.source_etag = response.headers.get('ETag')
+
+        if response.status_code == 304:
+            response.close()
+            return None
+
+        return response.iter_content(chunk_size=REMOTE_READ_SIZE)
+
+    def get_target_data(self, target_site, since=None):
+        """
+        Get user and project data to be synchronized into a target site.
+
+        :param target_site: RemoteSite object for the target site
+        :param since: Sync token returned by an earlier call (string, optional)
+        :return: Dict
+        :raise: ValueError if the sync token is invalid
+        """
+        sync_token = timezone.now()
+        sync_data = {
+            'users': {},
+            'projects': {},
+            'sync_token': sync_token.isoformat(),
+        }
+        remote_projects = target_site.projects.all()
+
+        # Only include projects modified after the previous sync
+        if since:
+            since_date = dateparse.parse_datetime(since)
+
+            if not since_date:
+                raise ValueError('Invalid sync token "{}"'.format(since))
+
+            remote_projects = remote_projects.filter(
+                project_uuid__in=Project.objects.get_modified(
+                    since_date - SYNC_TOKEN_OVERLAP
+                ).values('sodar_uuid')
+            )
+
+        # Retrieve projects, parent categories, roles and user groups
+        remote_projects = list(remote_projects)
+        read_roles_uuids = [
+            rp.project_uuid
+            for rp in remote_projects
+            if rp.level == REMOTE_LEVEL_READ_ROLES
+        ]
+        projects = {
+            p.sodar_uuid: p
+            for p in Project.objects.filter(
+                sodar_uuid__in=[rp.project_uuid for rp in remote_projects]
+            )
+        }
+        categories = {
+            c.pk: c
+            for c in Project.objects.filter(
+                pk__in=set(
+                    pk for p in projects.values() for pk in p.parent_path
+                )
+            )
+        }
+        owner_roles = RoleAssignment.objects.filter(
+            project__in=categories.keys(), role__name=PROJECT_ROLE_OWNER
+        ).select_related('user', 'role')
+        project_roles = (
+            RoleAssignment.objects.filter(
+                project__sodar_uuid__in=read_roles_uuids
+            )
+            .select_related('user', 'role')
+            .order_by('role__name', 'user__username')
+        )
+        roles = defaultdict(list)
+
+        for role_as in project_roles:
+            roles[role_as.project_id].append(role_as)
+
+        user_groups = defaultdict(list)
+
+        for user_pk, group_name in (
+            User.groups.through.objects.filter(
+                Q(user__in=project_roles.values('user'))
+                | Q(user__in=owner_roles.values('user'))
+            )
+            .order_by('pk')
+            .values_list('user_id', 'group__name')
+        ):
+            user_groups[user_pk].append(group_name)
+
+        self.target_data = sync_data
+        self.target_categories = categories
+        self.target_owners = {r.project_id: r for r in owner_roles}
+        self.target_roles = roles
+        self.target_user_groups = user_groups
+
+        for rp in remote_projects:
+            project = projects.get(rp.project_uuid)
+
+            # Skip access set for projects no longer found
+            if project:
+                self._add_target_project(rp, project)
+
+        return sync_data
+
+    def get_target_payload(self, target_site, cached_only=False):
+        """
+        Get user and project data to be synchronized into a target site as
+        serialized JSON, along with an ETag for the data. The payload is cached
+        and shared between target sites with identical access levels until
+        projects, roles, remote projects or users are modified.
+
+        :param target_site: RemoteSite object for the target site
+        :param cached_only: Return None instead of building the payload if it
+                            is not found in the cache (boolean)
+        :return: Tuple of data (bytes) and ETag (string) or None
+        """
+        timeout = getattr(
+            settings,
+            'PROJECTROLES_REMOTE_TARGET_CACHE_TIMEOUT',
+            REMOTE_TARGET_CACHE_TIMEOUT,
+        )
+        version = cache.get_or_set(REMOTE_TARGET_VERSION_KEY, uuid4().hex, None)
+        access_key = REMOTE_TARGET_ACCESS_KEY.format(
+            site=target_site.pk, version=version
+        )
+        access = cache.get(access_key)
+
+        if not access:
+            access_levels = sorted(
+                (str(p_uuid), level)
+                for p_uuid, level in target_site.projects.values_list(
+                    'project_uuid', 'level'
+                )
+            )
+            access = hashlib.sha256(
+                json.dumps(access_levels).encode('utf-8')
+            ).hexdigest()
+            cache.set(access_key, access, timeout)
+
+        data_key = REMOTE_TARGET_DATA_KEY.format(access=access, version=version)
+        payload = cache.get(data_key)
+
+        if payload or cached_only:
+            return payload
+
+        sync_data = self.get_target_data(target_site)
+
+        # ETag is not affected by the sync token, so unchanged data which was
+        # rebuilt after invalidation still matches
+        sync_token = sync_data.pop('sync_token')
+        etag = '"{}"'.format(
+            hashlib.sha256(
+                json.dumps(sync_data, sort_keys=True).encode('utf-8')
+            ).hexdigest()
+        )
+        sync_data['sync_token'] = sync_token
+        payload = (
+            json.dumps(sync_data, separators=(',', ':')).encode('utf-8'),
+            etag,
+        )
+        cache.set(data_key, payload, timeout)
+        return payload
+
+    def sync_source_data(self, site, remote_data, request=None, dry_run=False):
+        """
+        Synchronize remote user and project data into the local Django database
+        and return information of additions.
+
+        :param site: RemoteSite object for the source site
+        :param remote_data: Data returned by get_target_data() in the source
+        :param request: Request object (optional)
+        :param dry_run: Only return changes without saving them (boolean)
+        :return: Dict with updated remote_data
+        :raise: ValueError if user from PROJECTROLES_DEFAULT_ADMIN is not found
+        """
+
+        def _get_entries():
+            if 'sync_token' in remote_data:
+                yield 'sync_token', None, remote_data['sync_token']
+
+            for k, v in remote_data['users'].items():
+                yield 'users', k, v
+
+            # Categories are provided first in case of unordered data
+            for k, v in sorted(
+                remote_data['projects'].items(),
+                key=lambda x: x[1]['type'] != PROJECT_TYPE_CATEGORY,
+            ):
+                yield 'projects', k, v
+
+        self._sync_entries(site, _get_entries(), request, dry_run=dry_run)
+        return remote_data
+
+    def sync_source_stream(
+        self,
+        site,
+        chunks,
+        request=None,
+        updates=True,
+        progress=None,
+        dry_run=False,
+    ):
+        """
+        Synchronize remote user and project data into the local Django database
+        while reading the data incrementally. Only a bounded number of users
+        and roles is kept in memory at a time, apart from the returned updates.
+
+        :param site: RemoteSite object for the source site
+        :param chunks: Iterable of data returned by get_target_data() in the
+                       source as JSON (bytes or strings)
+        :param request: Request object (optional)
+        :param updates: Return updated users and projects (boolean)
+        :param progress: Callable receiving the phase ("users", "categories",
+                         "projects" or "roles") and total number of
+                         synchronized items of the phase (optional)
+        :param dry_run: Only return changes without saving them, updates are
+                        always returned (boolean)
+        :return: Dict with users and projects updated in the sync or None
+        :raise: ValueError if user from PROJECTROLES_DEFAULT_ADMIN is not found
+                or if data is invalid
+        """
+        return self._sync_entries(
+            site, RemoteDataReader(chunks), request, updates, progress, dry_run
+        )
@@ -2,7 +2,8 @@ import rules
 
 from django.conf import settings
 
-from projectroles.models import RoleAssignment, SODAR_CONSTANTS
+from projectroles.access import get_role_resolver
+from projectroles.models import SODAR_CONSTANTS
 
 
 # SODAR constants
@@ -10,7 +11,6 @@ PROJECT_ROLE_OWNER = SODAR_CONSTANTS['PROJECT_ROLE_OWNER']
 PROJECT_ROLE_DELEGATE = SODAR_CONSTANTS['PROJECT_ROLE_DELEGATE']
 PROJECT_ROLE_CONTRIBUTOR = SODAR_CONSTANTS['PROJECT_ROLE_CONTRIBUTOR']
 PROJECT_ROLE_GUEST = SODAR_CONSTANTS['PROJECT_ROLE_GUEST']
-PROJECT_TYPE_CATEGORY = SODAR_CONSTANTS['PROJECT_TYPE_CATEGORY']
 SITE_MODE_SOURCE = SODAR_CONSTANTS['SITE_MODE_SOURCE']
 SITE_MODE_TARGET = SODAR_CONSTANTS['SITE_MODE_TARGET']
 
@@ -21,66 +21,44 @@ SITE_MODE_TARGET = SODAR_CONSTANTS['SITE_MODE_TARGET']
 @rules.predicate
 def is_project_owner(user, obj):
     """Whether or not the user has the role of project owner"""
-    assignment = RoleAssignment.objects.get_assignment(user, obj)
-
-    if assignment:
-        return assignment.role.name == PROJECT_ROLE_OWNER
-
-    return False
+    return get_role_resolver(user).get_role(obj) == PROJECT_ROLE_OWNER
 
 
 @rules.predicate
 def is_project_delegate(user, obj):
     """Whether or not the user has the role of project delegate"""
-    assignment = RoleAssignment.objects.get_assignment(user, obj)
-
-    if assignment:
-        return assignment.role.name == PROJECT_ROLE_DELEGATE
-
-    return False
+    return get_role_resolver(user).get_role(obj) == PROJECT_ROLE_DELEGATE
 
 
 @rules.predicate
 def is_project_contributor(user, obj):
     """Whether or not the user has the role of project contributor"""
-    assignment = RoleAssignment.objects.get_assignment(user, obj)
-
-    if assignment:
-        return assignment.role.name == PROJECT_ROLE_CONTRIBUTOR
-
-    return False
+    return get_role_resolver(user).get_role(obj) == PROJECT_ROLE_CONTRIBUTOR
 
 
 @rules.predicate
 def is_project_guest(user, obj):
     """Whether or not the user has the role of project guest"""
-    assignment = RoleAssignment.objects.get_assignment(user, obj)
-
-    if assignment:
-        return assignment.role.name == PROJECT_ROLE_GUEST
-
-    return False
+    return get_role_resolver(user).get_role(obj) == PROJECT_ROLE_GUEST
 
 
 @rules.predicate
 def has_project_role(user, obj):
     """Whether or not the user has any role in the project"""
-    return RoleAssignment.objects.get_assignment(user, obj) is not None
+    return get_role_resolver(user).has_role(obj)
 
 
 @rules.predicate
 def has_category_child_role(user, obj):
     """Whether or not the user has any role in any child project under the
     current one, if the current project is a category"""
-    return obj.type == PROJECT_TYPE_CATEGORY and obj.has_role(
-        user, include_children=True
-    )
+    return get_role_resolver(user).has_child_role(obj)
 
 
 @rules.predicate
 def has_roles(user):
     """Whether or not the user has any roles set in the system"""
-    return RoleAssignment.objects.filter(user=user).count() > 0
+    return get_role_resolver(user).has_roles()
 
 
 @rules.predicate
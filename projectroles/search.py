@@ -0,0 +1,122 @@
+"""Full text search index helpers for SODAR models"""
+
+from datetime import datetime
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db.models import F, Q
+from django.db.models.signals import post_save
+from django.utils import timezone
+
+
+# Settings
+SEARCH_CONFIG = (
+    settings.PROJECTROLES_SEARCH_CONFIG
+    if hasattr(settings, 'PROJECTROLES_SEARCH_CONFIG')
+    else 'simple'
+)
+
+# Local constants
+SEARCH_VECTOR_FIELD = 'search_vector'
+SEARCH_RANK_FIELD = 'search_rank'
+SEARCH_DATE_FORMAT = '%Y-%m-%d'
+
+
+# Indexed fields and their weights by model
+_search_indexes = {}
+
+
+def register_search_index(model, fields):
+    """
+    Register a model for full text search. The model must contain a
+    SearchVectorField named "search_vector", which is updated from the given
+    fields whenever an object is saved.
+
+    :param model: Model class
+    :param fields: Dict of field names and weights ("A", "B", "C" or "D")
+    """
+    _search_indexes[model] = fields
+    post_save.connect(
+        update_search_index_signal,
+        sender=model,
+        dispatch_uid='search_index_{}'.format(model._meta.label_lower),
+    )
+
+
+def get_search_vector(model):
+    """
+    Return search vector expression for the indexed fields of a model.
+
+    :param model: Model class registered with register_search_index()
+    :return: SearchVector or CombinedSearchVector object
+    :raise: ValueError if the model has not been registered
+    """
+    if model not in _search_indexes:
+        raise ValueError(
+            'Model "{}" not registered for search'.format(model._meta.label)
+        )
+
+    vector = None
+
+    for field, weight in _search_indexes[model].items():
+        field_vector = SearchVector(field, weight=weight, config=SEARCH_CONFIG)
+        vector = field_vector if vector is None else vector + field_vector
+
+    return vector
+
+
+def update_search_index(queryset):
+    """
+    Update search vectors for all objects in a queryset in a single query.
+
+    :param queryset: QuerySet of a model registered for search
+    :return: Number of updated objects
+    """
+    return queryset.update(
+        **{SEARCH_VECTOR_FIELD: get_search_vector(queryset.model)}
+    )
+
+
+def search_queryset(queryset, search_term, partial=None):
+    """
+    Filter queryset by a search term against the search index, ordering
+    results by rank. The rank is available in the "search_rank" attribute of
+    returned objects.
+
+    :param queryset: QuerySet of a model registered for search
+    :param search_term: Search term (string)
+    :param partial: Q object for additional partial matches (optional)
+    :return: QuerySet
+    """
+    query = SearchQuery(search_term, config=SEARCH_CONFIG)
+    match = Q(**{SEARCH_VECTOR_FIELD: query})
+
+    if partial:
+        match |= partial
+
+    return (
+        queryset.annotate(
+            **{SEARCH_RANK_FIELD: SearchRank(F(SEARCH_VECTOR_FIELD), query)}
+        )
+        .filter(match)
+        .order_by('-' + SEARCH_RANK_FIELD)
+    )
+
+
+def parse_search_date(value):
+    """
+    Parse a date given as a search keyword value, e.g. "modified:2019-06-01".
+
+    :param value: Date string in YYYY-MM-DD format
+    :return: Timezone aware DateTime object for the beginning of the date
+    :raise: ValueError if the value is not a valid date
+    """
+    return timezone.make_aware(datetime.strptime(value, SEARCH_DATE_FORMAT))
+
+
+# Signals ----------------------------------------------------------------------
+
+
+def update_search_index_signal(sender, instance, **kwargs):
+    """Signal for updating the search vector of a saved object"""
+    update_search_index(sender._default_manager.filter(pk=instance.pk))
@@ -105,12 +105,62 @@ function modifySearch() {
     }
 }
 
+// Display search suggestions for the nav search input
+var searchSuggestTimeout = null;
+
+function updateSearchSuggestions() {
+    var input = $('#sodar-nav-search-input');
+    var menu = $('#sodar-nav-search-suggest');
+    var v = input.val().trim();
+
+    // Suggestions are not retrieved for keywords
+    if (v.length < 3 || v.indexOf(':') !== -1) {
+        menu.removeClass('show').empty();
+        return;
+    }
+
+    $.ajax({
+        url: input.attr('data-suggest-url'),
+        method: 'GET',
+        data: {s: v}
+    }).done(function (data) {
+        // Ignore responses to outdated input
+        if (input.val().trim() !== v) {
+            return;
+        }
+
+        menu.empty();
+
+        $.each(data['results'], function (i, item) {
+            var link = $('<a class="dropdown-item sodar-search-suggest-item">')
+                .attr('href', item['url'])
+                .text(item['label']);
+
+            if (item['project'] && item['search_type'] !== 'project') {
+                link.append($('<span class="text-muted ml-2">')
+                    .text(item['project']));
+            }
+
+            menu.append(link);
+        });
+
+        menu.toggleClass('show', data['results'].length > 0);
+    });
+}
+
 $(document).ready(function() {
      $('#sodar-nav-search-submit').attr('disabled', 'disabled');
      $('#sodar-nav-search-input').keyup(function() {
         modifySearch();
      }).on('input', function() {
         modifySearch();
+        clearTimeout(searchSuggestTimeout);
+        searchSuggestTimeout = setTimeout(updateSearchSuggestions, 200);
+     }).blur(function() {
+        // Delay hiding to allow clicking on a suggestion
+        setTimeout(function () {
+            $('#sodar-nav-search-suggest').removeClass('show');
+        }, 200);
      });
  });
 
@@ -6,8 +6,10 @@ from django.conf import settings
 from django.urls import reverse
 from django.utils import timezone
 
+from ..access import get_role_resolver
 from ..models import (
     Project,
+    ProjectUserTag,
     RoleAssignment,
     RemoteProject,
     SODAR_CONSTANTS,
@@ -121,37 +123,79 @@ def is_app_hidden(plugin, user):
 
 @register.simple_tag
 def get_project_list(user, parent=None):
-    """Return flat project list for displaying in templates"""
-    project_list = []
+    """
+    Return flat project list for displaying in templates. Data needed for
+    rendering project list rows is prefetched and stored in the returned
+    Project objects, so the list is built in a fixed number of queries
+    regardless of the amount of projects.
+
+    :param user: User object
+    :param parent: Parent category for the list or None
+    :return: List of Project objects
+    """
+    if user.is_anonymous():
+        return []
+
+    projects = Project.objects.get_visible_projects(user, parent=parent).filter(
+        submit_status=SODAR_CONSTANTS['SUBMIT_STATUS_OK']
+    )
+    children = {}
 
-    if user.is_superuser:
-        project_list = Project.objects.filter(
-            parent=parent, submit_status='OK'
-        ).order_by('title')
-
-    elif not user.is_anonymous():
-        project_list = [
-            p
-            for p in Project.objects.filter(
-                parent=parent, submit_status='OK'
-            ).order_by('title')
-            if p.has_role(user, include_children=True)
-        ]
+    for p in projects:
+        children.setdefault(p.parent_id, []).append(p)
+
+    resolver = get_role_resolver(user)
+    starred = set(
+        ProjectUserTag.objects.filter(
+            user=user, name=PROJECT_TAG_STARRED
+        ).values_list('project__pk', flat=True)
+    )
+    base_depth = len(parent.parent_path) + 1 if parent else 0
 
     def append_projects(project):
+        project.list_indent = (
+            len(project.parent_path) - base_depth
+        ) * INDENT_PX
+        project.list_can_view = user.is_superuser or (
+            resolver.has_role(project) or resolver.has_child_role(project)
+        )
+        project.list_starred = project.list_can_view and project.pk in starred
+        project.list_role_html = _get_role_html(
+            resolver.get_role(project), user.is_superuser
+        )
+        project.list_values = {}
         lst = [project]
 
-        for c in project.get_children():
-            if user.is_superuser or c.has_role(user, include_children=True):
-                lst += append_projects(c)
+        for c in sorted(children.get(project.pk, []), key=lambda x: x.title):
+            lst += append_projects(c)
 
         return lst
 
     flat_list = []
 
-    for p in project_list:
+    for p in sorted(
+        children.get(parent.pk if parent else None, []), key=lambda x: x.title
+    ):
         flat_list += append_projects(p)
 
+    # Retrieve project list column values from app plugins
+    list_projects = [
+        p
+        for p in flat_list
+        if p.type == SODAR_CONSTANTS['PROJECT_TYPE_PROJECT']
+    ]
+
+    for plugin in get_active_plugins(plugin_type='project_app'):
+        for column_id, column in plugin.project_list_columns.items():
+            if not column.get('active') or not list_projects:
+                continue
+
+            values = plugin.get_project_list_values(column_id, list_projects)
+
+            for p in list_projects:
+                plugin_values = p.list_values.setdefault(plugin.name, {})
+                plugin_values[column_id] = values.get(p)
+
     return flat_list
 
 
@@ -209,21 +253,34 @@ def get_not_found_alert(project_results, app_search_data, search_type):
 
 @register.simple_tag
 def get_project_list_value(app_plugin, column_id, project):
+    """Return project list column value, using a value retrieved in
+    get_project_list() if available"""
+    values = getattr(project, 'list_values', {}).get(app_plugin.name, {})
+
+    if column_id in values:
+        return values[column_id]
+
     return app_plugin.get_project_list_value(column_id, project)
 
 
+def _get_role_html(role_name, is_superuser=False):
+    """Return user role HTML for a role name"""
+    if is_superuser:
+        return '<span class="text-danger">Superuser</span>'
+
+    if role_name:
+        return role_name.split(' ')[1].capitalize()
+
+    return '<span class="text-muted">N/A</span>'
+
+
 @register.simple_tag
 def get_user_role_html(project, user):
     """Return user role HTML"""
     if user.is_superuser:
-        return '<span class="text-danger">Superuser</span>'
+        return _get_role_html(None, True)
 
-    try:
-        role_as = RoleAssignment.objects.get(project=project, user=user)
-        return role_as.role.name.split(' ')[1].capitalize()
-
-    except RoleAssignment.DoesNotExist:
-        return '<span class="text-muted">N/A</span>'
+    return _get_role_html(get_role_resolver(user).get_role(project))
 
 
 @register.simple_tag
@@ -0,0 +1,187 @@
+"""Tests for role resolution in the projectroles Django app"""
+
+from django.contrib.auth.models import AnonymousUser
+
+from test_plus.test import TestCase
+
+from projectroles.access import filter_by_project_access, get_role_resolver
+from projectroles.models import Project, Role, RoleAssignment, SODAR_CONSTANTS
+from projectroles.tests.test_models import ProjectMixin, RoleAssignmentMixin
+
+
+# SODAR constants
+PROJECT_ROLE_OWNER = SODAR_CONSTANTS['PROJECT_ROLE_OWNER']
+PROJECT_ROLE_CONTRIBUTOR = SODAR_CONSTANTS['PROJECT_ROLE_CONTRIBUTOR']
+PROJECT_TYPE_CATEGORY = SODAR_CONSTANTS['PROJECT_TYPE_CATEGORY']
+PROJECT_TYPE_PROJECT = SODAR_CONSTANTS['PROJECT_TYPE_PROJECT']
+
+
+class TestRoleResolver(ProjectMixin, RoleAssignmentMixin, TestCase):
+    """Tests for RoleResolver"""
+
+    def setUp(self):
+        self.role_owner = Role.objects.get(name=PROJECT_ROLE_OWNER)
+        self.role_contributor = Role.objects.get(name=PROJECT_ROLE_CONTRIBUTOR)
+        self.user_owner = self.make_user('owner')
+        self.user_contributor = self.make_user('contributor')
+
+        self.category = self._make_project(
+            'TestCategory', PROJECT_TYPE_CATEGORY, None
+        )
+        self.sub_category = self._make_project(
+            'TestSubCategory', PROJECT_TYPE_CATEGORY, self.category
+        )
+        self.project = self._make_project(
+            'TestProject', PROJECT_TYPE_PROJECT, self.sub_category
+        )
+        self.other_category = self._make_project(
+            'OtherCategory', PROJECT_TYPE_CATEGORY, None
+        )
+        self._make_assignment(self.category, self.user_owner, self.role_owner)
+        self._make_assignment(self.project, self.user_owner, self.role_owner)
+        self._make_assignment(
+            self.project, self.user_contributor, self.role_contributor
+        )
+
+    def test_get_role(self):
+        """Test get_role()"""
+        resolver = get_role_resolver(self.user_contributor)
+        self.assertEqual(
+            resolver.get_role(self.project), PROJECT_ROLE_CONTRIBUTOR
+        )
+        self.assertIsNone(resolver.get_role(self.category))
+        self.assertIsNone(resolver.get_role(None))
+
+    def test_has_child_role(self):
+        """Test has_child_role() for parent categories"""
+        resolver = get_role_resolver(self.user_contributor)
+        self.assertTrue(resolver.has_child_role(self.category))
+        self.assertTrue(resolver.has_child_role(self.sub_category))
+        self.assertFalse(resolver.has_child_role(self.other_category))
+        self.assertFalse(resolver.has_child_role(self.project))
+
+    def test_has_roles(self):
+        """Test has_roles()"""
+        self.assertTrue(get_role_resolver(self.user_owner).has_roles())
+        self.assertFalse(
+            get_role_resolver(self.make_user('no_roles')).has_roles()
+        )
+
+    def test_anonymous(self):
+        """Test resolver for an anonymous user"""
+        with self.assertNumQueries(0):
+            resolver = get_role_resolver(AnonymousUser())
+            self.assertIsNone(resolver.get_role(self.project))
+            self.assertFalse(resolver.has_child_role(self.category))
+
+    def test_queries(self):
+        """Test permission checks do not query roles after the first check"""
+        with self.assertNumQueries(1):
+            get_role_resolver(self.user_owner)
+
+        with self.assertNumQueries(0):
+            self.assertTrue(
+                self.user_owner.has_perm(
+                    'projectroles.view_project_roles', self.project
+                )
+            )
+            self.assertTrue(
+                self.user_owner.has_perm(
+                    'projectroles.view_project', self.sub_category
+                )
+            )
+            self.assertFalse(
+                self.user_owner.has_perm(
+                    'projectroles.view_project', self.other_category
+                )
+            )
+
+    def test_invalidate(self):
+        """Test resolver invalidation on role assignment changes"""
+        self.assertFalse(
+            self.user_contributor.has_perm(
+                'projectroles.view_project', self.other_category
+            )
+        )
+        self._make_assignment(
+            self.other_category, self.user_contributor, self.role_owner
+        )
+        self.assertTrue(
+            self.user_contributor.has_perm(
+                'projectroles.view_project', self.other_category
+            )
+        )
+
+
+class TestFilterByProjectAccess(ProjectMixin, RoleAssignmentMixin, TestCase):
+    """Tests for filter_by_project_access()"""
+
+    def setUp(self):
+        self.role_contributor = Role.objects.get(name=PROJECT_ROLE_CONTRIBUTOR)
+        self.user = self.make_user('user')
+        self.category = self._make_project(
+            'TestCategory', PROJECT_TYPE_CATEGORY, None
+        )
+        self.sub_category = self._make_project(
+            'TestSubCategory', PROJECT_TYPE_CATEGORY, self.category
+        )
+        self.project = self._make_project(
+            'TestProject', PROJECT_TYPE_PROJECT, self.sub_category
+        )
+        self.other_project = self._make_project(
+            'OtherProject', PROJECT_TYPE_PROJECT, None
+        )
+        self.assignment = self._make_assignment(
+            self.project, self.user, self.role_contributor
+        )
+
+    def test_filter_projects(self):
+        """Test filtering projects with parent categories"""
+        with self.assertNumQueries(1):
+            projects = list(
+                filter_by_project_access(
+                    Project.objects.all(), self.user, project_lookup='pk'
+                )
+            )
+        self.assertEqual(
+            sorted(projects, key=lambda x: x.pk),
+            [self.category, self.sub_category, self.project],
+        )
+
+    def test_filter_no_categories(self):
+        """Test filtering projects without parent categories"""
+        projects = filter_by_project_access(
+            Project.objects.all(),
+            self.user,
+            project_lookup='pk',
+            include_categories=False,
+        )
+        self.assertEqual(list(projects), [self.project])
+
+    def test_filter_related(self):
+        """Test filtering objects related to projects"""
+        self._make_assignment(
+            self.other_project, self.make_user('other'), self.role_contributor
+        )
+        assignments = filter_by_project_access(
+            RoleAssignment.objects.all(), self.user
+        )
+        self.assertEqual(list(assignments), [self.assignment])
+
+    def test_filter_superuser(self):
+        """Test filtering for a superuser"""
+        superuser = self.make_user('superuser')
+        superuser.is_superuser = True
+        superuser.save()
+        projects = filter_by_project_access(
+            Project.objects.all(), superuser, project_lookup='pk'
+        )
+        self.assertEqual(projects.count(), Project.objects.count())
+
+    def test_filter_anonymous(self):
+        """Test filtering for an anonymous user"""
+        with self.assertNumQueries(0):
+            projects = filter_by_project_access(
+                Project.objects.all(), AnonymousUser(), project_lookup='pk'
+            )
+            self.assertEqual(list(projects), [])
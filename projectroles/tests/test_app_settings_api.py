@@ -3,7 +3,7 @@
 from test_plus.test import TestCase
 
 from ..models import Role, AppSetting, SODAR_CONSTANTS
-from ..plugins import get_app_plugin
+from ..plugins import get_active_plugins, get_app_plugin
 from ..app_settings import AppSettingAPI
 from .test_models import ProjectMixin, RoleAssignmentMixin, AppSettingMixin
 
@@ -110,6 +110,65 @@ class TestAppSettingAPI(
                 project=self.project,
             )
 
+    def test_get_project_setting_queries(self):
+        """Test get_app_setting() query count for multiple settings"""
+        get_active_plugins()  # Ensure plugins are loaded
+
+        with self.assertNumQueries(1):
+            for setting_name in [
+                'str_setting',
+                'int_setting',
+                'bool_setting',
+                EXISTING_SETTING,
+            ]:
+                app_settings.get_app_setting(
+                    app_name=EXAMPLE_APP_NAME,
+                    setting_name=setting_name,
+                    project=self.project,
+                )
+
+        with self.assertNumQueries(0):
+            val = app_settings.get_app_setting(
+                app_name=EXAMPLE_APP_NAME,
+                setting_name='int_setting',
+                project=self.project,
+            )
+        self.assertEqual(val, 170)
+
+    def test_get_project_setting_deleted(self):
+        """Test get_app_setting() after deleting a cached setting"""
+        app_settings.get_app_setting(
+            app_name=EXAMPLE_APP_NAME,
+            setting_name='str_setting',
+            project=self.project,
+        )
+        self.setting_str.delete()
+
+        with self.assertRaises(KeyError):  # Not defined in the example app
+            app_settings.get_app_setting(
+                app_name=EXAMPLE_APP_NAME,
+                setting_name='str_setting',
+                project=self.project,
+            )
+
+    def test_get_all_settings(self):
+        """Test get_all_settings()"""
+        get_active_plugins()  # Ensure plugins are loaded
+        prefix = 'settings.{}.'.format(EXAMPLE_APP_NAME)
+
+        with self.assertNumQueries(1):
+            ret = app_settings.get_all_settings(project=self.project)
+        self.assertEqual(ret[prefix + EXISTING_SETTING], False)
+
+        app_settings.set_app_setting(
+            app_name=EXAMPLE_APP_NAME,
+            setting_name=EXISTING_SETTING,
+            value=True,
+            project=self.project,
+        )
+        ret = app_settings.get_all_settings(project=self.project)
+        self.assertEqual(ret[prefix + EXISTING_SETTING], True)
+
     def test_set_project_setting(self):
         """Test set_app_setting()"""
 
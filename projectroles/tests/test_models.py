@@ -382,6 +382,127 @@ class TestProject(ProjectMixin, TestCase):
         )
         self.assertEqual(self.project_sub.get_absolute_url(), expected_url)
 
+    def test_parent_path(self):
+        """Test parent path set on save()"""
+        self.assertEqual(self.category_top.parent_path, [])
+        self.assertEqual(self.project_sub.parent_path, [self.category_top.pk])
+        self.assertEqual(self.project_top.parent_path, [])
+
+    def test_parent_path_move(self):
+        """Test parent path update for nested projects when moving a
+        category"""
+        category_new = self._make_project(
+            title='TestCategoryNew', type=PROJECT_TYPE_CATEGORY, parent=None
+        )
+        self.category_top.parent = category_new
+        self.category_top.save()
+        self.project_sub.refresh_from_db()
+        self.assertEqual(
+            self.project_sub.parent_path,
+            [category_new.pk, self.category_top.pk],
+        )
+        self.assertEqual(self.project_sub.get_depth(), 2)
+
+        self.category_top.parent = None
+        self.category_top.save()
+        self.project_sub.refresh_from_db()
+        self.assertEqual(self.project_sub.parent_path, [self.category_top.pk])
+
+    def test_validate_parent_child(self):
+        """Test parent validation: category can't be moved under its own
+        child"""
+        category_sub = self._make_project(
+            title='TestCategorySub',
+            type=PROJECT_TYPE_CATEGORY,
+            parent=self.category_top,
+        )
+        with self.assertRaises(ValidationError):
+            self.category_top.parent = category_sub
+            self.category_top.save()
+
+
+class TestProjectHierarchy(ProjectMixin, TestCase):
+    """Tests for ProjectManager hierarchy queries"""
+
+    def setUp(self):
+        self.category_top = self._make_project(
+            title='TestCategoryTop', type=PROJECT_TYPE_CATEGORY, parent=None
+        )
+        self.category_sub = self._make_project(
+            title='TestCategorySub',
+            type=PROJECT_TYPE_CATEGORY,
+            parent=self.category_top,
+        )
+        self.project_sub = self._make_project(
+            title='TestProjectSub',
+            type=PROJECT_TYPE_PROJECT,
+            parent=self.category_sub,
+        )
+        self.project_top = self._make_project(
+            title='TestProjectTop', type=PROJECT_TYPE_PROJECT, parent=None
+        )
+
+    def test_ancestors(self):
+        """Test ancestors()"""
+        with self.assertNumQueries(1):
+            result = list(Project.objects.ancestors(self.project_sub))
+        self.assertEqual(result, [self.category_top, self.category_sub])
+
+    def test_ancestors_top(self):
+        """Test ancestors() for a top level project"""
+        self.assertEqual(Project.objects.ancestors(self.project_top).count(), 0)
+
+    def test_descendants(self):
+        """Test descendants()"""
+        with self.assertNumQueries(1):
+            result = set(Project.objects.descendants(self.category_top))
+        self.assertEqual(result, {self.category_sub, self.project_sub})
+
+    def test_subtree(self):
+        """Test subtree()"""
+        result = set(Project.objects.subtree(self.category_sub))
+        self.assertEqual(result, {self.category_sub, self.project_sub})
+
+    def test_get_full_title(self):
+        """Test get_full_title() query count for a nested project"""
+        project = Project.objects.get(pk=self.project_sub.pk)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                project.get_full_title(),
+                'TestCategoryTop / TestCategorySub / TestProjectSub',
+            )
+
+    def test_full_title_rename(self):
+        """Test full title update for nested projects when renaming a
+        category"""
+        self.category_top.title = 'TestCategoryRenamed'
+        self.category_top.save()
+        self.category_sub.refresh_from_db()
+        self.project_sub.refresh_from_db()
+        self.assertEqual(
+            self.category_sub.full_title,
+            'TestCategoryRenamed / TestCategorySub',
+        )
+        self.assertEqual(
+            self.project_sub.full_title,
+            'TestCategoryRenamed / TestCategorySub / TestProjectSub',
+        )
+        self.assertEqual(
+            self.project_sub.search_text,
+            'testcategoryrenamed / testcategorysub / testprojectsub\n',
+        )
+
+    def test_full_title_move(self):
+        """Test full title update for nested projects when moving a
+        category"""
+        self.category_sub.parent = None
+        self.category_sub.save()
+        self.project_sub.refresh_from_db()
+        self.assertEqual(
+            self.project_sub.full_title, 'TestCategorySub / TestProjectSub'
+        )
+
 
 class TestRole(TestCase):
     def setUp(self):
@@ -765,6 +886,137 @@ class TestProjectManager(ProjectMixin, RoleAssignmentMixin, TestCase):
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0], self.category_top)
 
+    def test_find_parent_title(self):
+        """Test find() with search term matching parent title"""
+        result = Project.objects.find(
+            'categorytop', project_type=PROJECT_TYPE_PROJECT
+        )
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0], self.project_sub)
+
+    def test_find_order(self):
+        """Test find() result ordering by full title"""
+        result = Project.objects.find('Test', project_type=None)
+        self.assertEqual(list(result), [self.category_top, self.project_sub])
+
+    def test_find_queries(self):
+        """Test find() query count"""
+        with self.assertNumQueries(1):
+            list(Project.objects.find('Test', project_type=None))
+
+    def test_find_rank(self):
+        """Test find() result ordering by search rank"""
+        project_desc = self._make_project(
+            title='AProjectDesc',
+            type=PROJECT_TYPE_PROJECT,
+            parent=self.category_top,
+            description='Genome analysis',
+        )
+        project_title = self._make_project(
+            title='Genome', type=PROJECT_TYPE_PROJECT, parent=self.category_top
+        )
+        result = Project.objects.find('genome', project_type=None)
+        self.assertEqual(list(result), [project_title, project_desc])
+        self.assertGreater(result[0].search_rank, result[1].search_rank)
+
+    def test_find_parent_rename(self):
+        """Test find() after renaming parent category"""
+        self.category_top.title = 'Genome'
+        self.category_top.save()
+        result = Project.objects.find(
+            'genome', project_type=PROJECT_TYPE_PROJECT
+        )
+        self.assertEqual(list(result), [self.project_sub])
+        self.assertGreater(result[0].search_rank, 0)
+
+    def test_find_keyword_owner(self):
+        """Test find() with the owner keyword"""
+        user = self.make_user('owner')
+        self._make_assignment(
+            self.project_sub, user, Role.objects.get(name=PROJECT_ROLE_OWNER)
+        )
+        result = Project.objects.find('Test', keywords={'owner': 'owner'})
+        self.assertEqual(list(result), [self.project_sub])
+        result = Project.objects.find('Test', keywords={'owner': 'other'})
+        self.assertEqual(list(result), [])
+
+    def test_find_keyword_parent(self):
+        """Test find() with the parent keyword"""
+        result = Project.objects.find(
+            'Test', keywords={'parent': 'testcategorytop'}
+        )
+        self.assertEqual(list(result), [self.project_sub])
+        result = Project.objects.find('Test', keywords={'parent': 'other'})
+        self.assertEqual(list(result), [])
+
+
+class TestProjectManagerVisible(ProjectMixin, RoleAssignmentMixin, TestCase):
+    """Tests for ProjectManager visible project queries"""
+
+    def setUp(self):
+        self.role_owner = Role.objects.get(name=PROJECT_ROLE_OWNER)
+        self.role_guest = Role.objects.get(name=PROJECT_ROLE_GUEST)
+        self.user = self.make_user('user')
+        self.category_top = self._make_project(
+            'TestCategoryTop', PROJECT_TYPE_CATEGORY, None
+        )
+        self.category_sub = self._make_project(
+            'TestCategorySub', PROJECT_TYPE_CATEGORY, self.category_top
+        )
+        self.project_sub = self._make_project(
+            'TestProjectSub', PROJECT_TYPE_PROJECT, self.category_sub
+        )
+        self.project_top = self._make_project(
+            'TestProjectTop', PROJECT_TYPE_PROJECT, None
+        )
+        self._make_assignment(
+            self.project_sub, self.make_user('owner'), self.role_owner
+        )
+        self._make_assignment(self.project_sub, self.user, self.role_guest)
+
+    def test_get_visible_projects(self):
+        """Test get_visible_projects() for a project member"""
+        with self.assertNumQueries(1):
+            result = set(Project.objects.get_visible_projects(self.user))
+        self.assertEqual(
+            result, {self.category_top, self.category_sub, self.project_sub}
+        )
+
+    def test_get_visible_projects_type(self):
+        """Test get_visible_projects() with project type"""
+        result = Project.objects.get_visible_projects(
+            self.user, project_type=PROJECT_TYPE_PROJECT
+        )
+        self.assertEqual(list(result), [self.project_sub])
+
+    def test_get_visible_projects_no_roles(self):
+        """Test get_visible_projects() for a user without roles"""
+        user = self.make_user('no_roles')
+        self.assertEqual(Project.objects.get_visible_projects(user).count(), 0)
+
+    def test_get_visible_projects_anonymous(self):
+        """Test get_visible_projects() for an anonymous user"""
+        self.assertEqual(
+            Project.objects.get_visible_projects(AnonymousUser()).count(), 0
+        )
+
+    def test_get_visible_projects_superuser(self):
+        """Test get_visible_projects() for a superuser"""
+        user = self.make_user('superuser')
+        user.is_superuser = True
+        user.save()
+        self.assertEqual(
+            Project.objects.get_visible_projects(user).count(),
+            Project.objects.count(),
+        )
+
+    def test_get_visible_categories(self):
+        """Test get_visible_categories() with parent"""
+        result = Project.objects.get_visible_categories(
+            self.user, parent=self.category_top
+        )
+        self.assertEqual(list(result), [self.category_sub])
+
 
 class TestProjectSetting(
     ProjectMixin, RoleAssignmentMixin, AppSettingMixin, TestCase
@@ -1064,6 +1316,8 @@ class TestRemoteSite(
             'description': '',
             'secret': REMOTE_SITE_SECRET,
             'sodar_uuid': self.site.sodar_uuid,
+            'sync_token': None,
+            'sync_etag': None,
         }
         self.assertEqual(model_to_dict(self.site), expected)
 
@@ -1188,6 +1442,27 @@ class TestRemoteProject(
         self.site.save()
         self.assertEqual(self.project.get_source_site(), self.site)
 
+    @override_settings(PROJECTROLES_SITE_MODE=SITE_MODE_TARGET)
+    def test_get_source_site_queries(self):
+        """Test Project.get_source_site() reusing cached source sites"""
+        self.site.mode = SITE_MODE_SOURCE
+        self.site.save()
+        self.project.get_source_site()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.project.get_source_site(), self.site)
+            self.assertEqual(self.project.is_remote(), True)
+
+    @override_settings(PROJECTROLES_SITE_MODE=SITE_MODE_TARGET)
+    def test_get_source_site_delete(self):
+        """Test Project.get_source_site() after deleting remote project"""
+        self.site.mode = SITE_MODE_SOURCE
+        self.site.save()
+        self.assertEqual(self.project.is_remote(), True)
+        self.remote_project.delete()
+        self.assertEqual(self.project.get_source_site(), None)
+        self.assertEqual(self.project.is_remote(), False)
+
     @override_settings(PROJECTROLES_SITE_MODE=SITE_MODE_TARGET)
     @override_settings(PROJECTROLES_DELEGATE_LIMIT=1)
     def test_validate_remote_delegates(self):
@@ -0,0 +1,93 @@
+"""Tests for the plugin API in the projectroles Django app"""
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from test_plus.test import TestCase
+
+from projectroles.plugins import (
+    change_plugin_status,
+    get_active_plugins,
+    get_app_plugin,
+    get_backend_api,
+    reset_active_plugins,
+    DISABLED,
+    PLUGIN_VERSION_KEY,
+)
+
+
+# Local constants
+EXAMPLE_APP_NAME = 'example_project_app'
+EXAMPLE_BACKEND_NAME = 'example_backend_app'
+
+
+class TestPluginAPI(TestCase):
+    """Tests for the plugin API"""
+
+    def setUp(self):
+        reset_active_plugins()
+
+    def tearDown(self):
+        # Plugin status changes are rolled back after each test
+        reset_active_plugins()
+
+    def test_get_active_plugins(self):
+        """Test get_active_plugins() ordering"""
+        plugins = get_active_plugins()
+        self.assertIn(EXAMPLE_APP_NAME, [p.name for p in plugins])
+        self.assertEqual(plugins, sorted(plugins, key=lambda x: x.name))
+
+    def test_get_active_plugins_invalid(self):
+        """Test get_active_plugins() with an invalid plugin type"""
+        with self.assertRaises(ValueError):
+            get_active_plugins('invalid_type')
+
+    def test_get_active_plugins_queries(self):
+        """Test get_active_plugins() reusing loaded plugins"""
+        get_active_plugins()
+        get_active_plugins('backend')
+
+        with self.assertNumQueries(0):
+            get_active_plugins()
+            get_active_plugins('backend')
+            get_app_plugin(EXAMPLE_APP_NAME)
+            get_backend_api(EXAMPLE_BACKEND_NAME)
+
+    def test_get_active_plugins_backend(self):
+        """Test get_active_plugins() with ENABLED_BACKEND_PLUGINS"""
+        self.assertIn(
+            EXAMPLE_BACKEND_NAME,
+            [p.name for p in get_active_plugins('backend')],
+        )
+
+        with override_settings(ENABLED_BACKEND_PLUGINS=[]):
+            self.assertEqual(get_active_plugins('backend'), [])
+            self.assertIsNone(get_backend_api(EXAMPLE_BACKEND_NAME))
+            self.assertIsNotNone(
+                get_backend_api(EXAMPLE_BACKEND_NAME, force=True)
+            )
+
+    def test_change_plugin_status(self):
+        """Test registry update with change_plugin_status()"""
+        self.assertIsNotNone(get_app_plugin(EXAMPLE_APP_NAME))
+        change_plugin_status(EXAMPLE_APP_NAME, DISABLED, plugin_type='app')
+        self.assertNotIn(
+            EXAMPLE_APP_NAME, [p.name for p in get_active_plugins()]
+        )
+        self.assertIsNone(get_app_plugin(EXAMPLE_APP_NAME))
+
+    def test_change_plugin_status_other_process(self):
+        """Test registry update with plugin status changed in another process"""
+        get_active_plugins()
+        # Set the shared version as done by reset_active_plugins() elsewhere
+        cache.set(PLUGIN_VERSION_KEY, 'changed', None)
+
+        with CaptureQueriesContext(connection) as ctx:
+            get_active_plugins()
+
+        self.assertNotEqual(len(ctx), 0)  # Plugins are reloaded
+
+        with self.assertNumQueries(0):
+            get_active_plugins()
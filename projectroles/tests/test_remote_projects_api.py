@@ -1,11 +1,29 @@
 """Test for the remote projects API in the projectroles app"""
 from copy import deepcopy
+from datetime import timedelta
+import gzip
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import json
+import os
+from socketserver import ThreadingMixIn
+import threading
+import time
+import tracemalloc
+from unittest import skipIf
 import uuid
 
+import requests
+
 from django.conf import settings
 from django.contrib import auth
+from django.core.cache import cache
+from django.db import connection
 from django.forms.models import model_to_dict
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import dateparse, timezone
+from django.utils.http import urlencode
 
 from test_plus.test import TestCase
 
@@ -17,8 +35,14 @@ from projectroles.models import (
     SODAR_CONSTANTS,
 )
 
-from projectroles.remote_projects import RemoteProjectAPI
+from projectroles.remote_projects import (
+    RemoteDataReader,
+    RemoteProjectAPI,
+    SYNC_TOKEN_OVERLAP,
+    reset_remote_session,
+)
 from projectroles.utils import build_secret
+from timeline.models import ProjectEvent
 from projectroles.tests.test_models import (
     ProjectMixin,
     RoleAssignmentMixin,
@@ -75,6 +99,307 @@ TARGET_SITE_URL = 'https://target.url'
 TARGET_SITE_DESC = 'Target description'
 TARGET_SITE_SECRET = build_secret()
 
+BENCHMARK_ENABLED = bool(os.environ.get('PROJECTROLES_TEST_BENCHMARK'))
+BENCHMARK_SKIP_MSG = 'PROJECTROLES_TEST_BENCHMARK not set'
+
+
+class SourceSiteRequestHandler(BaseHTTPRequestHandler):
+    """Request handler for a local stand-in source site server"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        server.request_log.append(
+            {
+                'path': self.path,
+                'headers': self.headers,
+                'client_address': self.client_address,
+            }
+        )
+        status, data = (
+            server.responses.pop(0)
+            if len(server.responses) > 1
+            else server.responses[0]
+        )
+
+        if server.delay:
+            time.sleep(server.delay)
+
+        # Not modified responses have no body
+        body = json.dumps(data).encode('utf-8') if status != 304 else b''
+        compress = body and 'gzip' in self.headers.get('Accept-Encoding', '')
+
+        if compress:
+            body = gzip.compress(body)
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+
+        if server.etag:
+            self.send_header('ETag', server.etag)
+
+        if compress:
+            self.send_header('Content-Encoding', 'gzip')
+
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class SourceSiteServer(ThreadingMixIn, HTTPServer):
+    """Local stand-in source site server"""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), SourceSiteRequestHandler)
+        self.responses = [(200, {'users': {}, 'projects': {}})]
+        self.request_log = []
+        self.delay = 0
+        self.etag = None
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:{}'.format(self.server_address[1])
+
+    def handle_error(self, request, client_address):
+        pass  # Ignore clients disconnecting on timeout
+
+
+def get_chunks(data, size=1):
+    """Return JSON data as a list of bytes chunks of a given size"""
+    data = json.dumps(data).encode('utf-8')
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+class TestRemoteDataReader(TestCase):
+    """Tests for the RemoteDataReader class"""
+
+    def setUp(self):
+        self.data = {
+            'sync_token': '2019-06-28T12:00:00+00:00',
+            'users': {
+                SOURCE_USER_UUID: {
+                    'username': SOURCE_USER_USERNAME,
+                    'name': 'Näme Ñame',
+                    'groups': [SOURCE_USER_GROUP],
+                }
+            },
+            'projects': {
+                SOURCE_CATEGORY_UUID: {
+                    'title': SOURCE_CATEGORY_TITLE,
+                    'parent_uuid': None,
+                    'level': 1234,
+                },
+                SOURCE_PROJECT_UUID: {
+                    'title': SOURCE_PROJECT_TITLE,
+                    'parent_uuid': SOURCE_CATEGORY_UUID,
+                    'roles': {},
+                },
+            },
+        }
+
+    def test_read(self):
+        """Test reading data in single byte chunks"""
+        entries = list(RemoteDataReader(get_chunks(self.data)))
+
+        expected = [
+            ('sync_token', None, self.data['sync_token']),
+            ('users', SOURCE_USER_UUID, self.data['users'][SOURCE_USER_UUID]),
+            (
+                'projects',
+                SOURCE_CATEGORY_UUID,
+                self.data['projects'][SOURCE_CATEGORY_UUID],
+            ),
+            (
+                'projects',
+                SOURCE_PROJECT_UUID,
+                self.data['projects'][SOURCE_PROJECT_UUID],
+            ),
+        ]
+        self.assertEqual(entries, expected)
+
+    def test_read_whitespace(self):
+        """Test reading indented data as a string"""
+        entries = list(RemoteDataReader([json.dumps(self.data, indent=2)]))
+        self.assertEqual(len(entries), 4)
+
+    def test_read_empty(self):
+        """Test reading data with no users or projects"""
+        entries = list(
+            RemoteDataReader(get_chunks({'users': {}, 'projects': {}}))
+        )
+        self.assertEqual(entries, [])
+
+    def test_read_invalid(self):
+        """Test reading invalid data (should fail)"""
+        with self.assertRaises(ValueError):
+            list(RemoteDataReader([b'{"users": {"a": 1}, "projects": [}']))
+
+    def test_read_incomplete(self):
+        """Test reading truncated data (should fail)"""
+        with self.assertRaises(ValueError):
+            list(RemoteDataReader(get_chunks(self.data)[:-10]))
+
+
+@override_settings(
+    PROJECTROLES_REMOTE_RETRIES=2,
+    PROJECTROLES_REMOTE_RETRY_BACKOFF=0,
+    PROJECTROLES_REMOTE_READ_TIMEOUT=5,
+)
+class TestGetSourceData(RemoteSiteMixin, TestCase):
+    """Tests for the get_source_data() API function"""
+
+    def setUp(self):
+        self.server = SourceSiteServer()
+        self.server_thread = threading.Thread(target=self.server.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+
+        self.source_site = self._make_site(
+            name=SOURCE_SITE_NAME,
+            url=self.server.url,
+            mode=SITE_MODE_SOURCE,
+            description=SOURCE_SITE_DESC,
+            secret=SOURCE_SITE_SECRET,
+        )
+        self.remote_api = RemoteProjectAPI()
+        reset_remote_session()
+
+    def tearDown(self):
+        reset_remote_session()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_get(self):
+        """Test retrieving data from a source site"""
+        remote_data = self.remote_api.get_source_data(self.source_site)
+
+        self.assertEqual(remote_data, {'users': {}, 'projects': {}})
+        self.assertEqual(len(self.server.request_log), 1)
+        request = self.server.request_log[0]
+        self.assertEqual(
+            request['path'],
+            reverse(
+                'projectroles:api_remote_get',
+                kwargs={'secret': SOURCE_SITE_SECRET},
+            ),
+        )
+        self.assertIn('gzip', request['headers']['Accept-Encoding'])
+        self.assertIn('deflate', request['headers']['Accept-Encoding'])
+
+    def test_get_since(self):
+        """Test retrieving data with a sync token"""
+        since = timezone.now().isoformat()
+        self.remote_api.get_source_data(self.source_site, since=since)
+
+        self.assertIn(
+            urlencode({'since': since}), self.server.request_log[0]['path']
+        )
+
+    def test_get_keep_alive(self):
+        """Test reusing the connection for subsequent requests"""
+        self.remote_api.get_source_data(self.source_site)
+        self.remote_api.get_source_data(self.source_site)
+
+        self.assertEqual(len(self.server.request_log), 2)
+        self.assertEqual(
+            self.server.request_log[0]['client_address'],
+            self.server.request_log[1]['client_address'],
+        )
+
+    def test_get_stream(self):
+        """Test retrieving data from a source site as a stream"""
+        chunks = self.remote_api.get_source_stream(self.source_site)
+
+        self.assertEqual(
+            list(RemoteDataReader(chunks)),
+            [],  # No users or projects in stand-in data
+        )
+        self.assertIn(
+            'gzip', self.server.request_log[0]['headers']['Accept-Encoding']
+        )
+
+    def test_get_etag(self):
+        """Test retrieving data with an ETag"""
+        self.server.etag = '"0123456789abcdef"'
+        remote_data = self.remote_api.get_source_data(
+            self.source_site, etag='"fedcba9876543210"'
+        )
+
+        self.assertEqual(remote_data, {'users': {}, 'projects': {}})
+        self.assertEqual(
+            self.server.request_log[0]['headers']['If-None-Match'],
+            '"fedcba9876543210"',
+        )
+        self.assertEqual(self.remote_api.source_etag, '"0123456789abcdef"')
+
+    def test_get_not_modified(self):
+        """Test retrieving unchanged data with an ETag"""
+        self.server.etag = '"0123456789abcdef"'
+        self.server.responses = [(304, None)]
+
+        self.assertIsNone(
+            self.remote_api.get_source_data(
+                self.source_site, etag=self.server.etag
+            )
+        )
+        self.assertIsNone(
+            self.remote_api.get_source_stream(
+                self.source_site, etag=self.server.etag
+            )
+        )
+        self.assertEqual(len(self.server.request_log), 2)
+        self.assertEqual(
+            self.server.request_log[0]['client_address'],
+            self.server.request_log[1]['client_address'],
+        )
+
+    def test_get_retry(self):
+        """Test retrying after temporary source site errors"""
+        self.server.responses = [
+            (503, {}),
+            (503, {}),
+            (200, {'users': {}, 'projects': {}}),
+        ]
+        remote_data = self.remote_api.get_source_data(self.source_site)
+
+        self.assertEqual(remote_data, {'users': {}, 'projects': {}})
+        self.assertEqual(len(self.server.request_log), 3)
+
+    def test_get_retry_exceeded(self):
+        """Test retrieving data with persistent errors (should fail)"""
+        self.server.responses = [(503, {})]
+
+        with self.assertRaises(requests.exceptions.RequestException):
+            self.remote_api.get_source_data(self.source_site)
+
+        self.assertEqual(len(self.server.request_log), 3)
+
+    def test_get_error(self):
+        """Test retrieving data with an unauthorized response (should fail)"""
+        self.server.responses = [(401, 'Remote site not found, unauthorized')]
+
+        with self.assertRaises(requests.exceptions.HTTPError):
+            self.remote_api.get_source_data(self.source_site)
+
+        self.assertEqual(len(self.server.request_log), 1)
+
+    @override_settings(
+        PROJECTROLES_REMOTE_RETRIES=0, PROJECTROLES_REMOTE_READ_TIMEOUT=0.1
+    )
+    def test_get_timeout(self):
+        """Test retrieving data from an unresponsive site (should fail)"""
+        reset_remote_session()
+        self.server.delay = 1
+
+        with self.assertRaises(requests.exceptions.RequestException):
+            self.remote_api.get_source_data(self.source_site)
+
 
 class TestGetTargetData(
     ProjectMixin,
@@ -144,6 +469,7 @@ class TestGetTargetData(
         sync_data = self.remote_api.get_target_data(self.target_site)
 
         expected = {
+            'sync_token': sync_data['sync_token'],
             'users': {},
             'projects': {
                 str(self.project.sodar_uuid): {
@@ -168,6 +494,7 @@ class TestGetTargetData(
         sync_data = self.remote_api.get_target_data(self.target_site)
 
         expected = {
+            'sync_token': sync_data['sync_token'],
             'users': {},
             'projects': {
                 str(self.category.sodar_uuid): {
@@ -210,6 +537,7 @@ class TestGetTargetData(
         self.maxDiff = None  # DEBUG
 
         expected = {
+            'sync_token': sync_data['sync_token'],
             'users': {},
             'projects': {
                 str(self.category.sodar_uuid): {
@@ -252,6 +580,7 @@ class TestGetTargetData(
         sync_data = self.remote_api.get_target_data(self.target_site)
 
         expected = {
+            'sync_token': sync_data['sync_token'],
             'users': {
                 str(self.user_source.sodar_uuid): {
                     'username': self.user_source.username,
@@ -296,13 +625,340 @@ class TestGetTargetData(
 
         self.assertEqual(sync_data, expected)
 
+    def _make_read_roles_projects(self, project_count, role_count):
+        """Make projects with READ_ROLES access and roles in a new category"""
+        category = self._make_project(
+            str(uuid.uuid4()), PROJECT_TYPE_CATEGORY, self.category
+        )
+        self._make_assignment(category, self.user_source, self.role_owner)
+
+        for i in range(project_count):
+            project = self._make_project(
+                'Project {}'.format(i), PROJECT_TYPE_PROJECT, category
+            )
+            self._make_assignment(project, self.user_source, self.role_owner)
+
+            for j in range(role_count):
+                user = self.make_user(
+                    'user_{}_{}_{}@{}'.format(
+                        category.pk, i, j, SOURCE_USER_DOMAIN
+                    )
+                )
+                self._make_assignment(project, user, self.role_contributor)
+
+            self._make_remote_project(
+                project_uuid=project.sodar_uuid,
+                site=self.target_site,
+                level=REMOTE_LEVEL_READ_ROLES,
+            )
+
+    def test_query_count(self):
+        """Test get data query count not growing with projects and roles"""
+        self._make_read_roles_projects(2, 2)
+
+        with CaptureQueriesContext(connection) as small_ctx:
+            self.remote_api.get_target_data(self.target_site)
+
+        self._make_read_roles_projects(5, 4)
+
+        with CaptureQueriesContext(connection) as large_ctx:
+            sync_data = self.remote_api.get_target_data(self.target_site)
+
+        self.assertEqual(len(sync_data['projects']), 10)
+        self.assertEqual(len(sync_data['users']), 25)
+        self.assertEqual(len(large_ctx), len(small_ctx))
+
     def test_no_access(self):
         """Test get data with no project access set in the source site"""
         sync_data = self.remote_api.get_target_data(self.target_site)
 
-        expected = {'users': {}, 'projects': {}}
+        expected = {
+            'sync_token': sync_data['sync_token'],
+            'users': {},
+            'projects': {},
+        }
+
+        self.assertEqual(sync_data, expected)
+
+    def test_sync_token(self):
+        """Test the sync token returned with data"""
+        sync_data = self.remote_api.get_target_data(self.target_site)
+        sync_date = dateparse.parse_datetime(sync_data['sync_token'])
+        self.assertIsNotNone(sync_date)
+        self.assertLessEqual(sync_date, timezone.now())
+
+    def test_since_unchanged(self):
+        """Test get data since a sync token with no changes"""
+        self._make_remote_project(
+            project_uuid=self.project.sodar_uuid,
+            site=self.target_site,
+            level=REMOTE_LEVEL_READ_ROLES,
+        )
+        since = (
+            timezone.now() + SYNC_TOKEN_OVERLAP + timedelta(seconds=1)
+        ).isoformat()
+
+        sync_data = self.remote_api.get_target_data(
+            self.target_site, since=since
+        )
+
+        self.assertEqual(sync_data['users'], {})
+        self.assertEqual(sync_data['projects'], {})
+
+    def test_since_role_changed(self):
+        """Test get data since a sync token with a modified role"""
+        self._make_remote_project(
+            project_uuid=self.project.sodar_uuid,
+            site=self.target_site,
+            level=REMOTE_LEVEL_READ_ROLES,
+        )
+        since = timezone.now() + SYNC_TOKEN_OVERLAP
+        Project.objects.all().update(date_modified=since - timedelta(days=1))
+        new_user = self.make_user('new_user@' + SOURCE_USER_DOMAIN)
+        new_as = self._make_assignment(self.project, new_user, self.role_guest)
+
+        sync_data = self.remote_api.get_target_data(
+            self.target_site, since=since.isoformat()
+        )
+
+        self.assertEqual(
+            sorted(sync_data['projects'].keys()),
+            sorted(
+                [str(self.category.sodar_uuid), str(self.project.sodar_uuid)]
+            ),
+        )
+        self.assertIn(
+            str(new_as.sodar_uuid),
+            sync_data['projects'][str(self.project.sodar_uuid)]['roles'],
+        )
+        self.assertIn(str(new_user.sodar_uuid), sync_data['users'])
+
+    def test_since_user_changed(self):
+        """Test get data since a sync token with a modified user"""
+        self._make_remote_project(
+            project_uuid=self.project.sodar_uuid,
+            site=self.target_site,
+            level=REMOTE_LEVEL_READ_ROLES,
+        )
+        since = timezone.now() + SYNC_TOKEN_OVERLAP
+        Project.objects.all().update(date_modified=since - timedelta(days=1))
+        self.user_source.email = 'new_email@example.com'
+        self.user_source.save()
+
+        sync_data = self.remote_api.get_target_data(
+            self.target_site, since=since.isoformat()
+        )
+
+        self.assertIn(str(self.project.sodar_uuid), sync_data['projects'])
+        self.assertIn(str(self.user_source.sodar_uuid), sync_data['users'])
+
+    def test_since_user_login(self):
+        """Test get data since a sync token with a user saved on login"""
+        self._make_remote_project(
+            project_uuid=self.project.sodar_uuid,
+            site=self.target_site,
+            level=REMOTE_LEVEL_READ_ROLES,
+        )
+        since = timezone.now() + SYNC_TOKEN_OVERLAP
+        Project.objects.all().update(date_modified=since - timedelta(days=1))
+        self.user_source.last_login = timezone.now()
+        self.user_source.save()
+
+        sync_data = self.remote_api.get_target_data(
+            self.target_site, since=since.isoformat()
+        )
+
+        self.assertEqual(sync_data['projects'], {})
+
+    def test_since_category_changed(self):
+        """Test get data since a sync token with a modified parent category"""
+        self._make_remote_project(
+            project_uuid=self.project.sodar_uuid,
+            site=self.target_site,
+            level=REMOTE_LEVEL_READ_INFO,
+        )
+        since = timezone.now() + SYNC_TOKEN_OVERLAP
+        Project.objects.all().update(date_modified=since - timedelta(days=1))
+        Project.objects.filter(pk=self.category.pk).update(
+            date_modified=since + timedelta(seconds=1)
+        )
+
+        sync_data = self.remote_api.get_target_data(
+            self.target_site, since=since.isoformat()
+        )
+
+        self.assertIn(str(self.project.sodar_uuid), sync_data['projects'])
+
+    def test_since_invalid(self):
+        """Test get data with an invalid sync token (should fail)"""
+        with self.assertRaises(ValueError):
+            self.remote_api.get_target_data(
+                self.target_site, since='Not a token'
+            )
+
+
+class TestGetTargetPayload(
+    ProjectMixin,
+    RoleAssignmentMixin,
+    RemoteSiteMixin,
+    RemoteProjectMixin,
+    SodarUserMixin,
+    TestCase,
+):
+    """Tests for the get_target_payload() API function"""
 
+    def setUp(self):
+        self.role_owner = Role.objects.get_or_create(name=PROJECT_ROLE_OWNER)[0]
+        self.role_guest = Role.objects.get_or_create(name=PROJECT_ROLE_GUEST)[0]
+        self.user_source = self._make_sodar_user(
+            username=SOURCE_USER_USERNAME,
+            name=SOURCE_USER_NAME,
+            first_name=SOURCE_USER_FIRST_NAME,
+            last_name=SOURCE_USER_LAST_NAME,
+            email=SOURCE_USER_EMAIL,
+        )
+        self.category = self._make_project(
+            SOURCE_CATEGORY_TITLE, PROJECT_TYPE_CATEGORY, None
+        )
+        self.project = self._make_project(
+            SOURCE_PROJECT_TITLE, PROJECT_TYPE_PROJECT, self.category
+        )
+        self._make_assignment(self.category, self.user_source, self.role_owner)
+        self._make_assignment(self.project, self.user_source, self.role_owner)
+        self.target_site = self._make_site(
+            name=TARGET_SITE_NAME,
+            url=TARGET_SITE_URL,
+            mode=SITE_MODE_TARGET,
+            description=TARGET_SITE_DESC,
+            secret=TARGET_SITE_SECRET,
+        )
+        self._make_remote_project(
+            project_uuid=self.project.sodar_uuid,
+            site=self.target_site,
+            level=REMOTE_LEVEL_READ_ROLES,
+        )
+        self.remote_api = RemoteProjectAPI()
+        cache.clear()
+
+    def _make_target_site(self, level):
+        """Make another target site with access to the project"""
+        site = self._make_site(
+            name=TARGET_SITE_NAME + ' ' + level,
+            url=TARGET_SITE_URL + '/' + level.lower(),
+            mode=SITE_MODE_TARGET,
+            description=TARGET_SITE_DESC,
+            secret=build_secret(),
+        )
+        self._make_remote_project(
+            project_uuid=self.project.sodar_uuid, site=site, level=level
+        )
+        return site
+
+    def test_get(self):
+        """Test getting the payload"""
+        data, etag = self.remote_api.get_target_payload(self.target_site)
+
+        sync_data = json.loads(data.decode('utf-8'))
+        expected = self.remote_api.get_target_data(self.target_site)
+        expected['sync_token'] = sync_data['sync_token']
         self.assertEqual(sync_data, expected)
+        self.assertTrue(etag.startswith('"') and etag.endswith('"'))
+
+    def test_get_cached(self):
+        """Test getting the cached payload without database queries"""
+        payload = self.remote_api.get_target_payload(self.target_site)
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(
+                self.remote_api.get_target_payload(self.target_site), payload
+            )
+
+        self.assertEqual(len(ctx), 0)
+
+    def test_get_shared(self):
+        """Test sharing the payload between sites with identical access"""
+        site = self._make_target_site(REMOTE_LEVEL_READ_ROLES)
+        payload = self.remote_api.get_target_payload(self.target_site)
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.remote_api.get_target_payload(site), payload)
+
+        self.assertEqual(len(ctx), 1)  # Only access levels are queried
+
+    def test_get_different_access(self):
+        """Test payload not shared between sites with different access"""
+        site = self._make_target_site(REMOTE_LEVEL_READ_INFO)
+        data, etag = self.remote_api.get_target_payload(self.target_site)
+        site_data, site_etag = self.remote_api.get_target_payload(site)
+
+        self.assertNotEqual(site_etag, etag)
+        self.assertNotIn(b'"roles"', site_data)
+
+    def test_get_role_changed(self):
+        """Test getting the payload after a role change"""
+        data, etag = self.remote_api.get_target_payload(self.target_site)
+        new_user = self.make_user('new_user@' + SOURCE_USER_DOMAIN)
+        new_as = self._make_assignment(self.project, new_user, self.role_guest)
+
+        new_data, new_etag = self.remote_api.get_target_payload(
+            self.target_site
+        )
+
+        self.assertNotEqual(new_etag, etag)
+        self.assertIn(str(new_as.sodar_uuid).encode('utf-8'), new_data)
+
+    def test_get_project_changed(self):
+        """Test getting the payload after a project change"""
+        data, etag = self.remote_api.get_target_payload(self.target_site)
+        self.category.description = 'Updated description'
+        self.category.save()
+
+        new_data, new_etag = self.remote_api.get_target_payload(
+            self.target_site
+        )
+
+        self.assertNotEqual(new_etag, etag)
+        self.assertIn(b'Updated description', new_data)
+
+    def test_get_user_changed(self):
+        """Test getting the payload after a user change"""
+        data, etag = self.remote_api.get_target_payload(self.target_site)
+        self.user_source.email = 'updated@' + SOURCE_USER_DOMAIN
+        self.user_source.save()
+
+        new_data, new_etag = self.remote_api.get_target_payload(
+            self.target_site
+        )
+
+        self.assertNotEqual(new_etag, etag)
+        self.assertIn(self.user_source.email.encode('utf-8'), new_data)
+
+    def test_get_user_login(self):
+        """Test getting the payload after a user is saved on login"""
+        data, etag = self.remote_api.get_target_payload(self.target_site)
+        self.user_source.last_login = timezone.now()
+        self.user_source.save()
+
+        with CaptureQueriesContext(connection) as ctx:
+            new_data, new_etag = self.remote_api.get_target_payload(
+                self.target_site
+            )
+
+        self.assertEqual(len(ctx), 0)
+        self.assertEqual(new_etag, etag)
+
+    def test_get_unrelated_change(self):
+        """Test ETag after a change not affecting the target site"""
+        data, etag = self.remote_api.get_target_payload(self.target_site)
+        self._make_project('Other', PROJECT_TYPE_PROJECT, None)
+
+        with CaptureQueriesContext(connection) as ctx:
+            new_data, new_etag = self.remote_api.get_target_payload(
+                self.target_site
+            )
+
+        self.assertNotEqual(len(ctx), 0)  # Payload is rebuilt
+        self.assertEqual(new_etag, etag)
 
 
 class TestSyncSourceData(
@@ -818,6 +1474,63 @@ class TestSyncSourceData(
 
         self.assertEqual(remote_data, expected)
 
+    @override_settings(PROJECTROLES_SITE_MODE=SITE_MODE_TARGET)
+    def test_update_category_title(self):
+        """Test sync with a renamed category and updated child projects"""
+        remote_data = self.default_data
+        sub_uuid = str(uuid.uuid4())
+        remote_data['projects'][sub_uuid] = {
+            'title': 'SubCategory',
+            'type': PROJECT_TYPE_CATEGORY,
+            'level': REMOTE_LEVEL_READ_ROLES,
+            'parent_uuid': SOURCE_CATEGORY_UUID,
+            'description': SOURCE_PROJECT_DESCRIPTION,
+            'readme': SOURCE_PROJECT_README,
+            'roles': {},
+        }
+        remote_data['projects'][SOURCE_PROJECT_UUID]['parent_uuid'] = sub_uuid
+        sub_project_uuid = str(uuid.uuid4())
+        remote_data['projects'][sub_project_uuid] = dict(
+            remote_data['projects'][SOURCE_PROJECT_UUID],
+            title='OtherProject',
+            parent_uuid=SOURCE_CATEGORY_UUID,
+            roles={},
+        )
+        self.remote_api.sync_source_data(
+            self.source_site, deepcopy(remote_data)
+        )
+
+        # Rename category and update descriptions of both child projects
+        remote_data['projects'][SOURCE_CATEGORY_UUID]['title'] = 'NewTitle'
+        remote_data['projects'][SOURCE_PROJECT_UUID][
+            'description'
+        ] = 'Updated description'
+        remote_data['projects'][sub_project_uuid][
+            'description'
+        ] = 'Updated description'
+        self.remote_api.sync_source_data(
+            self.source_site, deepcopy(remote_data)
+        )
+
+        project = Project.objects.get(sodar_uuid=SOURCE_PROJECT_UUID)
+        self.assertEqual(project.description, 'Updated description')
+        self.assertEqual(
+            project.full_title,
+            'NewTitle / SubCategory / {}'.format(SOURCE_PROJECT_TITLE),
+        )
+        self.assertEqual(
+            project.search_text,
+            'newtitle / subcategory / {}\nupdated description'.format(
+                SOURCE_PROJECT_TITLE.lower()
+            ),
+        )
+        project = Project.objects.get(sodar_uuid=sub_project_uuid)
+        self.assertEqual(project.full_title, 'NewTitle / OtherProject')
+        self.assertEqual(
+            Project.objects.get(sodar_uuid=sub_uuid).full_title,
+            'NewTitle / SubCategory',
+        )
+
     @override_settings(PROJECTROLES_SITE_MODE=SITE_MODE_TARGET)
     def test_delete_role(self):
         """Test sync with existing project data and a removed role"""
@@ -1080,6 +1793,440 @@ class TestSyncSourceData(
         # Assert no changes between update_data and remote_data
         self.assertEqual(original_data, remote_data)
 
+    def _get_role_data(self, role_count):
+        """Return new remote data with a number of contributor roles"""
+        category_uuid = str(uuid.uuid4())
+        project_uuid = str(uuid.uuid4())
+        remote_data = deepcopy(self.default_data)
+        remote_data['projects'] = {
+            category_uuid: remote_data['projects'][SOURCE_CATEGORY_UUID],
+            project_uuid: remote_data['projects'][SOURCE_PROJECT_UUID],
+        }
+        remote_data['projects'][category_uuid]['title'] = category_uuid
+        remote_data['projects'][category_uuid]['roles'] = {
+            str(uuid.uuid4()): {
+                'user': SOURCE_USER_USERNAME,
+                'role': self.role_owner.name,
+            }
+        }
+        remote_data['projects'][project_uuid]['parent_uuid'] = category_uuid
+        remote_data['projects'][project_uuid]['roles'] = {
+            str(uuid.uuid4()): {
+                'user': SOURCE_USER_USERNAME,
+                'role': self.role_owner.name,
+            }
+        }
+
+        for i in range(role_count):
+            user_uuid = str(uuid.uuid4())
+            username = 'user_{}@{}'.format(user_uuid, SOURCE_USER_DOMAIN)
+            remote_data['users'][user_uuid] = {
+                'sodar_uuid': user_uuid,
+                'username': username,
+                'name': SOURCE_USER_NAME,
+                'first_name': SOURCE_USER_FIRST_NAME,
+                'last_name': SOURCE_USER_LAST_NAME,
+                'email': SOURCE_USER_EMAIL,
+                'groups': [SOURCE_USER_GROUP],
+            }
+            remote_data['projects'][project_uuid]['roles'][
+                str(uuid.uuid4())
+            ] = {'user': username, 'role': self.role_contributor.name}
+
+        return remote_data
+
+    @override_settings(PROJECTROLES_SITE_MODE=SITE_MODE_TARGET)
+    def test_create_query_count(self):
+        """Test sync query count not growing with the number of roles"""
+        self.remote_api.timeline = None  # Only count sync queries
+        self.remote_api.sync_source_data(self.source_site, self.default_data)
+
+        with CaptureQueriesContext(connection) as small_ctx:
+            self.remote_api.sync_source_data(
+                self.source_site, self._get_role_data(2)
+            )
+
+        with CaptureQueriesContext(connection) as large_ctx:
+            self.remote_api.sync_source_data(
+                self.source_site, self._get_role_data(20)
+            )
+
+        self.assertEqual(RoleAssignment.objects.all().count(), 28)
+        self.assertEqual(len(large_ctx), len(small_ctx))
+
+    def _get_payload(self, project_count, role_count):
+        """Return a generator of JSON data for a number of projects and roles
+        without keeping the data in memory"""
+        category_uuid = str(uuid.uuid4())
+
+        def _get_username(p, r):
+            return 'user_{}_{}_{}@{}'.format(
+                category_uuid, p, r, SOURCE_USER_DOMAIN
+            )
+
+        yield '{{"users": {{{}: {}'.format(
+            json.dumps(SOURCE_USER_UUID),
+            json.dumps(self.default_data['users'][SOURCE_USER_UUID]),
+        )
+
+        for p in range(project_count):
+            for r in range(role_count):
+                user_uuid = str(uuid.uuid4())
+                user_data = deepcopy(
+                    self.default_data['users'][SOURCE_USER_UUID]
+                )
+                user_data['sodar_uuid'] = user_uuid
+                user_data['username'] = _get_username(p, r)
+                yield ', {}: {}'.format(
+                    json.dumps(user_uuid), json.dumps(user_data)
+                )
+
+        yield '}, "projects": {'
+        category_data = deepcopy(
+            self.default_data['projects'][SOURCE_CATEGORY_UUID]
+        )
+        category_data['title'] = category_uuid
+        category_data['roles'] = {
+            str(uuid.uuid4()): {
+                'user': SOURCE_USER_USERNAME,
+                'role': self.role_owner.name,
+            }
+        }
+        yield '{}: {}'.format(
+            json.dumps(category_uuid), json.dumps(category_data)
+        )
+
+        for p in range(project_count):
+            project_data = deepcopy(
+                self.default_data['projects'][SOURCE_PROJECT_UUID]
+            )
+            project_data['title'] = 'Project {}'.format(p)
+            project_data['parent_uuid'] = category_uuid
+            project_data['roles'] = {
+                str(uuid.uuid4()): {
+                    'user': _get_username(p, r),
+                    'role': self.role_contributor.name,
+                }
+                for r in range(role_count)
+            }
+            project_data['roles'][str(uuid.uuid4())] = {
+                'user': SOURCE_USER_USERNAME,
+                'role': self.role_owner.name,
+            }
+            yield ', {}: {}'.format(
+                json.dumps(str(uuid.uuid4())), json.dumps(project_data)
+            )
+
+        yield '}}'
+
+    @override_settings(PROJECTROLES_SITE_MODE=SITE_MODE_TARGET)
+    def test_create_stream(self):
+        """Test sync with data read as a stream"""
+        remote_data = self.default_data
+        remote_data['sync_token'] = timezone.now().isoformat()
+
+        update_data = self.remote_api.sync_source_stream(
+            self.source_site, get_chunks(remote_data, size=16)
+        )
+
+        self.assertEqual(Project.objects.all().count(), 2)
+        self.assertEqual(RoleAssignment.objects.all().count(), 2)
+        self.assertEqual(User.objects.all().count(), 2)
+        self.assertEqual(RemoteProject.objects.all().count(), 2)
+        self.assertEqual(
+            update_data['users'][SOURCE_USER_UUID]['status'], 'created'
+        )
+        self.assertEqual(
+            update_data['projects'][SOURCE_CATEGORY_UUID]['status'], 'created'
+        )
+        self.assertEqual(
+            update_data['projects'][SOURCE_PROJECT_UUID]['roles'][
+                SOURCE_PROJECT_ROLE_UUID
+            ]['status'],
+            'created',
+        )
+        self.source_site.refresh_from_db()
+        self.assertEqual(self.source_site.sync_token, remote_data['sync_token'])
+
+    @override_settings(PROJECTROLES_SITE_MODE=SITE_MODE_TARGET)
+    def test_dry_run_create(self):
+        """Test dry run with non-existing project data"""
+        remote_data = self.default_data
+        remote_data['sync_token'] = timezone.now().isoformat()
+        event_count = ProjectEvent.objects.all().count()
+
+        self.remote_api.sync_source_data(
+            self.source_site, remote_data, dry_run=True
+        )
+
+        self.assertEqual(
+            remote_data['users'][SOURCE_USER_UUID]['status'], 'created'
+        )
+        for p_uuid, r_uuid in [
+            (SOURCE_CATEGORY_UUID, SOURCE_CATEGORY_ROLE_UUID),
+            (SOURCE_PROJECT_UUID, SOURCE_PROJECT_ROLE_UUID),
+        ]:
+            self.assertEqual(
+                remote_data['projects'][p_uuid]['status'], 'created'
+            )
+            self.assertEqual(
+                remote_data['projects'][p_uuid]['roles'][r_uuid]['status'],
+                'created',
+            )
+
+        self.assertEqual(Project.objects.all().count(), 0)
+        self.assertEqual(RoleAssignment.objects.all().count(), 0)
+        self.assertEqual(User.objects.all().count(), 1)
+        self.assertEqual(RemoteProject.objects.all().count(), 0)
+        self.assertEqual(ProjectEvent.objects.all().count(), event_count)
+        self.source_site.refresh_from_db()
+        self.assertIsNone(self.source_site.sync_token)
+
+    @override_settings(PROJECTROLES_SITE_MODE=SITE_MODE_TARGET)
+    def test_dry_run_update(self):
+        """Test dry run with changes to synchronized project data"""
+        guest_user = self.make_user('guest@' + SOURCE_USER_DOMAIN)
+        guest_role_uuid = str(uuid.uuid4())
+        remote_data = self.default_data
+        remote_data['projects'][SOURCE_PROJECT_UUID]['roles'][
+            guest_role_uuid
+        ] = {'user': guest_user.username, 'role': self.role_guest.name}
+        self.remote_api.sync_source_data(
+            self.source_site, deepcopy(remote_data)
+        )
+        event_count = ProjectEvent.objects.all().count()
+
+        # Update title, remove guest and add a new user
+        new_user_uuid = str(uuid.uuid4())
+        new_role_uuid = str(uuid.uuid4())
+        new_user_data = dict(
+            remote_data['users'][SOURCE_USER_UUID],
+            sodar_uuid=new_user_uuid,
+            username='newuser@' + SOURCE_USER_DOMAIN,
+        )
+        remote_data['users'][new_user_uuid] = new_user_data
+        p_data = remote_data['projects'][SOURCE_PROJECT_UUID]
+        p_data['title'] = 'UpdatedTitle'
+        p_data['roles'].pop(guest_role_uuid)
+        p_data['roles'][new_role_uuid] = {
+            'user': new_user_data['username'],
+            'role': self.role_contributor.name,
+        }
+
+        update_data = self.remote_api.sync_source_stream(
+            self.source_site, get_chunks(remote_data, 100), dry_run=True
+        )
+
+        self.assertEqual(list(update_data['users'].keys()), [new_user_uuid])
+        self.assertEqual(
+            update_data['users'][new_user_uuid]['status'], 'created'
+        )
+        p_update = update_data['projects'][SOURCE_PROJECT_UUID]
+        self.assertEqual(p_update['status'], 'updated')
+        self.assertEqual(
+            sorted(
+                (r['user'], r['status']) for r in p_update['roles'].values()
+            ),
+            [
+                (guest_user.username, 'deleted'),
+                (new_user_data['username'], 'created'),
+            ],
+        )
+        self.assertNotIn(SOURCE_CATEGORY_UUID, update_data['projects'])
+
+        # Assert database status
+        self.assertEqual(
+            Project.objects.get(sodar_uuid=SOURCE_PROJECT_UUID).title,
+            SOURCE_PROJECT_TITLE,
+        )
+        self.assertTrue(
+            RoleAssignment.objects.filter(
+                project__sodar_uuid=SOURCE_PROJECT_UUID, user=guest_user
+            ).exists()
+        )
+        self.assertFalse(
+            User.objects.filter(username=new_user_data['username']).exists()
+        )
+        self.assertEqual(ProjectEvent.objects.all().count(), event_count)
+
+    @override_settings(PROJECTROLES_SITE_MODE=SITE_MODE_TARGET)
+    def test_sync_etag(self):
+        """Test storing the ETag of the source site data"""
+        remote_data = self.default_data
+        remote_data['sync_token'] = timezone.now().isoformat()
+        self.remote_api.source_etag = '"0123456789abcdef"'
+
+        self.remote_api.sync_source_data(self.source_site, remote_data)
+
+        self.source_site.refresh_from_db()
+        self.assertEqual(self.source_site.sync_etag, '"0123456789abcdef"')
+
+    @override_settings(PROJECTROLES_SITE_MODE=SITE_MODE_TARGET)
+    def test_create_stream_no_changes(self):
+        """Test sync with unchanged data read as a stream"""
+        self.remote_api.sync_source_data(
+            self.source_site, deepcopy(self.default_data)
+        )
+
+        update_data = self.remote_api.sync_source_stream(
+            self.source_site, get_chunks(self.default_data, size=16)
+        )
+
+        self.assertEqual(update_data, {'users': {}, 'projects': {}})
+
+    @override_settings(
+        PROJECTROLES_SITE_MODE=SITE_MODE_TARGET,
+        PROJECTROLES_REMOTE_SYNC_CHUNK_SIZE=5,
+    )
+    def test_create_chunks(self):
+        """Test sync with data synchronized in multiple chunks"""
+        self.remote_api.sync_source_stream(
+            self.source_site,
+            (c.encode('utf-8') for c in self._get_payload(4, 3)),
+        )
+
+        self.assertEqual(Project.objects.all().count(), 5)
+        self.assertEqual(RoleAssignment.objects.all().count(), 17)
+        self.assertEqual(User.objects.all().count(), 14)
+        self.assertEqual(RemoteProject.objects.all().count(), 5)
+
+    @override_settings(
+        PROJECTROLES_SITE_MODE=SITE_MODE_TARGET,
+        PROJECTROLES_REMOTE_SYNC_CHUNK_SIZE=5,
+    )
+    def test_dry_run_chunks(self):
+        """Test dry run in multiple chunks matching the actual sync"""
+        chunks = [c.encode('utf-8') for c in self._get_payload(4, 3)]
+
+        def _get_changes(update_data):
+            return sorted(
+                [
+                    ('user', k, v['status'])
+                    for k, v in update_data['users'].items()
+                ]
+                + [
+                    ('project', k, v['status'])
+                    for k, v in update_data['projects'].items()
+                ]
+                + [
+                    ('role', k, r['status'])
+                    for v in update_data['projects'].values()
+                    for k, r in v['roles'].items()
+                ]
+            )
+
+        with CaptureQueriesContext(connection) as ctx:
+            dry_run_data = self.remote_api.sync_source_stream(
+                self.source_site, chunks, dry_run=True
+            )
+
+        self.assertEqual(
+            [
+                q['sql']
+                for q in ctx.captured_queries
+                if q['sql'].startswith(('INSERT', 'UPDATE', 'DELETE'))
+            ],
+            [],
+        )
+        self.assertEqual(Project.objects.all().count(), 0)
+        self.assertEqual(User.objects.all().count(), 1)
+
+        sync_data = self.remote_api.sync_source_stream(self.source_site, chunks)
+        self.assertEqual(len(_get_changes(dry_run_data)), 35)
+        self.assertEqual(_get_changes(dry_run_data), _get_changes(sync_data))
+
+    @override_settings(
+        PROJECTROLES_SITE_MODE=SITE_MODE_TARGET,
+        PROJECTROLES_REMOTE_SYNC_CHUNK_SIZE=5,
+    )
+    def test_create_progress(self):
+        """Test reporting sync progress for each chunk"""
+        progress = []
+        self.remote_api.sync_source_stream(
+            self.source_site,
+            (c.encode('utf-8') for c in self._get_payload(4, 3)),
+            progress=lambda phase, count: progress.append((phase, count)),
+        )
+
+        self.assertEqual(
+            [p for p in progress if p[0] == 'users'],
+            [('users', 5), ('users', 10), ('users', 13)],
+        )
+        self.assertEqual(
+            [p for p in progress if p[0] != 'users'],
+            [
+                ('categories', 1),
+                ('projects', 1),
+                ('roles', 4),
+                ('projects', 2),
+                ('roles', 8),
+                ('projects', 3),
+                ('roles', 12),
+                ('projects', 4),
+                ('roles', 16),
+            ],
+        )
+
+    @override_settings(
+        PROJECTROLES_SITE_MODE=SITE_MODE_TARGET,
+        PROJECTROLES_REMOTE_SYNC_CHUNK_SIZE=100,
+    )
+    def test_create_stream_memory(self):
+        """Test sync memory use not growing with the size of data"""
+        self.remote_api.timeline = None  # Only measure sync
+
+        def _get_peak(project_count, role_count):
+            tracemalloc.start()
+            self.remote_api.sync_source_stream(
+                self.source_site,
+                (
+                    c.encode('utf-8')
+                    for c in self._get_payload(project_count, role_count)
+                ),
+                updates=False,
+            )
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return peak
+
+        # Warm up caches and lazy imports
+        self.remote_api.sync_source_data(
+            self.source_site, deepcopy(self.default_data)
+        )
+        small_peak = _get_peak(2, 50)
+        large_peak = _get_peak(40, 50)
+
+        self.assertEqual(RoleAssignment.objects.all().count(), 2146)
+        data_size = sum(len(c) for c in self._get_payload(40, 50))
+        self.assertLess(large_peak, data_size)
+        self.assertLess(large_peak, small_peak * 1.5)
+
+    @override_settings(PROJECTROLES_SITE_MODE=SITE_MODE_TARGET)
+    def test_sync_token(self):
+        """Test storing the sync token of the source site"""
+        remote_data = self.default_data
+        remote_data['sync_token'] = timezone.now().isoformat()
+        self.assertIsNone(self.source_site.sync_token)
+
+        self.remote_api.sync_source_data(self.source_site, remote_data)
+
+        self.source_site.refresh_from_db()
+        self.assertEqual(self.source_site.sync_token, remote_data['sync_token'])
+
+    @override_settings(PROJECTROLES_SITE_MODE=SITE_MODE_TARGET)
+    def test_sync_token_error(self):
+        """Test sync token not stored if sync fails for a role"""
+        remote_data = self.default_data
+        remote_data['sync_token'] = timezone.now().isoformat()
+        remote_data['projects'][SOURCE_PROJECT_UUID]['roles'][
+            str(uuid.uuid4())
+        ] = {'user': 'localusername', 'role': self.role_contributor.name}
+
+        self.remote_api.sync_source_data(self.source_site, remote_data)
+
+        self.source_site.refresh_from_db()
+        self.assertIsNone(self.source_site.sync_token)
+
     @override_settings(PROJECTROLES_SITE_MODE=SITE_MODE_TARGET)
     def test_create_local_user(self):
         """Test sync with a local non-owner user"""
@@ -1269,3 +2416,121 @@ class TestSyncSourceData(
         # Assert owner role
         new_project = Project.objects.get(sodar_uuid=SOURCE_PROJECT_UUID)
         self.assertEqual(new_project.get_owner().user, self.admin_user)
+
+
+@skipIf(not BENCHMARK_ENABLED, BENCHMARK_SKIP_MSG)
+class TestGetTargetDataBenchmark(
+    ProjectMixin, RemoteSiteMixin, SodarUserMixin, TestCase
+):
+    """Scaling benchmark for the get_target_data() API function"""
+
+    project_counts = [100, 1000, 10000]
+    roles_per_project = 10
+    user_count = 1000
+
+    def setUp(self):
+        self.role_owner = Role.objects.get_or_create(name=PROJECT_ROLE_OWNER)[0]
+        self.role_contributor = Role.objects.get_or_create(
+            name=PROJECT_ROLE_CONTRIBUTOR
+        )[0]
+        self.user_owner = self._make_sodar_user(
+            username=SOURCE_USER_USERNAME,
+            name=SOURCE_USER_NAME,
+            first_name=SOURCE_USER_FIRST_NAME,
+            last_name=SOURCE_USER_LAST_NAME,
+            email=SOURCE_USER_EMAIL,
+        )
+        self.users = User.objects.bulk_create(
+            [
+                User(username='user{}@{}'.format(i, SOURCE_USER_DOMAIN))
+                for i in range(self.user_count)
+            ]
+        )
+        self.category = self._make_project(
+            SOURCE_CATEGORY_TITLE, PROJECT_TYPE_CATEGORY, None
+        )
+        RoleAssignment.objects.create(
+            project=self.category, user=self.user_owner, role=self.role_owner
+        )
+        self.remote_api = RemoteProjectAPI()
+
+    def _make_site_data(self, project_count):
+        """Make a target site with READ_ROLES access to new projects"""
+        site = self._make_site(
+            name='Target {}'.format(project_count),
+            url=TARGET_SITE_URL,
+            mode=SITE_MODE_TARGET,
+            secret=build_secret(),
+        )
+        projects = Project.objects.bulk_create(
+            [
+                Project(
+                    title='Project {} {}'.format(project_count, i),
+                    type=PROJECT_TYPE_PROJECT,
+                    parent=self.category,
+                    parent_path=[self.category.pk],
+                )
+                for i in range(project_count)
+            ]
+        )
+        roles = []
+
+        for i, project in enumerate(projects):
+            roles.append(
+                RoleAssignment(
+                    project=project, user=self.user_owner, role=self.role_owner
+                )
+            )
+            roles += [
+                RoleAssignment(
+                    project=project,
+                    user=self.users[
+                        (i * self.roles_per_project + j) % self.user_count
+                    ],
+                    role=self.role_contributor,
+                )
+                for j in range(self.roles_per_project - 1)
+            ]
+
+        RoleAssignment.objects.bulk_create(roles)
+        RemoteProject.objects.bulk_create(
+            [
+                RemoteProject(
+                    project_uuid=p.sodar_uuid,
+                    project=p,
+                    site=site,
+                    level=REMOTE_LEVEL_READ_ROLES,
+                )
+                for p in projects
+            ]
+        )
+        return site
+
+    def test_scaling(self):
+        """Test get_target_data() time and queries with growing data"""
+        results = []
+
+        for project_count in self.project_counts:
+            site = self._make_site_data(project_count)
+
+            with CaptureQueriesContext(connection) as ctx:
+                start = time.monotonic()
+                sync_data = self.remote_api.get_target_data(site)
+                duration = time.monotonic() - start
+
+            self.assertEqual(len(sync_data['projects']), project_count + 1)
+            results.append((project_count, duration, len(ctx)))
+
+        timings = '; '.join(
+            '{} projects, {} roles: {:.2f} s, {} queries'.format(
+                r[0], r[0] * self.roles_per_project, r[1], r[2]
+            )
+            for r in results
+        )
+
+        # Assert constant queries and roughly linear time
+        self.assertEqual(len(set(r[2] for r in results)), 1, timings)
+
+        for prev, cur in zip(results, results[1:]):
+            scale = cur[0] / prev[0]
+            self.assertLess(cur[1], max(prev[1], 0.01) * scale * 3, timings)
@@ -1,14 +1,20 @@
 """Tests for views in the projectroles Django app"""
 
 import base64
+import gzip
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlencode
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.forms import HiddenInput
+from django.db import connection
 from django.forms.models import model_to_dict
 from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from test_plus.test import TestCase
@@ -31,7 +37,8 @@ from ..plugins import (
     get_active_plugins,
     ProjectAppPluginPoint,
 )
-from ..remote_projects import RemoteProjectAPI
+from ..remote_projects import RemoteProjectAPI, SYNC_TOKEN_OVERLAP
+from ..templatetags.projectroles_tags import get_project_list, INDENT_PX
 from ..utils import build_secret, get_display_name
 from .test_models import (
     ProjectMixin,
@@ -200,6 +207,26 @@ class TestViewsBase(TestCase):
         self.user.save()
 
 
+class SearchPluginMock:
+    """Mock app plugin for search tests"""
+
+    def __init__(self, name, delay=0, items=None):
+        self.name = name
+        self.title = name
+        self.delay = delay
+        self.items = items or []
+
+    def search(self, search_term, user, search_type=None, keywords=None):
+        time.sleep(self.delay)
+        return {
+            'all': {
+                'title': self.title,
+                'search_types': [],
+                'items': self.items,
+            }
+        }
+
+
 # General view tests -----------------------------------------------------------
 
 
@@ -230,6 +257,51 @@ class TestHomeView(ProjectMixin, RoleAssignmentMixin, TestViewsBase):
             response.context['project_list'][1].pk, self.project.pk
         )
 
+    def test_project_list(self):
+        """Test project list row data for a non-superuser"""
+        user = self.make_user('user_guest')
+        self._make_assignment(self.project, user, self.role_guest)
+        self._make_project('TestProjectTop', PROJECT_TYPE_PROJECT, None)
+        ProjectUserTag(
+            project=self.project, user=user, name=PROJECT_TAG_STARRED
+        ).save()
+        project_list = get_project_list(user)
+
+        self.assertEqual(project_list, [self.category, self.project])
+        self.assertEqual(project_list[0].list_indent, 0)
+        self.assertEqual(project_list[0].list_can_view, True)
+        self.assertEqual(project_list[0].list_starred, False)
+        self.assertEqual(project_list[1].list_indent, INDENT_PX)
+        self.assertEqual(project_list[1].list_starred, True)
+        self.assertEqual(project_list[1].list_role_html, 'Guest')
+
+    def test_project_list_parent(self):
+        """Test project list with a parent category"""
+        project_list = get_project_list(self.user, parent=self.category)
+        self.assertEqual(project_list, [self.project])
+        self.assertEqual(project_list[0].list_indent, 0)
+
+    def test_project_list_queries(self):
+        """Test project list query count with multiple projects"""
+        for i in range(10):
+            category = self._make_project(
+                'TestCategory{}'.format(i), PROJECT_TYPE_CATEGORY, None
+            )
+            project = self._make_project(
+                'TestProject{}'.format(i), PROJECT_TYPE_PROJECT, category
+            )
+            self._make_assignment(project, self.user, self.role_owner)
+
+        user = self.user
+        user.is_superuser = False
+
+        get_active_plugins()  # Ensure plugins are loaded
+
+        # NOTE: Includes filesfolders project list column queries
+        with self.assertNumQueries(5):
+            project_list = get_project_list(user)
+        self.assertEqual(len(project_list), 22)
+
 
 class TestProjectSearchView(ProjectMixin, RoleAssignmentMixin, TestViewsBase):
     """Tests for the project search view"""
@@ -295,6 +367,98 @@ class TestProjectSearchView(ProjectMixin, RoleAssignmentMixin, TestViewsBase):
             ),
         )
 
+    def test_render_keyword(self):
+        """Test rendering search results with a project keyword"""
+        other_category = self._make_project(
+            'OtherCategory', PROJECT_TYPE_CATEGORY, None
+        )
+        other_project = self._make_project(
+            'TestProjectOther', PROJECT_TYPE_PROJECT, other_category
+        )
+        self._make_assignment(other_project, self.user, self.role_owner)
+
+        with self.login(self.user):
+            response = self.client.get(
+                reverse('projectroles:search')
+                + '?'
+                + urlencode({'s': 'test parent:TestCategory'})
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.context['search_keywords'], {'parent': 'TestCategory'}
+        )
+        self.assertEqual(response.context['search_keyword_errors'], [])
+        self.assertEqual(response.context['search_projects'], True)
+        self.assertEqual(
+            list(response.context['project_results']), [self.project]
+        )
+        self.assertEqual(
+            [a['plugin'] for a in response.context['app_search_data']],
+            [
+                p
+                for p in self.plugins
+                if p.search_enable and 'parent' in p.search_keywords
+            ],
+        )
+
+    def test_render_keyword_owner(self):
+        """Test rendering search results with the owner keyword"""
+        other_user = self.make_user('other_user')
+        other_project = self._make_project(
+            'TestProjectOther', PROJECT_TYPE_PROJECT, self.category
+        )
+        self._make_assignment(other_project, other_user, self.role_owner)
+        self._make_assignment(other_project, self.user, self.role_contributor)
+
+        with self.login(self.user):
+            response = self.client.get(
+                reverse('projectroles:search')
+                + '?'
+                + urlencode({'s': 'test owner:{}'.format(self.user.username)})
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            list(response.context['project_results']), [self.project]
+        )
+
+    def test_render_keyword_app(self):
+        """Test rendering search results with a keyword only used by apps"""
+        with self.login(self.user):
+            response = self.client.get(
+                reverse('projectroles:search')
+                + '?'
+                + urlencode({'s': 'test flag:important'})
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['search_keyword_errors'], [])
+        self.assertEqual(response.context['search_projects'], False)
+        self.assertEqual(response.context['project_results'], [])
+
+    def test_render_keyword_unknown(self):
+        """Test rendering search results with an unknown keyword"""
+        with self.login(self.user):
+            response = self.client.get(
+                reverse('projectroles:search')
+                + '?'
+                + urlencode({'s': 'test unknown:value'})
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['search_keyword_errors']), 1)
+        self.assertEqual(response.context['project_results'], [])
+        self.assertEqual(response.context['app_search_data'], [])
+
+    def test_render_keyword_invalid_date(self):
+        """Test rendering search results with an invalid date keyword"""
+        with self.login(self.user):
+            response = self.client.get(
+                reverse('projectroles:search')
+                + '?'
+                + urlencode({'s': 'test modified:yesterday'})
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['search_keyword_errors']), 1)
+        self.assertEqual(response.context['app_search_data'], [])
+
     def test_redirect_invalid_input(self):
         """Test to ensure the project search view redirects if input is not valid"""
         with self.login(self.user):
@@ -314,6 +478,118 @@ class TestProjectSearchView(ProjectMixin, RoleAssignmentMixin, TestViewsBase):
             )
             self.assertRedirects(response, reverse('home'))
 
+    @override_settings(PROJECTROLES_SEARCH_MAX_WORKERS=4)
+    def test_app_search_data_concurrent(self):
+        """Test get_app_search_data() with concurrent searches"""
+        plugins = [SearchPluginMock('app{}'.format(i), 0.2) for i in range(3)]
+        start = time.time()
+        data = views.ProjectSearchView.get_app_search_data(
+            plugins, 'test', self.user
+        )
+        self.assertLess(time.time() - start, 0.5)
+        self.assertEqual([d['plugin'] for d in data], plugins)
+        self.assertEqual([d['partial'] for d in data], [False, False, False])
+        self.assertEqual(data[0]['results']['all']['title'], 'app0')
+
+    @override_settings(
+        PROJECTROLES_SEARCH_MAX_WORKERS=4, PROJECTROLES_SEARCH_TIMEOUT=0.2
+    )
+    def test_app_search_data_timeout(self):
+        """Test get_app_search_data() with a plugin exceeding the timeout"""
+        plugins = [SearchPluginMock('fast'), SearchPluginMock('slow', 1)]
+        data = views.ProjectSearchView.get_app_search_data(
+            plugins, 'test', self.user
+        )
+        self.assertEqual(data[0]['partial'], False)
+        self.assertIsNotNone(data[0]['results'])
+        self.assertEqual(data[1]['partial'], True)
+        self.assertIsNone(data[1]['results'])
+
+    @override_settings(
+        PROJECTROLES_SEARCH_MAX_WORKERS=2, PROJECTROLES_SEARCH_TIMEOUT=0.25
+    )
+    def test_app_search_data_timeout_queued(self):
+        """Test get_app_search_data() timeout with a plugin waiting for a
+        worker"""
+        executor = views._search_executor
+        views._search_executor = ThreadPoolExecutor(max_workers=2)
+
+        try:
+            plugins = [
+                SearchPluginMock('queued{}'.format(i), 0.15) for i in range(3)
+            ]
+            data = views.ProjectSearchView.get_app_search_data(
+                plugins, 'test', self.user
+            )
+
+        finally:
+            views._search_executor.shutdown()
+            views._search_executor = executor
+
+        self.assertEqual([d['partial'] for d in data], [False, False, False])
+
+    @override_settings(
+        PROJECTROLES_SEARCH_MAX_WORKERS=4, PROJECTROLES_SEARCH_TIMEOUT=0.2
+    )
+    def test_app_search_data_running(self):
+        """Test get_app_search_data() with a previous search still running"""
+        plugins = [SearchPluginMock('running', 1)]
+        plugins.append(SearchPluginMock('other'))
+        views.ProjectSearchView.get_app_search_data(plugins, 'test', self.user)
+        start = time.time()
+        data = views.ProjectSearchView.get_app_search_data(
+            plugins, 'test', self.user
+        )
+        self.assertLess(time.time() - start, 0.2)
+        self.assertEqual(data[0]['partial'], True)
+        self.assertEqual(data[1]['partial'], False)
+
+    def test_app_search_data_limit(self):
+        """Test get_app_search_data() limiting plugin without limit support"""
+        plugins = [SearchPluginMock('app0', items=list(range(5)))]
+        data = views.ProjectSearchView.get_app_search_data(
+            plugins, 'test', self.user, limit=2, offset=2
+        )
+        self.assertEqual(data[0]['results']['all']['items'], [2, 3])
+        self.assertEqual(data[0]['results']['all']['has_more'], True)
+
+    @override_settings(PROJECTROLES_SEARCH_LIMIT=1)
+    def test_render_pages(self):
+        """Test rendering search result pages"""
+        project2 = self._make_project(
+            'TestProject2', PROJECT_TYPE_PROJECT, self.category
+        )
+        url = reverse('projectroles:search')
+
+        with self.login(self.user):
+            response = self.client.get(
+                url + '?' + urlencode({'s': 'test type:project'})
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            list(response.context['project_results']), [self.project]
+        )
+        self.assertEqual(response.context['project_results_more'], True)
+        self.assertIsNone(response.context['search_prev_url'])
+        next_url = url + '?' + urlencode({'s': 'test type:project', 'page': 2})
+        self.assertEqual(response.context['search_next_url'], next_url)
+
+        with self.login(self.user):
+            response = self.client.get(next_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context['project_results']), [project2])
+        self.assertEqual(response.context['project_results_more'], False)
+        self.assertIsNotNone(response.context['search_prev_url'])
+        self.assertIsNone(response.context['search_next_url'])
+
+    def test_app_search_data_sequential(self):
+        """Test get_app_search_data() searching in the request thread"""
+        plugins = [SearchPluginMock('app0'), SearchPluginMock('app1')]
+        data = views.ProjectSearchView.get_app_search_data(
+            plugins, 'test', self.user
+        )
+        self.assertEqual([d['partial'] for d in data], [False, False])
+
 
 class TestProjectDetailView(ProjectMixin, RoleAssignmentMixin, TestViewsBase):
     """Tests for Project detail view"""
@@ -340,6 +616,77 @@ class TestProjectDetailView(ProjectMixin, RoleAssignmentMixin, TestViewsBase):
         self.assertEqual(response.context['object'].pk, self.project.pk)
 
 
+class TestProjectAccessMixin(ProjectMixin, RoleAssignmentMixin, TestViewsBase):
+    """Tests for project resolution in ProjectAccessMixin"""
+
+    def setUp(self):
+        super().setUp()
+        self.project = self._make_project(
+            'TestProject', PROJECT_TYPE_PROJECT, None
+        )
+        self.owner_as = self._make_assignment(
+            self.project, self.user, self.role_owner
+        )
+        self.guest_as = self._make_assignment(
+            self.project, self.make_user('guest'), self.role_guest
+        )
+
+    def _get_lookup_queries(self, url, table):
+        """Return number of queries looking up an object by UUID in a view"""
+        get_active_plugins()  # Ensure plugins are loaded
+        lookup = '"{}"."sodar_uuid" ='.format(table)
+
+        with self.login(self.user):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        return len([q for q in ctx.captured_queries if lookup in q['sql']])
+
+    def test_project_views(self):
+        """Test project lookup queries in standard project views"""
+        # NOTE: Detail and update views also query in get_object()
+        expected = {'detail': 2, 'update': 2, 'roles': 1}
+
+        for url_name, query_count in expected.items():
+            url = reverse(
+                'projectroles:{}'.format(url_name),
+                kwargs={'project': self.project.sodar_uuid},
+            )
+            self.assertEqual(
+                self._get_lookup_queries(url, 'projectroles_project'),
+                query_count,
+                msg=url_name,
+            )
+
+    def test_object_view(self):
+        """Test object lookup queries in a view with an object URL"""
+        url = reverse(
+            'projectroles:role_update',
+            kwargs={'roleassignment': self.guest_as.sodar_uuid},
+        )
+        self.assertEqual(
+            self._get_lookup_queries(url, 'projectroles_roleassignment'),
+            2,  # Including get_object()
+        )
+
+    def test_get_project(self):
+        """Test get_project() reusing the project stored in the request"""
+        request = RequestFactory().get(
+            reverse(
+                'projectroles:detail',
+                kwargs={'project': self.project.sodar_uuid},
+            )
+        )
+        view = views.ProjectAccessMixin()
+        view.request = request
+        view.kwargs = {'project': str(self.project.sodar_uuid)}
+
+        with self.assertNumQueries(1):
+            self.assertEqual(view.get_project(), self.project)
+            self.assertEqual(view.get_project(), self.project)
+
+
 class TestProjectCreateView(
     ProjectMixin, RoleAssignmentMixin, ProjectSettingMixin, TestViewsBase
 ):
@@ -1403,6 +1750,190 @@ class TestProjectStarringAPIView(
         self.assertEqual(response.status_code, 200)
 
 
+class TestUserAutocompleteAPIView(
+    ProjectMixin, RoleAssignmentMixin, TestViewsBase
+):
+    """Tests for user autocomplete API views"""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+        self.project = self._make_project(
+            'TestProject', PROJECT_TYPE_PROJECT, None
+        )
+        self.owner_as = self._make_assignment(
+            self.project, self.user, self.role_owner
+        )
+        self.user_member = self.make_user('member')
+        self.user_other = self.make_user('other')
+        self._make_assignment(
+            self.project, self.user_member, self.role_contributor
+        )
+
+    def _get_results(self, url_name, q, project=None):
+        values = {'q': q}
+
+        if project:
+            values['forward'] = json.dumps({'project': str(project.sodar_uuid)})
+
+        with self.login(self.user):
+            response = self.client.get(
+                reverse('projectroles:{}'.format(url_name)), values
+            )
+
+        self.assertEqual(response.status_code, 200)
+        return [r['id'] for r in json.loads(response.content)['results']]
+
+    def test_autocomplete(self):
+        """Test user autocomplete without project"""
+        self.assertEqual(
+            self._get_results('autocomplete_user', 'mem'),
+            [str(self.user_member.sodar_uuid)],
+        )
+
+    def test_autocomplete_project(self):
+        """Test user autocomplete with project members"""
+        self.assertEqual(
+            self._get_results('autocomplete_user', 'er', self.project),
+            [str(self.user_member.sodar_uuid), str(self.user.sodar_uuid)],
+        )
+
+    def test_autocomplete_exclude(self):
+        """Test user autocomplete excluding project members"""
+        self.assertEqual(
+            self._get_results('autocomplete_user_exclude', 'er', self.project),
+            [str(self.user_other.sodar_uuid)],
+        )
+
+    def test_autocomplete_exclude_role_change(self):
+        """Test cached user autocomplete results after adding a member"""
+        self.assertEqual(
+            len(
+                self._get_results(
+                    'autocomplete_user_exclude', 'er', self.project
+                )
+            ),
+            1,
+        )
+        self._make_assignment(self.project, self.user_other, self.role_guest)
+        self.assertEqual(
+            self._get_results('autocomplete_user_exclude', 'er', self.project),
+            [],
+        )
+
+    def test_autocomplete_user_change(self):
+        """Test cached user autocomplete results after user changes"""
+        self.assertEqual(self._get_results('autocomplete_user', 'new'), [])
+        new_user = self.make_user('new_user')
+        self.assertEqual(
+            self._get_results('autocomplete_user', 'new'),
+            [str(new_user.sodar_uuid)],
+        )
+        self.assertEqual(self._get_results('autocomplete_user', 'renamed'), [])
+        self.user_other.name = 'Renamed'
+        self.user_other.save()
+        self.assertEqual(
+            self._get_results('autocomplete_user', 'renamed'),
+            [str(self.user_other.sodar_uuid)],
+        )
+
+    @override_settings(PROJECTROLES_AUTOCOMPLETE_LIMIT=1)
+    def test_autocomplete_limit(self):
+        """Test user autocomplete with a result limit"""
+        self.assertEqual(len(self._get_results('autocomplete_user', 'er')), 1)
+
+
+class TestProjectSearchSuggestAPIView(
+    ProjectMixin, RoleAssignmentMixin, TestViewsBase
+):
+    """Tests for search suggestion API view"""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+        self.category = self._make_project(
+            'TestCategory', PROJECT_TYPE_CATEGORY, None
+        )
+        self.project = self._make_project(
+            'TestProject', PROJECT_TYPE_PROJECT, self.category
+        )
+        self.owner_as = self._make_assignment(
+            self.project, self.user, self.role_owner
+        )
+
+    def _get_results(self, user, search_term):
+        with self.login(user):
+            response = self.client.get(
+                reverse('projectroles:search_suggest'), {'s': search_term}
+            )
+        self.assertEqual(response.status_code, 200)
+        return response.data['results']
+
+    def test_suggest(self):
+        """Test retrieving project suggestions"""
+        results = self._get_results(self.user, 'testp')
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]['search_type'], 'project')
+        self.assertEqual(results[0]['label'], self.project.title)
+        self.assertEqual(results[0]['project'], self.project.full_title)
+        self.assertEqual(
+            results[0]['url'],
+            reverse(
+                'projectroles:detail',
+                kwargs={'project': self.project.sodar_uuid},
+            ),
+        )
+
+    def test_suggest_prefix_first(self):
+        """Test ordering of suggestions with matching title prefix"""
+        other_project = self._make_project(
+            'ProjectTest', PROJECT_TYPE_PROJECT, self.category
+        )
+        results = self._get_results(self.user, 'projecttest')
+        self.assertEqual(len(results), 1)
+        results = self._get_results(self.user, 'project')
+        self.assertEqual(
+            [r['label'] for r in results],
+            [other_project.title, self.project.title],
+        )
+
+    def test_suggest_short(self):
+        """Test suggestions with a too short search term"""
+        self.assertEqual(self._get_results(self.user, 'te'), [])
+
+    def test_suggest_no_access(self):
+        """Test suggestions for a user without project roles"""
+        user = self.make_user('user_no_roles')
+        self.assertEqual(self._get_results(user, 'testp'), [])
+
+    def test_suggest_cache(self):
+        """Test suggestions are cached per user and search term"""
+        self.assertEqual(len(self._get_results(self.user, 'testp')), 1)
+        self._make_project('TestProject2', PROJECT_TYPE_PROJECT, self.category)
+        self.assertEqual(len(self._get_results(self.user, 'testp')), 1)
+        self.assertEqual(len(self._get_results(self.user, 'testpr')), 2)
+
+    @override_settings(PROJECTROLES_SEARCH_SUGGEST_LIMIT=1)
+    def test_suggest_limit(self):
+        """Test limiting the total amount of suggestions"""
+        self._make_project('TestProject2', PROJECT_TYPE_PROJECT, self.category)
+        self.assertEqual(len(self._get_results(self.user, 'testp')), 1)
+
+    @override_settings(PROJECTROLES_ENABLE_SEARCH=False)
+    def test_suggest_disabled(self):
+        """Test suggestions with search disabled"""
+        self.assertEqual(self._get_results(self.user, 'testp'), [])
+
+    def test_suggest_anonymous(self):
+        """Test suggestions as anonymous user (should fail)"""
+        response = self.client.get(
+            reverse('projectroles:search_suggest'), {'s': 'testp'}
+        )
+        self.assertEqual(response.status_code, 403)
+
+
 # Taskflow API view tests ------------------------------------------------------
 
 
@@ -1902,6 +2433,8 @@ class TestRemoteSiteCreateView(RemoteSiteMixin, TestViewsBase):
             'description': REMOTE_SITE_DESC,
             'secret': REMOTE_SITE_SECRET,
             'sodar_uuid': site.sodar_uuid,
+            'sync_token': None,
+            'sync_etag': None,
         }
 
         model_dict = model_to_dict(site)
@@ -1942,6 +2475,8 @@ class TestRemoteSiteCreateView(RemoteSiteMixin, TestViewsBase):
             'description': REMOTE_SITE_DESC,
             'secret': REMOTE_SITE_SECRET,
             'sodar_uuid': site.sodar_uuid,
+            'sync_token': None,
+            'sync_etag': None,
         }
 
         model_dict = model_to_dict(site)
@@ -2054,6 +2589,8 @@ class TestRemoteSiteUpdateView(RemoteSiteMixin, TestViewsBase):
             'description': REMOTE_SITE_NEW_DESC,
             'secret': REMOTE_SITE_SECRET,
             'sodar_uuid': site.sodar_uuid,
+            'sync_token': None,
+            'sync_etag': None,
         }
 
         model_dict = model_to_dict(site)
@@ -2146,6 +2683,109 @@ class TestRemoteSiteDeleteView(RemoteSiteMixin, TestViewsBase):
         self.assertEqual(RemoteSite.objects.all().count(), 0)
 
 
+class TestRemoteProjectsSyncView(RemoteSiteMixin, TestViewsBase):
+    """Tests for remote project sync view"""
+
+    def setUp(self):
+        super().setUp()
+
+        # Set up source site
+        self.source_site = self._make_site(
+            name=REMOTE_SITE_NAME,
+            url=REMOTE_SITE_URL,
+            mode=SITE_MODE_SOURCE,
+            description=REMOTE_SITE_DESC,
+            secret=REMOTE_SITE_SECRET,
+        )
+
+    @override_settings(PROJECTROLES_SITE_MODE=SITE_MODE_TARGET)
+    def test_get_background(self):
+        """Test starting the sync as a background job"""
+        from bgjobs.models import RemoteSyncBackgroundJob
+
+        with self.login(self.user):
+            response = self.client.get(
+                reverse(
+                    'projectroles:remote_projects_sync',
+                    kwargs={'remotesite': self.source_site.sodar_uuid},
+                )
+                + '?background=1'
+            )
+
+        job = RemoteSyncBackgroundJob.objects.get(site=self.source_site)
+        self.assertRedirects(
+            response, job.get_absolute_url(), fetch_redirect_response=False
+        )
+        self.assertEqual(job.bg_job.user, self.user)
+        self.assertEqual(job.bg_job.job_type, RemoteSyncBackgroundJob.spec_name)
+        self.assertIsNone(job.bg_job.project)
+
+    @override_settings(PROJECTROLES_SITE_MODE=SITE_MODE_TARGET)
+    def test_get_dry_run(self):
+        """Test starting a dry run as a background job"""
+        from bgjobs.models import RemoteSyncBackgroundJob
+
+        with self.login(self.user):
+            response = self.client.get(
+                reverse(
+                    'projectroles:remote_projects_sync',
+                    kwargs={'remotesite': self.source_site.sodar_uuid},
+                )
+                + '?dry_run=1'
+            )
+
+        job = RemoteSyncBackgroundJob.objects.get(site=self.source_site)
+        self.assertRedirects(
+            response, job.get_absolute_url(), fetch_redirect_response=False
+        )
+        self.assertTrue(job.dry_run)
+
+    @override_settings(PROJECTROLES_SITE_MODE=SITE_MODE_TARGET)
+    def test_get_background_running(self):
+        """Test starting a background sync with a job already running (should
+        fail)"""
+        from bgjobs.models import RemoteSyncBackgroundJob
+        from bgjobs.remote_sync import start_remote_sync_job
+
+        start_remote_sync_job(self.source_site, self.user)
+
+        with self.login(self.user):
+            response = self.client.get(
+                reverse(
+                    'projectroles:remote_projects_sync',
+                    kwargs={'remotesite': self.source_site.sodar_uuid},
+                )
+                + '?background=1'
+            )
+
+        self.assertRedirects(
+            response,
+            reverse('projectroles:remote_sites'),
+            fetch_redirect_response=False,
+        )
+        self.assertEqual(RemoteSyncBackgroundJob.objects.count(), 1)
+
+    def test_get_background_source_mode(self):
+        """Test starting a background sync in source mode (should fail)"""
+        from bgjobs.models import RemoteSyncBackgroundJob
+
+        with self.login(self.user):
+            response = self.client.get(
+                reverse(
+                    'projectroles:remote_projects_sync',
+                    kwargs={'remotesite': self.source_site.sodar_uuid},
+                )
+                + '?background=1'
+            )
+
+        self.assertRedirects(
+            response,
+            reverse('projectroles:remote_sites'),
+            fetch_redirect_response=False,
+        )
+        self.assertEqual(RemoteSyncBackgroundJob.objects.count(), 0)
+
+
 class TestRemoteProjectsBatchUpdateView(
     ProjectMixin,
     RoleAssignmentMixin,
@@ -2362,9 +3002,154 @@ class TestRemoteProjectGetAPIView(
 
         expected = self.remote_api.get_target_data(self.target_site)
         response_dict = json.loads(response.content.decode('utf-8'))
+        expected['sync_token'] = response_dict['sync_token']
 
         self.assertEqual(response_dict, expected)
 
+    def test_get_gzip(self):
+        """Test retrieving compressed project data"""
+
+        response = self.client.get(
+            reverse(
+                'projectroles:api_remote_get',
+                kwargs={'secret': REMOTE_SITE_SECRET},
+            ),
+            HTTP_ACCEPT_ENCODING='gzip, deflate',
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        response_dict = json.loads(
+            gzip.decompress(response.content).decode('utf-8')
+        )
+        self.assertIn(str(self.project.sodar_uuid), response_dict['projects'])
+
+    def test_get_since(self):
+        """Test retrieving project data changed since the last sync"""
+        since = timezone.now() + SYNC_TOKEN_OVERLAP
+
+        response = self.client.get(
+            reverse(
+                'projectroles:api_remote_get',
+                kwargs={'secret': REMOTE_SITE_SECRET},
+            )
+            + '?'
+            + urlencode({'since': since.isoformat()})
+        )
+
+        self.assertEqual(response.status_code, 200)
+        response_dict = json.loads(response.content.decode('utf-8'))
+        self.assertEqual(response_dict['projects'], {})
+
+    def test_get_since_invalid(self):
+        """Test retrieving project data with an invalid token (should fail)"""
+
+        response = self.client.get(
+            reverse(
+                'projectroles:api_remote_get',
+                kwargs={'secret': REMOTE_SITE_SECRET},
+            )
+            + '?'
+            + urlencode({'since': 'Not a token'})
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_get_etag(self):
+        """Test retrieving unchanged project data with an ETag"""
+        url = reverse(
+            'projectroles:api_remote_get', kwargs={'secret': REMOTE_SITE_SECRET}
+        )
+        response = self.client.get(url)
+        etag = response['ETag']
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+        # Site lookup and access date update only
+        self.assertEqual(len(ctx), 2)
+
+    def test_get_etag_gzip(self):
+        """Test retrieving unchanged compressed project data with an ETag"""
+        url = reverse(
+            'projectroles:api_remote_get', kwargs={'secret': REMOTE_SITE_SECRET}
+        )
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('W/'))
+
+        response = self.client.get(
+            url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_get_etag_changed(self):
+        """Test retrieving changed project data with an ETag"""
+        url = reverse(
+            'projectroles:api_remote_get', kwargs={'secret': REMOTE_SITE_SECRET}
+        )
+        etag = self.client.get(url)['ETag']
+        self.project.title = 'UpdatedProject'
+        self.project.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        response_dict = json.loads(response.content.decode('utf-8'))
+        self.assertEqual(
+            response_dict['projects'][str(self.project.sodar_uuid)]['title'],
+            'UpdatedProject',
+        )
+
+    def test_get_since_etag(self):
+        """Test retrieving unchanged project data with a token and ETag"""
+        url = reverse(
+            'projectroles:api_remote_get', kwargs={'secret': REMOTE_SITE_SECRET}
+        )
+        response = self.client.get(url)
+        since = json.loads(response.content.decode('utf-8'))['sync_token']
+
+        response = self.client.get(
+            url + '?' + urlencode({'since': since}),
+            HTTP_IF_NONE_MATCH=response['ETag'],
+        )
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_get_since_etag_changed(self):
+        """Test retrieving changed project data with a token and ETag"""
+        url = reverse(
+            'projectroles:api_remote_get', kwargs={'secret': REMOTE_SITE_SECRET}
+        )
+        response = self.client.get(url)
+        since = json.loads(response.content.decode('utf-8'))['sync_token']
+        self.project.title = 'UpdatedProject'
+        self.project.save()
+
+        response = self.client.get(
+            url + '?' + urlencode({'since': since}),
+            HTTP_IF_NONE_MATCH=response['ETag'],
+        )
+
+        self.assertEqual(response.status_code, 200)
+        response_dict = json.loads(response.content.decode('utf-8'))
+        self.assertEqual(
+            response_dict['projects'][str(self.project.sodar_uuid)]['title'],
+            'UpdatedProject',
+        )
+        # Full data is not built for the delta
+        self.assertFalse(response.has_header('ETag'))
+        self.assertIsNone(
+            self.remote_api.get_target_payload(
+                self.target_site, cached_only=True
+            )
+        )
+
     def test_get_invalid_secret(self):
         """Test retrieving project data with an invalid secret (should fail)"""
 
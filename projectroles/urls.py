@@ -123,6 +123,11 @@ urlpatterns = [
         view=views.ProjectStarringAPIView.as_view(),
         name='star',
     ),
+    url(
+        regex=r'^search/suggest$',
+        view=views.ProjectSearchSuggestAPIView.as_view(),
+        name='search_suggest',
+    ),
     url(
         r'^autocomplete/user$',
         view=views.UserAutocompleteAPIView.as_view(),
@@ -121,3 +121,27 @@ def set_user_group(user):
     if group not in user.groups.all():
         group.user_set.add(user)
         return group_name
+
+
+def get_trigram_index_sql(table, column, index_name):
+    """
+    Return SQL for creating a trigram GIN index on a text column. The index is
+    only created if the pg_trgm extension is available on the database server,
+    as it is only needed for speeding up partial match queries.
+
+    :param table: Database table name (string)
+    :param column: Column name or expression, e.g. "UPPER(name)" (string)
+    :param index_name: Name of the index to be created (string)
+    :return: String
+    """
+    return (
+        'DO $$ BEGIN '
+        'IF EXISTS (SELECT 1 FROM pg_available_extensions '
+        'WHERE name = \'pg_trgm\') THEN '
+        'CREATE EXTENSION IF NOT EXISTS pg_trgm; '
+        'CREATE INDEX IF NOT EXISTS {index_name} ON {table} '
+        'USING gin ({column} gin_trgm_ops); '
+        'END IF; END $$;'.format(
+            table=table, column=column, index_name=index_name
+        )
+    )
@@ -1,20 +1,29 @@
+import hashlib
+import inspect
 import json
+import logging
 import re
 import requests
-import urllib.request
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor, wait
 
 from dal import autocomplete
 
 from django.apps import apps
 from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.core.urlresolvers import resolve
 from django.core.validators import EmailValidator
+from django.db import connections
 from django.contrib import auth
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Q
+from django.db.models import Case, IntegerField, Q, Value, When
 from django.http import (
+    HttpResponse,
     HttpResponseRedirect,
     HttpResponseForbidden,
     JsonResponse,
@@ -22,6 +31,10 @@ from django.http import (
 from django.shortcuts import redirect
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.decorators import method_decorator
+from django.utils.http import urlencode
+from django.views.decorators.gzip import gzip_page
 from django.views.generic import (
     TemplateView,
     DetailView,
@@ -47,6 +60,7 @@ from rest_framework.views import APIView
 
 from rules.contrib.views import PermissionRequiredMixin, redirect_to_login
 
+from .access import filter_by_project_access
 from .app_settings import AppSettingAPI
 from .email import (
     send_role_change_mail,
@@ -75,8 +89,13 @@ from .models import (
     RemoteProject,
     SODAR_CONSTANTS,
     PROJECT_TAG_STARRED,
+    PROJECT_SEARCH_KEYWORDS,
+    USER_AUTOCOMPLETE_USERS_KEY,
+    USER_AUTOCOMPLETE_VERSION_KEY,
+    USER_SEARCH_FIELDS,
 )
-from .plugins import ProjectAppPluginPoint, get_active_plugins, get_backend_api
+from .plugins import get_active_plugins, get_backend_api
+from .search import parse_search_date
 from .project_tags import get_tag_state, set_tag_state, remove_tag
 from projectroles.remote_projects import RemoteProjectAPI
 from .utils import get_expiry_date, get_display_name
@@ -104,8 +123,15 @@ APP_SETTING_SCOPE_PROJECT = SODAR_CONSTANTS['APP_SETTING_SCOPE_PROJECT']
 
 # Local constants
 APP_NAME = 'projectroles'
-SEARCH_REGEX = re.compile(r'^[a-zA-Z0-9.:\-_\s\t]+$')
+SEARCH_REGEX = re.compile(r'^[a-zA-Z0-9.:@\-_\s\t]+$')
 ALLOWED_CATEGORY_URLS = ['detail', 'create', 'update', 'star']
+PROJECT_CACHE_ATTR = '_sodar_projects'
+SEARCH_SUGGEST_CACHE_KEY = 'projectroles.search_suggest.{user}.{term}'
+SEARCH_SUGGEST_MIN_LENGTH = 3
+USER_AUTOCOMPLETE_CACHE_KEY = (
+    'projectroles.user_autocomplete.{view}.{project}.{version}.{users}.'
+    '{local}.{term}'
+)
 
 SODAR_API_DEFAULT_MEDIA_TYPE = 'application/vnd.bihealth.sodar-core+json'
 SODAR_API_MEDIA_TYPE = (
@@ -125,6 +151,17 @@ SODAR_API_ALLOWED_VERSIONS = (
 )
 
 
+logger = logging.getLogger(__name__)
+
+
+# Thread pool for concurrent app plugin searches, created on first search
+_search_executor = None
+_search_lock = threading.Lock()
+
+# Names of app plugins with a search running in the thread pool
+_search_running = set()
+
+
 # Access Django user model
 User = auth.get_user_model()
 
@@ -142,11 +179,26 @@ class ProjectAccessMixin:
     #: with a proxy model, for example.
     project_class = Project
 
+    @classmethod
+    def get_url_match(cls, request):
+        """
+        Return URL match for a request. The match is stored in the request
+        object so the path is only resolved once.
+
+        :param request: Request object
+        :return: ResolverMatch object
+        """
+        if not getattr(request, 'resolver_match', None):
+            request.resolver_match = resolve(request.path)
+
+        return request.resolver_match
+
     def get_project(self, request=None, kwargs=None):
         """
         Return SODAR Project object based or None if not found, based on
         the current request and view kwargs. If arguments are not provided,
-        uses self.request and/or self.kwargs.
+        uses self.request and/or self.kwargs. The project is stored in the
+        request object, so repeated calls do not query the database.
 
         :param request: Request object (optional)
         :param kwargs: View kwargs (optional)
@@ -158,24 +210,75 @@ class ProjectAccessMixin:
         if not kwargs:
             kwargs = self.kwargs
 
+        return self._get_cached_lookup(request, kwargs)[0]
+
+    def get_url_object(self, request=None, kwargs=None):
+        """
+        Return the object referred to by a UUID kwarg of the view URL, which
+        is used for retrieving the project in get_project(). The object is
+        stored in the request object along with the project.
+
+        :param request: Request object (optional)
+        :param kwargs: View kwargs (optional)
+        :return: Model object or None if not found
+        """
+        return self._get_cached_lookup(
+            request or self.request, kwargs or self.kwargs
+        )[1]
+
+    def _get_cached_lookup(self, request, kwargs):
+        """
+        Return project and URL object for request and kwargs, retrieving them
+        from the database only if not already stored in the request.
+
+        :param request: Request object
+        :param kwargs: View kwargs
+        :return: Tuple of project and URL object (either can be None)
+        """
+        lookups = getattr(request, PROJECT_CACHE_ATTR, None)
+
+        if lookups is None:
+            lookups = {}
+            setattr(request, PROJECT_CACHE_ATTR, lookups)
+
+        cache_key = (
+            self.project_class,
+            tuple(sorted((k, str(v)) for k, v in kwargs.items())),
+        )
+
+        if cache_key not in lookups:
+            lookups[cache_key] = self._get_project(request, kwargs)
+
+        return lookups[cache_key]
+
+    def _get_project(self, request, kwargs):
+        """
+        Retrieve SODAR Project object and the object referred to in kwargs
+        from the database.
+
+        :param request: Request object
+        :param kwargs: View kwargs
+        :return: Tuple of project and URL object (either can be None)
+        """
         # First check for a kwarg named "project"
         if 'project' in kwargs:
-            return self.project_class.objects.filter(
+            project = self.project_class.objects.filter(
                 sodar_uuid=kwargs['project']
             ).first()
+            return project, project
 
         # Other object types
         model = None
         uuid_kwarg = None
+        app_name = None
 
         for k, v in kwargs.items():
-            if re.match(r'[0-9a-f-]+', v):
-                try:
-                    app_name = resolve(request.path).app_name
-
-                    if app_name.find('.') != -1:
-                        app_name = app_name.split('.')[0]
+            if re.match(r'[0-9a-f-]+', str(v)):
+                if not app_name:
+                    app_name = self.get_url_match(request).app_name
+                    app_name = app_name.split('.')[0]
 
+                try:
                     model = apps.get_model(app_name, k)
                     uuid_kwarg = k
                     break
@@ -184,22 +287,24 @@ class ProjectAccessMixin:
                     pass
 
         if not model:
-            return None
+            return None, None
 
         try:
             obj = model.objects.get(sodar_uuid=kwargs[uuid_kwarg])
 
-            if hasattr(obj, 'project'):
-                return obj.project
+        except model.DoesNotExist:
+            return None, None
 
-            # Some objects may have a get_project() func instead of foreignkey
-            elif hasattr(obj, 'get_project') and callable(
-                getattr(obj, 'get_project', None)
-            ):
-                return obj.get_project()
+        if hasattr(obj, 'project'):
+            return obj.project, obj
 
-        except model.DoesNotExist:
-            return None
+        # Some objects may have a get_project() func instead of foreignkey
+        elif hasattr(obj, 'get_project') and callable(
+            getattr(obj, 'get_project', None)
+        ):
+            return obj.get_project(), obj
+
+        return None, obj
 
 
 class LoggedInPermissionMixin(PermissionRequiredMixin):
@@ -242,7 +347,7 @@ class ProjectPermissionMixin(PermissionRequiredMixin, ProjectAccessMixin):
         project = self.get_project()
 
         if project and project.type == PROJECT_TYPE_CATEGORY:
-            request_url = resolve(self.request.get_full_path())
+            request_url = self.get_url_match(self.request)
 
             if (
                 request_url.app_name != APP_NAME
@@ -311,29 +416,26 @@ class RolePermissionMixin(ProjectModifyPermissionMixin):
         if not super().has_permission():
             return False
 
-        try:
-            obj = RoleAssignment.objects.get(
-                sodar_uuid=self.kwargs['roleassignment']
-            )
+        obj = self.get_url_object()
 
-            if obj.role.name == PROJECT_ROLE_OWNER:
-                # Modifying the project owner is not allowed in role views
-                return False
+        if not isinstance(obj, RoleAssignment):
+            return False
 
-            elif obj.role.name == PROJECT_ROLE_DELEGATE:
-                return self.request.user.has_perm(
-                    'projectroles.update_project_delegate',
-                    self.get_permission_object(),
-                )
+        if obj.role.name == PROJECT_ROLE_OWNER:
+            # Modifying the project owner is not allowed in role views
+            return False
 
-            else:
-                return self.request.user.has_perm(
-                    'projectroles.update_project_members',
-                    self.get_permission_object(),
-                )
+        elif obj.role.name == PROJECT_ROLE_DELEGATE:
+            return self.request.user.has_perm(
+                'projectroles.update_project_delegate',
+                self.get_permission_object(),
+            )
 
-        except RoleAssignment.DoesNotExist:
-            return False
+        else:
+            return self.request.user.has_perm(
+                'projectroles.update_project_members',
+                self.get_permission_object(),
+            )
 
     def get_permission_object(self):
         """Override get_permission_object for checking Project permission"""
@@ -366,7 +468,13 @@ class ProjectContextMixin(HTTPRefererMixin, ContextMixin, ProjectAccessMixin):
 
         # Project
         if hasattr(self, 'object') and isinstance(self.object, Project):
-            context['project'] = self.get_object()
+            # Reuse the project already retrieved for this request
+            project = self.get_project()
+
+            if not project or project.pk != self.object.pk:
+                project = self.get_object()
+
+            context['project'] = project
 
         elif hasattr(self, 'object') and hasattr(self.object, 'project'):
             context['project'] = self.object.project
@@ -375,13 +483,10 @@ class ProjectContextMixin(HTTPRefererMixin, ContextMixin, ProjectAccessMixin):
             context['project'] = self.get_project()
 
         # Plugins stuff
-        plugins = ProjectAppPluginPoint.get_plugins()
-
-        if plugins:
-            context['app_plugins'] = sorted(
-                [p for p in plugins if p.is_active()],
-                key=lambda x: x.plugin_ordering,
-            )
+        context['app_plugins'] = sorted(
+            get_active_plugins(plugin_type='project_app'),
+            key=lambda x: x.plugin_ordering,
+        )
 
         # Project tagging/starring
         if 'project' in context:
@@ -450,6 +555,9 @@ class ProjectDetailView(
     slug_url_kwarg = 'project'
     slug_field = 'sodar_uuid'
 
+    def get_permission_object(self):
+        return self.get_project()
+
     def get_context_data(self, *args, **kwargs):
         context = super().get_context_data(*args, **kwargs)
 
@@ -498,11 +606,11 @@ class ProjectSearchView(LoginRequiredMixin, TemplateView):
             s = search_split[i].strip()
 
             if ':' in s:
-                kw = s.split(':')[0].lower().strip()
-                val = s.split(':')[1].lower().strip()
+                kw = s.split(':', 1)[0].lower().strip()
+                val = s.split(':', 1)[1].strip()
 
                 if kw == 'type':
-                    search_type = val
+                    search_type = val.lower()
 
                 else:
                     search_keywords[kw] = val
@@ -513,50 +621,301 @@ class ProjectSearchView(LoginRequiredMixin, TemplateView):
         context['search_term'] = search_term
         context['search_type'] = search_type
         context['search_keywords'] = search_keywords
+        context['search_keyword_errors'] = self.get_keyword_errors(
+            plugins, search_keywords
+        )
+
+        # Get result page
+        limit = getattr(settings, 'PROJECTROLES_SEARCH_LIMIT', 100)
+
+        try:
+            page = max(int(self.request.GET.get('page', 1)), 1)
+
+        except ValueError:
+            page = 1
+
+        offset = (page - 1) * limit
+        context['search_page'] = page
+        context['search_has_more'] = False
+
+        # Only search projects and apps supporting all given keywords
+        context['search_projects'] = (
+            not search_type or search_type == 'project'
+        ) and set(search_keywords).issubset(PROJECT_SEARCH_KEYWORDS)
+        context['project_results'] = []
+
+        if context['search_keyword_errors']:
+            context['search_projects'] = False
+            plugins = []
 
         # Get project results
-        if not search_type or search_type == 'project':
-            context['project_results'] = [
+        if context['search_projects']:
+            projects = filter_by_project_access(
+                Project.objects.find(
+                    search_term,
+                    keywords=search_keywords,
+                    project_type=PROJECT_TYPE_PROJECT,
+                ),
+                self.request.user,
+                project_lookup='pk',
+            )
+            projects = list(projects[offset : offset + limit + 1])
+            context['project_results'] = projects[:limit]
+            context['project_results_more'] = len(projects) > limit
+            context['search_has_more'] = context['project_results_more']
+
+        # Get app results
+        search_apps = sorted(
+            [
                 p
-                for p in Project.objects.find(
-                    search_term, project_type='PROJECT'
+                for p in plugins
+                if p.search_enable
+                and (not search_type or search_type in p.search_types)
+                and set(search_keywords).issubset(p.search_keywords)
+            ],
+            key=lambda x: x.plugin_ordering,
+        )
+
+        context['app_search_data'] = self.get_app_search_data(
+            search_apps,
+            search_term,
+            self.request.user,
+            search_type,
+            search_keywords,
+            limit,
+            offset,
+        )
+
+        for app in context['app_search_data']:
+            if app['results'] and any(
+                r.get('has_more') for r in app['results'].values()
+            ):
+                context['search_has_more'] = True
+
+        # Links to other result pages
+        search_url = reverse('projectroles:search') + '?{}'
+        context['search_prev_url'] = (
+            search_url.format(urlencode({'s': search_input, 'page': page - 1}))
+            if page > 1
+            else None
+        )
+        context['search_next_url'] = (
+            search_url.format(urlencode({'s': search_input, 'page': page + 1}))
+            if context['search_has_more']
+            else None
+        )
+
+        return context
+
+    @classmethod
+    def get_keyword_errors(cls, plugins, keywords):
+        """
+        Return errors for search keywords not supported by projects or any
+        searchable app, or with invalid values.
+
+        :param plugins: List of ProjectAppPlugin objects
+        :param keywords: Search keywords (dict)
+        :return: List of error messages (strings)
+        """
+        supported = set(PROJECT_SEARCH_KEYWORDS)
+
+        for plugin in plugins:
+            if plugin.search_enable:
+                supported.update(plugin.search_keywords)
+
+        ret = [
+            'Search keyword "{}" not supported'.format(k)
+            for k in sorted(keywords)
+            if k not in supported
+        ]
+
+        if 'modified' in keywords:
+            try:
+                parse_search_date(keywords['modified'])
+
+            except ValueError:
+                ret.append(
+                    'Invalid date "{}" for keyword "modified", please use '
+                    'the format YYYY-MM-DD'.format(keywords['modified'])
                 )
-                if self.request.user.has_perm('projectroles.view_project', p)
-            ]
 
-        # Get app results
-        if search_type:
-            search_apps = sorted(
-                [
-                    p
-                    for p in plugins
-                    if (p.search_enable and search_type in p.search_types)
-                ],
-                key=lambda x: x.plugin_ordering,
-            )
+        return ret
 
-        else:
-            search_apps = sorted(
-                [p for p in plugins if p.search_enable],
-                key=lambda x: x.plugin_ordering,
+    @classmethod
+    def _search_plugin(
+        cls, plugin, search_args, limit=None, offset=0, close_db=False
+    ):
+        """
+        Call search() of an app plugin and log the time it took. If the plugin
+        does not support the limit and offset arguments, the returned items
+        are limited after the search.
+
+        :param plugin: ProjectAppPlugin object
+        :param search_args: Arguments for search() (tuple)
+        :param limit: Maximum number of items per result category (int or None)
+        :param offset: Offset of the first returned item (int)
+        :param close_db: Close database connections after search (boolean)
+        :return: Dict
+        """
+        start = time.time()
+
+        try:
+            if 'limit' in inspect.signature(plugin.search).parameters:
+                return plugin.search(*search_args, limit=limit, offset=offset)
+
+            results = plugin.search(*search_args)
+
+            if results and limit:
+                for result in results.values():
+                    items = list(result['items'])
+                    result['items'] = items[offset : offset + limit]
+                    result['has_more'] = len(items) > offset + limit
+
+            return results
+
+        finally:
+            logger.info(
+                'Search in app "{}" took {:.3f} s'.format(
+                    plugin.name, time.time() - start
+                )
             )
 
-        context['app_search_data'] = []
+            # Worker threads do not close their connections with the request
+            if close_db:
+                connections.close_all()
+
+    @classmethod
+    def _search_plugin_pooled(
+        cls, plugin, search_args, limit, offset, start_times
+    ):
+        """Search an app plugin in the thread pool, storing the start time of
+        the search in start_times"""
+        start_times[plugin.name] = time.time()
+        return cls._search_plugin(plugin, search_args, limit, offset, True)
 
-        for plugin in search_apps:
-            context['app_search_data'].append(
+    @staticmethod
+    def _end_pooled_search(plugin_name):
+        """Mark search of an app plugin in the thread pool as ended"""
+        with _search_lock:
+            _search_running.discard(plugin_name)
+
+    @classmethod
+    def get_app_search_data(
+        cls,
+        plugins,
+        search_term,
+        user,
+        search_type=None,
+        keywords=None,
+        limit=None,
+        offset=0,
+    ):
+        """
+        Return search results of app plugins. Plugins are searched concurrently
+        in a thread pool if more than one worker is set in the
+        PROJECTROLES_SEARCH_MAX_WORKERS setting. If a plugin does not return
+        results within PROJECTROLES_SEARCH_TIMEOUT seconds from the start of
+        its search, its results are omitted and it is marked as partial. The
+        same applies to plugins still running a previous search.
+
+        :param plugins: List of ProjectAppPlugin objects
+        :param search_term: Search term (string)
+        :param user: User object for user initiating the search
+        :param search_type: Search type (string or None)
+        :param keywords: Search keywords (dict or None)
+        :param limit: Maximum number of items per result category (int or None)
+        :param offset: Offset of the first returned item (int)
+        :return: List of dicts
+        """
+        global _search_executor
+        search_args = (search_term, user, search_type, keywords)
+        max_workers = getattr(settings, 'PROJECTROLES_SEARCH_MAX_WORKERS', 4)
+
+        if max_workers <= 1 or len(plugins) <= 1:
+            return [
                 {
-                    'plugin': plugin,
-                    'results': plugin.search(
-                        search_term,
-                        self.request.user,
-                        search_type,
-                        search_keywords,
+                    'plugin': p,
+                    'results': cls._search_plugin(
+                        p, search_args, limit, offset
                     ),
+                    'partial': False,
                 }
+                for p in plugins
+            ]
+
+        with _search_lock:
+            if not _search_executor:
+                _search_executor = ThreadPoolExecutor(max_workers=max_workers)
+
+        timeout = getattr(settings, 'PROJECTROLES_SEARCH_TIMEOUT', None)
+        submit_time = time.time()
+        start_times = {}
+        futures = {}
+
+        for p in plugins:
+            # Only keep one search per plugin in the pool, so that slow
+            # plugins can not take up all the workers
+            with _search_lock:
+                if p.name in _search_running:
+                    logger.warning(
+                        'Search in app "{}" skipped, previous search still '
+                        'running'.format(p.name)
+                    )
+                    continue
+
+                _search_running.add(p.name)
+
+            futures[p.name] = _search_executor.submit(
+                cls._search_plugin_pooled,
+                p,
+                search_args,
+                limit,
+                offset,
+                start_times,
+            )
+            futures[p.name].add_done_callback(
+                lambda f, name=p.name: cls._end_pooled_search(name)
             )
 
-        return context
+        ret = []
+
+        for plugin in plugins:
+            future = futures.get(plugin.name)
+
+            # Time out each plugin counting from the start of its search
+            while future and timeout is not None and not future.done():
+                remaining = (
+                    start_times.get(plugin.name, submit_time)
+                    + timeout
+                    - time.time()
+                )
+
+                if remaining <= 0:
+                    break
+
+                wait([future], timeout=remaining)
+
+            if future and (timeout is None or future.done()):
+                ret.append(
+                    {
+                        'plugin': plugin,
+                        'results': future.result(),
+                        'partial': False,
+                    }
+                )
+                continue
+
+            if future:
+                future.cancel()  # Only succeeds if search has not started
+                logger.warning(
+                    'Search in app "{}" timed out after {} s'.format(
+                        plugin.name, timeout
+                    )
+                )
+
+            ret.append({'plugin': plugin, 'results': None, 'partial': True})
+
+        return ret
 
     def get(self, request, *args, **kwargs):
         if (
@@ -1678,6 +2037,7 @@ class RemoteSiteListView(
             sites = sites[:1]
 
         context['sites'] = sites
+        context['bgjobs_enabled'] = apps.is_installed('bgjobs')
         return context
 
     # TODO: Remove this once implementing #76
@@ -1984,7 +2344,11 @@ class RemoteProjectsBatchUpdateView(
 class RemoteProjectsSyncView(
     LoginRequiredMixin, LoggedInPermissionMixin, TemplateView
 ):
-    """Synchronize remote projects from a source site"""
+    """Synchronize remote projects from a source site. If the background
+    parameter is given and the bgjobs app is installed, the sync is run as a
+    background job and the user is redirected to the job status page. If the
+    dry_run parameter is given, changes are displayed without saving them, in
+    the background job log if bgjobs is installed."""
 
     permission_required = 'projectroles.update_remote'
     template_name = 'projectroles/remoteproject_sync.html'
@@ -2017,13 +2381,37 @@ class RemoteProjectsSyncView(
         context = self.get_context_data(*args, **kwargs)
         site = context['site']
 
-        api_url = site.url + reverse(
-            'projectroles:api_remote_get', kwargs={'secret': site.secret}
-        )
+        dry_run = bool(request.GET.get('dry_run'))
 
+        if (request.GET.get('background') or dry_run) and apps.is_installed(
+            'bgjobs'
+        ):
+            from bgjobs.remote_sync import start_remote_sync_job
+
+            try:
+                job = start_remote_sync_job(site, request.user, dry_run=dry_run)
+
+            except ValueError as ex:
+                messages.error(request, str(ex))
+                return HttpResponseRedirect(redirect_url)
+
+            messages.info(
+                request,
+                '{} {} in the background'.format(
+                    'Checking changes in' if dry_run else 'Synchronizing',
+                    get_display_name(PROJECT_TYPE_PROJECT, plural=True),
+                ),
+            )
+            return HttpResponseRedirect(job.get_absolute_url())
+
+        # Sync data while reading the response
         try:
-            response = urllib.request.urlopen(api_url)
-            remote_data = json.loads(response.read().decode('utf-8'))
+            update_data = remote_api.sync_source_stream(
+                site,
+                remote_api.get_source_stream(site),
+                request,
+                dry_run=dry_run,
+            )
 
         except Exception as ex:
             ex_str = str(ex)
@@ -2039,9 +2427,6 @@ class RemoteProjectsSyncView(
             )
             return HttpResponseRedirect(redirect_url)
 
-        # Sync data
-        update_data = remote_api.sync_source_data(site, remote_data, request)
-
         # Check for updates
         user_count = len(
             [v for v in update_data['users'].values() if 'status' in v]
@@ -2067,12 +2452,25 @@ class RemoteProjectsSyncView(
         context['user_count'] = user_count
         context['project_count'] = project_count
         context['role_count'] = role_count
-        messages.success(
-            request,
-            '{} data updated according to source site'.format(
-                get_display_name(PROJECT_TYPE_PROJECT, title=True)
-            ),
-        )
+        context['dry_run'] = dry_run
+
+        if dry_run:
+            messages.info(
+                request,
+                'Dry run: {} data not updated, displaying changes to be '
+                'made according to source site'.format(
+                    get_display_name(PROJECT_TYPE_PROJECT, title=True)
+                ),
+            )
+
+        else:
+            messages.success(
+                request,
+                '{} data updated according to source site'.format(
+                    get_display_name(PROJECT_TYPE_PROJECT, title=True)
+                ),
+            )
+
         return super().render_to_response(context)
 
 
@@ -2139,8 +2537,12 @@ class SODARAPIBaseView(APIView):
 # SODAR API Views --------------------------------------------------------------
 
 
+@method_decorator(gzip_page, name='dispatch')
 class RemoteProjectGetAPIView(SODARAPIBaseView):
-    """API view for retrieving remote projects from a source site"""
+    """API view for retrieving remote projects from a source site. Responses
+    are compressed if supported by the client. Full data is served from cache,
+    and a response with no content is returned if the ETag given by the client
+    matches the current data."""
 
     # TODO: Create custom permission class for general API
     permission_classes = (AllowAny,)  # We check the secret in get()/post()
@@ -2157,12 +2559,38 @@ class RemoteProjectGetAPIView(SODARAPIBaseView):
         except RemoteSite.DoesNotExist:
             return Response('Remote site not found, unauthorized', status=401)
 
-        sync_data = remote_api.get_target_data(target_site)
+        since = request.GET.get('since')
+
+        # For changes since the last sync, only an ETag of data already in the
+        # cache is compared, as building the full data is slower than a delta
+        payload = remote_api.get_target_payload(
+            target_site, cached_only=bool(since)
+        )
+        data, etag = payload or (None, None)
+        response = get_conditional_response(request, etag=etag)
+
+        if not response and since:
+            try:
+                response = Response(
+                    remote_api.get_target_data(target_site, since=since),
+                    status=200,
+                )
+
+            except ValueError as ex:
+                return Response(str(ex), status=400)
+
+        elif not response:
+            response = HttpResponse(
+                data, content_type='application/json', status=200
+            )
+
+        if etag:
+            response['ETag'] = etag
 
         # Update access date for target site remote projects
         target_site.projects.all().update(date_access=timezone.now())
 
-        return Response(sync_data, status=200)
+        return response
 
 
 # Ajax API Views ---------------------------------------------------------------
@@ -2200,6 +2628,113 @@ class ProjectStarringAPIView(
         return Response(0 if tag_state else 1, status=200)
 
 
+class ProjectSearchSuggestAPIView(
+    LoginRequiredMixin, APIPermissionMixin, APIView
+):
+    """View for retrieving suggestions for the site search box via AJAX"""
+
+    # No permissions besides login are required, results are filtered by access
+    permission_required = ()
+
+    def get(self, request, *args, **kwargs):
+        search_term = request.GET.get('s', '').strip()
+
+        if (
+            not getattr(settings, 'PROJECTROLES_ENABLE_SEARCH', True)
+            or len(search_term) < SEARCH_SUGGEST_MIN_LENGTH
+        ):
+            return Response({'results': []}, status=200)
+
+        # Suggestions are cached briefly, as they are requested while typing
+        cache_key = SEARCH_SUGGEST_CACHE_KEY.format(
+            user=request.user.pk,
+            term=hashlib.md5(search_term.lower().encode()).hexdigest(),
+        )
+        results = cache.get(cache_key)
+
+        if results is None:
+            results = self.get_suggestions(search_term, request.user)
+            cache.set(
+                cache_key,
+                results,
+                getattr(
+                    settings, 'PROJECTROLES_SEARCH_SUGGEST_CACHE_TIMEOUT', 30
+                ),
+            )
+
+        return Response({'results': results}, status=200)
+
+    @classmethod
+    def get_suggestions(cls, search_term, user):
+        """
+        Return project and app suggestions for a search term. Projects are
+        returned first, followed by app suggestions up to the total limit.
+
+        :param search_term: String
+        :param user: User object
+        :return: List of dicts
+        """
+        limit = getattr(settings, 'PROJECTROLES_SEARCH_SUGGEST_LIMIT', 10)
+
+        # Projects with titles starting with the term are returned first
+        projects = (
+            filter_by_project_access(
+                Project.objects.filter(
+                    type=PROJECT_TYPE_PROJECT,
+                    search_text__contains=search_term.lower(),
+                ),
+                user,
+                project_lookup='pk',
+            )
+            .annotate(
+                prefix_match=Case(
+                    When(title__istartswith=search_term, then=Value(0)),
+                    default=Value(1),
+                    output_field=IntegerField(),
+                )
+            )
+            .order_by('prefix_match', 'full_title')
+        )
+        ret = [
+            {
+                'search_type': 'project',
+                'label': p.title,
+                'url': reverse(
+                    'projectroles:detail', kwargs={'project': p.sodar_uuid}
+                ),
+                'project': p.full_title,
+                'app': None,
+            }
+            for p in projects[:limit]
+        ]
+
+        for plugin in get_active_plugins(plugin_type='project_app'):
+            if len(ret) >= limit:
+                break
+
+            if not plugin.search_enable:
+                continue
+
+            plugin_limit = limit - len(ret)
+
+            for item in plugin.get_search_suggestions(
+                search_term, user, limit=plugin_limit
+            )[:plugin_limit]:
+                ret.append(
+                    {
+                        'search_type': item['search_type'],
+                        'label': item['label'],
+                        'url': item['url'],
+                        'project': item['project'].full_title
+                        if item.get('project')
+                        else None,
+                        'app': plugin.title,
+                    }
+                )
+
+        return ret
+
+
 class UserAutocompleteAPIView(autocomplete.Select2QuerySetView):
     """ User autocompletion widget view"""
 
@@ -2210,53 +2745,89 @@ class UserAutocompleteAPIView(autocomplete.Select2QuerySetView):
 
         current_user = self.request.user
         project_uuid = self.forwarded.get('project', None)
+        project = None
 
         # If project UUID is given, only show users that are in the project
         if project_uuid not in ['', None]:
-            project = Project.objects.filter(sodar_uuid=project_uuid).first()
+            project = (
+                Project.objects.get_visible_projects(current_user)
+                .filter(sodar_uuid=project_uuid)
+                .first()
+            )
 
             # If user has no permission for the project, return None
-            if not self.request.user.has_perm(
-                'projectroles.view_project', project
-            ):
+            if not project:
                 return self.get_no_results()
 
-            project_users = (
-                RoleAssignment.objects.filter(project=project)
-                .values_list('user')
-                .distinct()
-            )
-            # Limit selectable choices
-            qs = self.get_selectable_users(project_users)
-
-        # If no project UUID is given all users are selectable
-        else:
-            qs = User.objects.all()
-
         # Exclude the users in the system group unless local users are allowed
         allow_local = (
             settings.PROJECTROLES_ALLOW_LOCAL_USERS
             if hasattr(settings, 'PROJECTROLES_ALLOW_LOCAL_USERS')
             else False
         )
+        allow_local = allow_local or current_user.is_superuser
+
+        # Matching users are cached by project and search term, the cache of a
+        # project is invalidated by changing the project version on role edits
+        # and all cached results by changing the users version on user edits
+        version = None
+        users_version = cache.get(USER_AUTOCOMPLETE_USERS_KEY)
+        limit = getattr(settings, 'PROJECTROLES_AUTOCOMPLETE_LIMIT', 50)
+
+        if project:
+            version = cache.get(
+                USER_AUTOCOMPLETE_VERSION_KEY.format(project=project.pk)
+            )
+
+        cache_key = USER_AUTOCOMPLETE_CACHE_KEY.format(
+            view=self.__class__.__name__,
+            project=project.pk if project else None,
+            version=version,
+            users=users_version,
+            local=allow_local,
+            term=hashlib.md5((self.q or '').lower().encode()).hexdigest(),
+        )
+        user_pks = cache.get(cache_key)
 
-        if not allow_local and not current_user.is_superuser:
-            qs = qs.exclude(groups__name='system').exclude(groups__isnull=True)
+        if user_pks is None:
+            # Limit selectable choices
+            qs = (
+                self.get_selectable_users(project)
+                if project
+                else User.objects.all()
+            )
+
+            if not allow_local:
+                qs = qs.exclude(groups__name='system').exclude(
+                    groups__isnull=True
+                )
 
-        if self.q:
-            qs = qs.filter(
-                Q(username__icontains=self.q)
-                | Q(first_name__icontains=self.q)
-                | Q(last_name__icontains=self.q)
-                | Q(name__icontains=self.q)
-                | Q(email__icontains=self.q)
+            if self.q:
+                q_filter = Q()
+
+                for field in USER_SEARCH_FIELDS:
+                    q_filter |= Q(**{field + '__icontains': self.q})
+
+                qs = qs.filter(q_filter)
+
+            qs = qs.order_by('name', 'username')
+            user_pks = list(qs.values_list('pk', flat=True)[:limit])
+            cache.set(
+                cache_key,
+                user_pks,
+                getattr(
+                    settings, 'PROJECTROLES_AUTOCOMPLETE_CACHE_TIMEOUT', 60
+                ),
             )
 
-        return qs.order_by('name')  # Fix issue #165
+        # Fix issue #165
+        return User.objects.filter(pk__in=user_pks).order_by('name', 'username')
 
-    def get_selectable_users(self, project_users):
+    def get_selectable_users(self, project):
         """Return a queryset only containing users that are project members"""
-        return User.objects.filter(pk__in=project_users)
+        return User.objects.filter(
+            pk__in=RoleAssignment.objects.filter(project=project).values('user')
+        )
 
     def get_result_label(self, user):
         """Display options with name, username and email address"""
@@ -2279,9 +2850,11 @@ class UserAutocompleteAPIView(autocomplete.Select2QuerySetView):
 class UserAutocompleteExcludeMembersAPIView(UserAutocompleteAPIView):
     """User autocomplete widget excluding project members view"""
 
-    def get_selectable_users(self, project_users):
+    def get_selectable_users(self, project):
         """Limit user choices to users without roles in current project"""
-        return User.objects.exclude(pk__in=project_users)
+        return User.objects.exclude(
+            pk__in=RoleAssignment.objects.filter(project=project).values('user')
+        )
 
 
 class UserAutocompleteRedirectAPIView(UserAutocompleteExcludeMembersAPIView):